@@ -0,0 +1,107 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Compare the vectorized contact part with the point by point implementation.
+# Run from the root of the repository with:
+#
+#	python -m benchmarks.benchmark_contact_part
+import timeit
+
+import numpy as np
+
+import syfos.data_handling.generate_data as gen_data
+
+def get_benchmark_parameters(
+	maximumPiezo: float
+):
+	"""Define a silicon probe and gold sample setup with a fine step size.
+
+	Parameters:
+		maximumPiezo(float): Maximum piezo value of the benchmark curve.
+
+	Returns:
+		parameterMaterial(namedtupel): Material parameters of the setup.
+		parameterMeasurement(namedtupel): Measurement parameters of the setup.
+	"""
+	ParameterMaterial, ParameterMeasurement, _ = gen_data.get_parameter_tuples()
+
+	hamaker = gen_data.calculate_hamaker(66e-21, 90e-21)
+	parameterMaterial = ParameterMaterial(
+		kc=1,
+		radius=25e-9,
+		Etot=gen_data.calculate_etot(0.22, 170e9, 0.42, 78e9),
+		Hamaker=hamaker,
+		jtc=gen_data.calculate_jtc(hamaker, 25e-9, 1)
+	)
+	parameterMeasurement = ParameterMeasurement(
+		startDistance=-10e-9,
+		stepSize=0.01e-9,
+		maximumPiezo=maximumPiezo
+	)
+
+	return parameterMaterial, parameterMeasurement
+
+def benchmark_contact_part(
+	maximumPiezo: float,
+	repeat: int=3
+) -> None:
+	"""Time both implementations of the contact part and 
+	   print the runtime and the largest deviation.
+
+	Parameters:
+		maximumPiezo(float): Maximum piezo value of the benchmark curve.
+		repeat(int): Number of repetitions, the fastest run is reported.
+	"""
+	parameterMaterial, parameterMeasurement = get_benchmark_parameters(maximumPiezo)
+	lengthUntilContact = gen_data.calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		0
+	) + 1
+
+	runtimes = {}
+	results = {}
+	for name, function in (
+		("scalar", gen_data.create_ideal_curve_contact_part_scalar),
+		("vectorized", gen_data.create_ideal_curve_contact_part)
+	):
+		runtimes[name] = min(timeit.repeat(
+			lambda: function(parameterMaterial, parameterMeasurement, lengthUntilContact),
+			number=1,
+			repeat=repeat
+		))
+		results[name] = function(parameterMaterial, parameterMeasurement, lengthUntilContact)
+
+	deviation = np.max(
+		np.abs(np.asarray(results["vectorized"][1]) - np.asarray(results["scalar"][1]))
+		/ np.maximum(np.abs(results["scalar"][1]), np.finfo(float).tiny)
+	)
+
+	print(
+		"maximum piezo {:.0e} m, {} points: scalar {:.4f} s, vectorized {:.4f} s, "
+		"speed up {:.0f}x, largest relative deviation {:.1e}".format(
+			maximumPiezo,
+			len(results["vectorized"][0]),
+			runtimes["scalar"],
+			runtimes["vectorized"],
+			runtimes["scalar"] / runtimes["vectorized"],
+			deviation
+		)
+	)
+
+if __name__ == "__main__":
+	for maximumPiezo in (30e-9, 100e-9, 1e-6):
+		benchmark_contact_part(maximumPiezo)
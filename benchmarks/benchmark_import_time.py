@@ -0,0 +1,166 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Measure the import time of the start up paths of the gui and the command
+# line interface with python -X importtime and compare it with the recorded
+# budget. Modules that are only needed after the start, like pandas for the
+# export or numba for the first ideal curve, must not be imported at all.
+# Run from the root of the repository with:
+#
+#	python -m benchmarks.benchmark_import_time
+#
+# The exit code is one if a budget is exceeded and two if a budget could not
+# be checked, because the module can not be imported in this environment.
+from collections import namedtuple
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ImportTimeBudget = namedtuple(
+	"ImportTimeBudget",
+	[
+		"workingDirectory",
+		"maximumImportTime",
+		"lazyModules"
+	]
+)
+
+pathRepository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Measured on the reference machine with Python 3.11, numpy 2.4, matplotlib 3.11 
+# and ttkbootstrap 2.2: gui.main_window took 0.74 s to 0.97 s and syfos.cli 0.19 s.
+importTimeBudgets = {
+	"gui.main_window": ImportTimeBudget(
+		workingDirectory=os.path.join(pathRepository, "syfos"),
+		maximumImportTime=1.5,
+		lazyModules=(
+			"pandas",
+			"numba",
+			"openpyxl",
+			"data_handling.export_data",
+			"data_handling.analyse_data",
+			"gui.export_window"
+		)
+	),
+	"syfos.cli": ImportTimeBudget(
+		workingDirectory=pathRepository,
+		maximumImportTime=0.5,
+		lazyModules=(
+			"pandas",
+			"numba",
+			"tkinter",
+			"matplotlib"
+		)
+	)
+}
+
+def measure_import_times(
+	moduleName: str,
+	workingDirectory: str
+) -> Dict[str, float]:
+	"""Import a module in a new interpreter and collect the import times.
+
+	Parameters:
+		moduleName(str): Name of the imported module.
+		workingDirectory(str): Directory from which the module is imported.
+
+	Returns:
+		importTimes(dict): Cumulative import time in seconds of every imported module.
+
+	Raises:
+		ImportError: If the module can not be imported.
+	"""
+	completedProcess = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", "import " + moduleName],
+		cwd=workingDirectory,
+		capture_output=True,
+		text=True
+	)
+
+	if completedProcess.returncode != 0:
+		raise ImportError(completedProcess.stderr.strip().splitlines()[-1])
+
+	importTimes = {}
+
+	for line in completedProcess.stderr.splitlines():
+		if not line.startswith("import time:") or "cumulative" in line:
+			continue
+		_, cumulativeTime, importedModule = line[len("import time:"):].split("|")
+		importTimes[importedModule.strip()] = int(cumulativeTime) * 1e-6
+
+	return importTimes
+
+def check_import_time_budget(
+	moduleName: str,
+	importTimeBudget: ImportTimeBudget
+) -> List[str]:
+	"""Compare the import of a module with its budget.
+
+	Parameters:
+		moduleName(str): Name of the imported module.
+		importTimeBudget(ImportTimeBudget): Recorded budget of the module.
+
+	Returns:
+		violations(list): Description of every exceeded budget.
+	"""
+	importTimes = measure_import_times(moduleName, importTimeBudget.workingDirectory)
+	importTime = importTimes[moduleName]
+	print(moduleName + ": " + format(importTime, ".3f") + " s (budget " + format(importTimeBudget.maximumImportTime, ".3f") + " s)")
+
+	slowestModules = sorted(
+		(
+			(time, importedModule)
+			for importedModule, time in importTimes.items()
+			if "." not in importedModule and importedModule != moduleName
+		),
+		reverse=True
+	)[:5]
+	for time, importedModule in slowestModules:
+		print("	" + importedModule + ": " + format(time, ".3f") + " s")
+
+	violations = []
+
+	if importTime > importTimeBudget.maximumImportTime:
+		violations.append(moduleName + " exceeds its import time budget.")
+
+	for lazyModule in importTimeBudget.lazyModules:
+		if lazyModule in importTimes:
+			violations.append(moduleName + " imports " + lazyModule + " at start up.")
+
+	return violations
+
+if __name__ == "__main__":
+	violations = []
+	uncheckedModules = []
+
+	for moduleName, importTimeBudget in importTimeBudgets.items():
+		try:
+			violations += check_import_time_budget(moduleName, importTimeBudget)
+		except ImportError as error:
+			print(moduleName + ": not checked, " + str(error))
+			uncheckedModules.append(moduleName)
+
+	for violation in violations:
+		print("Budget exceeded: " + violation)
+
+	for moduleName in uncheckedModules:
+		print("Budget not checked: " + moduleName + " can not be imported.")
+
+	if violations:
+		sys.exit(1)
+
+	sys.exit(2 if uncheckedModules else 0)
@@ -0,0 +1,298 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+This file contains the command line interface to generate synthetic
+force volumes without a display. It must not import the gui or plotting
+modules, so it starts fast on compute nodes.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List
+
+from .data_handling import batch_job
+from .data_handling import export_data as exp_data
+from .data_handling import generate_data as gen_data
+
+def create_argument_parser() -> argparse.ArgumentParser:
+	"""Create the parser of the command line arguments.
+
+	Returns:
+		argumentParser(argparse.ArgumentParser): Parser with the generate and batch command.
+	"""
+	argumentParser = argparse.ArgumentParser(
+		prog="python -m syfos",
+		description="Create synthetic force spectroscopy data without the gui."
+	)
+	subparsers = argumentParser.add_subparsers(dest="command", required=True)
+
+	generateParser = subparsers.add_parser(
+		"generate",
+		help="Create and export a synthetic force volume.",
+		description=(
+			"Create and export a synthetic force volume. The parameters are read "
+			"from the \"parameters\" table of a JSON or TOML spec file and from "
+			"--set arguments, which take precedence. The spec file can also "
+			"contain the keys output, formats, seed and storagePrecision."
+		)
+	)
+	generateParser.add_argument(
+		"--spec",
+		help="Path of a JSON or TOML spec file."
+	)
+	generateParser.add_argument(
+		"--set",
+		action="append",
+		default=[],
+		metavar="NAME=VALUE",
+		help="Value of a parameter, e.g. kc=0.5. Can be repeated."
+	)
+	generateParser.add_argument(
+		"--output",
+		help="Path of the output files without extension."
+	)
+	generateParser.add_argument(
+		"--format",
+		action="append",
+		choices=exp_data.exportFormats,
+		help="Export format, can be repeated. Defaults to npz."
+	)
+	generateParser.add_argument(
+		"--seed",
+		type=int,
+		help="Seed of the noise."
+	)
+	generateParser.add_argument(
+		"--storage-precision",
+		choices=tuple(gen_data.storagePrecisions),
+		help="Precision of the stored values. Defaults to float64."
+	)
+
+	batchParser = subparsers.add_parser(
+		"batch",
+		help="Run a job of several force volumes described in a spec file.",
+		description=(
+			"Run a job of several force volumes. The JSON or TOML spec file "
+			"contains the shared parameters, a list of volumes with their own "
+			"parameters, the formats and the outputDirectory. Finished volumes "
+			"are recorded in a manifest, so an interrupted job can be resumed "
+			"by running it again."
+		)
+	)
+	batchParser.add_argument(
+		"spec",
+		help="Path of a JSON or TOML job spec file."
+	)
+	batchParser.add_argument(
+		"--workers",
+		type=int,
+		help="Number of worker processes, overrides numberOfWorkers of the spec."
+	)
+
+	return argumentParser
+
+def load_spec(
+	pathSpecFile: str
+) -> Dict:
+	"""Read a spec file in the JSON or TOML format.
+
+	Parameters:
+		pathSpecFile(str): Path of the spec file, the format is chosen by the extension.
+
+	Returns:
+		spec(dict): Content of the spec file.
+
+	Raises:
+		ValueError: If the format of the spec file is not supported or a TOML 
+					file can not be read, because neither tomllib (Python 3.11 
+					or newer) nor tomli is available.
+	"""
+	extension = os.path.splitext(pathSpecFile)[1].lower()
+
+	if extension == ".json":
+		with open(pathSpecFile) as specFile:
+			return json.load(specFile)
+
+	if extension == ".toml":
+		try:
+			import tomllib
+		except ImportError:
+			try:
+				import tomli as tomllib
+			except ImportError:
+				raise ValueError(
+					"Reading TOML spec files requires Python 3.11 or newer "
+					"or the package tomli."
+				)
+
+		with open(pathSpecFile, "rb") as specFile:
+			return tomllib.load(specFile)
+
+	raise ValueError("Spec files must have the extension .json or .toml.")
+
+def parse_parameter_assignments(
+	assignments: List[str]
+) -> Dict:
+	"""Convert NAME=VALUE arguments into parameters.
+
+	Parameters:
+		assignments(list): Assignments of the --set arguments.
+
+	Returns:
+		parameters(dict): Value of every assigned parameter.
+
+	Raises:
+		ValueError: If an assignment has no equals sign.
+	"""
+	parameters = {}
+
+	for assignment in assignments:
+		name, separator, value = assignment.partition("=")
+		if not separator:
+			raise ValueError("Parameters must be set as NAME=VALUE, not " + assignment + ".")
+		parameters[name.strip()] = value.strip()
+
+	return parameters
+
+def run_generate(
+	arguments: argparse.Namespace
+) -> None:
+	"""Create a synthetic force volume and export it to every selected format.
+
+	Parameters:
+		arguments(argparse.Namespace): Parsed arguments of the generate command.
+
+	Raises:
+		ValueError: If a parameter or the output path is missing or invalid.
+	"""
+	spec = load_spec(arguments.spec) if arguments.spec else {}
+
+	setup = dict(spec.get("parameters", {}))
+	setup.update(parse_parameter_assignments(arguments.set))
+
+	pathOutputFile = arguments.output or spec.get("output")
+	if not pathOutputFile:
+		raise ValueError("Please specify the output path with --output or in the spec file.")
+
+	selectedFormats = arguments.format or spec.get("formats", ["npz"])
+	unknownFormats = set(selectedFormats) - set(exp_data.exportFormats)
+	if unknownFormats:
+		raise ValueError("Unknown export formats: " + ", ".join(sorted(unknownFormats)) + ".")
+
+	seed = arguments.seed if arguments.seed is not None else spec.get("seed")
+	storagePrecision = arguments.storage_precision or spec.get("storagePrecision", "float64")
+
+	parameterMaterial, parameterMeasurement, parameterForceVolume = gen_data.create_parameter_tuples(setup)
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed,
+		storagePrecision=storagePrecision
+	)
+
+	outputDirectory = os.path.dirname(pathOutputFile)
+	if outputDirectory:
+		os.makedirs(outputDirectory, exist_ok=True)
+
+	exp_data.export_to_formats(
+		forceVolume,
+		pathOutputFile,
+		selectedFormats,
+		report_progress
+	)
+
+def run_batch(
+	arguments: argparse.Namespace
+) -> None:
+	"""Run a job spec file and print the status of every item.
+
+	Parameters:
+		arguments(argparse.Namespace): Parsed arguments of the batch command.
+
+	Raises:
+		ValueError: If the job spec is invalid.
+	"""
+	batchItemResults = batch_job.run_batch_job(
+		load_spec(arguments.spec),
+		arguments.workers,
+		report_batch_item
+	)
+
+	numberOfFailedItems = sum(
+		batchItemResult.status == "failed"
+		for batchItemResult in batchItemResults
+	)
+	print(
+		str(len(batchItemResults) - numberOfFailedItems) + " of "
+		+ str(len(batchItemResults)) + " volumes done.",
+		file=sys.stderr
+	)
+
+def report_batch_item(
+	batchItemResult: batch_job.BatchItemResult
+) -> None:
+	"""Print the status of a finished item of a batch job.
+
+	Parameters:
+		batchItemResult(BatchItemResult): Result of the finished item.
+	"""
+	print(
+		batchItemResult.name + ": " + batchItemResult.status
+		+ (" (" + batchItemResult.message + ")" if batchItemResult.message else ""),
+		file=sys.stderr
+	)
+
+def report_progress(
+	start: bool=False,
+	stop: bool=False,
+	newLabel: str=""
+) -> None:
+	"""Print the current export step, replaces the progressbar of the gui.
+
+	Parameters:
+		start(bool): Unused, the export started.
+		stop(bool): Unused, the export stopped.
+		newLabel(str): Indicates the current process step.
+	"""
+	if newLabel:
+		print(newLabel, file=sys.stderr)
+
+def main(
+	argv: List[str]=None
+) -> int:
+	"""Run the command line interface.
+
+	Parameters:
+		argv(list): Command line arguments, defaults to sys.argv.
+
+	Returns:
+		exitCode(int): Zero on success, two if the input is invalid.
+	"""
+	arguments = create_argument_parser().parse_args(argv)
+
+	try:
+		if arguments.command == "generate":
+			run_generate(arguments)
+		elif arguments.command == "batch":
+			run_batch(arguments)
+	except (ValueError, OSError) as error:
+		print("Error: " + str(error), file=sys.stderr)
+		return 2
+
+	return 0
@@ -13,14 +13,50 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import List, Tuple, NamedTuple
+
+"""
+This file segments curves into their approach and contact part and 
+back-calculates the material parameters from the points of ideal curves. 
+Every point of the approach and contact part results in one value of a 
+parameter, so they show how reliable the model is over the whole curve. 
+All calculations work on arrays, the deflection can be a single curve or 
+a matrix with one row per curve.
+"""
+from collections import namedtuple
+from typing import Callable, List, Tuple, NamedTuple
 
 import numpy as np
 
+ApproachParameters = namedtuple(
+	"ApproachParameters",
+	[
+		"kc",
+		"radius",
+		"hamaker"
+	]
+)
+
+ContactParameters = namedtuple(
+	"ContactParameters",
+	[
+		"kc",
+		"radius",
+		"etot"
+	]
+)
+
+CurveSegments = namedtuple(
+	"CurveSegments",
+	[
+		"indexJumpToContact",
+		"indexPointOfContact"
+	]
+)
+
 def calculate_ideal_curve_parameters(
 	idealCurve: List,
-	inputParameters: NamedTuple
-) -> Tuple:
+	parameterMaterial: NamedTuple
+) -> Tuple[ApproachParameters, ContactParameters]:
 	"""Calculate the theoretical parameters kc, radius, 
 	   hamaker and etot from the ideal curve. These can 
 	   be compared with the actual parameter values used 
@@ -28,33 +64,304 @@ def calculate_ideal_curve_parameters(
 
 	Parameters:
 		idealCurve(list): Piezo (x) and Deflection (y) values of the ideal curve.
-		inputParameters(namedtuple): Contains the material parameters used to 
-									 create the ideal curve
+						  The deflection can have one row per curve.
+		parameterMaterial(namedtuple): Contains the material parameters used to 
+									   create the ideal curve. The values can be
+									   arrays with one value or row per curve, 
+									   like the values of CurveParameters.
 
 	Returns:
-		approachParameters(tuple): Contains the theoretical values for kc, 
-								   radius and hamaker for every point of 
-								   the approach part of the ideal curve.
-		contactParameters(tuple): Contains the theoretical values for kc, 
-								   radius and etot for every point of 
-								   the contact part of the ideal curve.
+		approachParameters(ApproachParameters): Theoretical values for kc, radius 
+												and hamaker for every point, NaN 
+												outside of the approach part.
+		contactParameters(ContactParameters): Theoretical values for kc, radius 
+											  and etot for every point, NaN 
+											  outside of the contact part.
+
+	Raises:
+		ValueError: If the point of contact of a curve can not be located.
 	"""
-	approachPart, contactPart = split_ideal_curve(idealCurve)
+	piezo = np.asarray(idealCurve[0])
+	deflection = np.asarray(idealCurve[1])
+	deflection = deflection.astype(np.result_type(deflection, np.float64), copy=False)
+
+	if deflection.ndim == 2:
+		# One value per curve is applied to the row of the curve.
+		parameterMaterial = parameterMaterial._replace(
+			**{
+				fieldName: np.reshape(values, (-1, 1))
+				for fieldName, values in zip(parameterMaterial._fields, parameterMaterial)
+				if np.ndim(values) == 1
+			}
+		)
+
+	approachMask, contactMask = locate_curve_parts(deflection)
 
 	adjustedApproachPart, adjustedContactPart = adjusted_curve_parts(
-		approachPart,
-		contactPart,
-		inputParameters.kc
+		mask_curve_part([piezo, deflection], approachMask),
+		mask_curve_part([piezo, deflection], contactMask),
+		parameterMaterial.kc
 	)
 
-	approachParameters, contactParameters = calculate_parameters(
-		adjustedApproachPart,
-		adjustedContactPart,
-		inputParameters
-	)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		approachParameters, contactParameters = calculate_parameters(
+			adjustedApproachPart,
+			adjustedContactPart,
+			parameterMaterial
+		)
 
 	return approachParameters, contactParameters
 
+def locate_curve_parts(
+	deflection: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Locate the attractive points of the approach part and the points of 
+	   the contact part for every curve at once, using the jump to contact and 
+	   the point of contact of segment_curves without smoothing. The approach 
+	   part ends at the largest drop of the deflection, the jump to contact. 
+	   The contact part starts after the point of contact, the first point 
+	   after the jump that reaches the baseline of the approach part again.
+
+	Parameters:
+		deflection(np.ndarray): Deflection (y) values of one curve or with one row per curve.
+
+	Returns:
+		approachMask(np.ndarray): True for the negative deflection values before the jump to contact.
+		contactMask(np.ndarray): True for the values after the point of contact.
+
+	Raises:
+		ValueError: If the point of contact of a curve can not be located.
+	"""
+	indices = np.arange(deflection.shape[-1])
+	curveSegments = segment_curves(deflection)
+
+	approachMask = (
+		(indices <= curveSegments.indexJumpToContact[..., np.newaxis]) 
+		& (deflection < 0)
+	)
+	contactMask = indices > curveSegments.indexPointOfContact[..., np.newaxis]
+
+	return approachMask, contactMask
+
+def segment_curves(
+	deflection: np.ndarray,
+	smoothingMethod: str=None,
+	windowSize: int=5,
+	polynomialOrder: int=2
+) -> CurveSegments:
+	"""Locate the jump to contact and the point of contact of every curve at once.
+	   The jump to contact is the largest drop of the (smoothed) deflection, which 
+	   is refined to the largest drop of the unsmoothed deflection within the window.
+	   The baseline of a curve is the median of the first half of its approach part,
+	   the point of contact is the first point after the jump that reaches it again.
+	   This keeps the segmentation independent of the virtual deflection.
+
+	Parameters:
+		deflection(np.ndarray): Deflection (y) values of one curve or with one row per curve.
+		smoothingMethod(str): If specified, the curves are smoothed before they are 
+							  segmented, see smoothingKernels.
+		windowSize(int): Number of points of the smoothing window.
+		polynomialOrder(int): Order of the polynomial of the Savitzky-Golay filter.
+
+	Returns:
+		curveSegments(CurveSegments): Index of the last point before the jump to contact 
+									  and of the point of contact of every curve.
+
+	Raises:
+		ValueError: If the smoothing is invalid or the point of contact of a 
+					curve can not be located.
+	"""
+	deflection = np.asarray(deflection)
+	indices = np.arange(deflection.shape[-1])
+
+	if smoothingMethod is None:
+		smoothedDeflection = deflection
+	else:
+		smoothedDeflection = smooth_curves(
+			deflection,
+			smoothingMethod,
+			windowSize,
+			polynomialOrder
+		)
+
+	indexJumpToContact = np.argmin(np.diff(smoothedDeflection, axis=-1), axis=-1)
+
+	if smoothingMethod is not None:
+		indexJumpToContact = refine_index_jump_to_contact(
+			deflection,
+			indexJumpToContact,
+			windowSize // 2
+		)
+
+	baselineLength = (indexJumpToContact + 2) // 2
+	baselineIndices = indices[:np.max(baselineLength)]
+	baseline = np.nanmedian(
+		np.where(
+			baselineIndices < baselineLength[..., np.newaxis],
+			smoothedDeflection[..., :len(baselineIndices)],
+			np.nan
+		),
+		axis=-1
+	)
+
+	contactValues = (
+		(indices > indexJumpToContact[..., np.newaxis]) 
+		& (smoothedDeflection >= baseline[..., np.newaxis])
+	)
+	if not np.all(np.any(contactValues, axis=-1)):
+		raise ValueError("Could not locate the point of contact.")
+
+	return CurveSegments(
+		indexJumpToContact=indexJumpToContact.astype(np.int64),
+		indexPointOfContact=np.argmax(contactValues, axis=-1).astype(np.int64)
+	)
+
+def refine_index_jump_to_contact(
+	deflection: np.ndarray,
+	indexJumpToContact: np.ndarray,
+	halfWindowSize: int
+) -> np.ndarray:
+	"""Helper function for segment_curves. Smoothing spreads the jump to contact
+	   over the window, so the largest drop of the unsmoothed deflection is 
+	   searched within the window around the located jump.
+
+	Parameters:
+		deflection(np.ndarray): Unsmoothed deflection (y) values.
+		indexJumpToContact(np.ndarray): Located jump to contact of every curve.
+		halfWindowSize(int): Number of points searched on each side.
+
+	Returns:
+		indexJumpToContact(np.ndarray): Refined jump to contact of every curve.
+	"""
+	deflectionDifference = np.diff(deflection, axis=-1)
+	searchIndices = np.clip(
+		indexJumpToContact[..., np.newaxis] + np.arange(-halfWindowSize, halfWindowSize + 1),
+		0,
+		deflectionDifference.shape[-1] - 1
+	)
+
+	return np.take_along_axis(
+		searchIndices,
+		np.argmin(
+			np.take_along_axis(deflectionDifference, searchIndices, axis=-1),
+			axis=-1
+		)[..., np.newaxis],
+		axis=-1
+	)[..., 0]
+
+def smooth_curves(
+	deflection: np.ndarray,
+	smoothingMethod: str,
+	windowSize: int,
+	polynomialOrder: int=2
+) -> np.ndarray:
+	"""Smooth all curves in one pass by convolving them with the kernel of the 
+	   smoothing method. The curves are extended by their first and last value, 
+	   so the smoothed curves keep their length.
+
+	Parameters:
+		deflection(np.ndarray): Deflection (y) values of one curve or with one row per curve.
+		smoothingMethod(str): Selected method out of smoothingKernels.
+		windowSize(int): Odd number of points of the smoothing window.
+		polynomialOrder(int): Order of the polynomial of the Savitzky-Golay filter.
+
+	Returns:
+		smoothedDeflection(np.ndarray): Smoothed deflection values.
+
+	Raises:
+		ValueError: If the method is unknown or the window size is not a positive odd
+					number larger than the polynomial order.
+	"""
+	try:
+		create_kernel = smoothingKernels[smoothingMethod]
+	except KeyError:
+		raise ValueError(
+			"Unknown smoothing method, please select one of: " 
+			+ ", ".join(smoothingKernels) + "."
+		)
+	if windowSize < 1 or windowSize % 2 == 0:
+		raise ValueError("Window size must be a positive odd number.")
+
+	kernel = create_kernel(windowSize, polynomialOrder)
+	halfWindowSize = windowSize // 2
+
+	paddedDeflection = np.pad(
+		deflection,
+		[(0, 0)] * (deflection.ndim - 1) + [(halfWindowSize, halfWindowSize)],
+		mode="edge"
+	)
+	# The windows are a view of the padded curves, so they are not copied.
+	windows = np.lib.stride_tricks.sliding_window_view(
+		paddedDeflection,
+		windowSize,
+		axis=-1
+	)
+
+	return np.einsum("...ij,j->...i", windows, kernel)
+
+def create_moving_average_kernel(
+	windowSize: int,
+	polynomialOrder: int=None
+) -> np.ndarray:
+	"""Create the kernel of a moving average.
+
+	Parameters:
+		windowSize(int): Number of points of the smoothing window.
+		polynomialOrder(int): Not used by the moving average.
+
+	Returns:
+		kernel(np.ndarray): Equal weight of every point of the window.
+	"""
+	return np.full(windowSize, 1 / windowSize)
+
+def create_savitzky_golay_kernel(
+	windowSize: int,
+	polynomialOrder: int
+) -> np.ndarray:
+	"""Create the kernel of a Savitzky-Golay filter, which fits a polynomial to 
+	   the points of the window and takes its value at the centre of the window.
+
+	Parameters:
+		windowSize(int): Number of points of the smoothing window.
+		polynomialOrder(int): Order of the fitted polynomial.
+
+	Returns:
+		kernel(np.ndarray): Weight of every point of the window.
+
+	Raises:
+		ValueError: If the window is not larger than the polynomial order.
+	"""
+	if not 0 <= polynomialOrder < windowSize:
+		raise ValueError("Window size must be larger than the polynomial order.")
+
+	windowPositions = np.arange(windowSize) - windowSize // 2
+	vandermondeMatrix = np.vander(windowPositions, polynomialOrder + 1, increasing=True)
+
+	return np.linalg.pinv(vandermondeMatrix)[0]
+
+smoothingKernels = {
+	"movingAverage": create_moving_average_kernel,
+	"savitzkyGolay": create_savitzky_golay_kernel
+}
+
+def mask_curve_part(
+	curve: List,
+	partMask: np.ndarray
+) -> List:
+	"""Replace the values outside of a part of the curve with NaN.
+
+	Parameters:
+		curve(list): Piezo (x) and Deflection (y) values of the curve.
+		partMask(np.ndarray): True for the values of the part.
+
+	Returns:
+		curvePart(list): Piezo (x) and Deflection (y) values with the shape of the mask.
+	"""
+	return [
+		np.where(partMask, values, np.nan)
+		for values in curve
+	]
+
 def split_ideal_curve(idealCurve: List) -> Tuple[List, List]:
 	"""Split an ideal force distance curve into its approach and contact part.
 
@@ -138,14 +445,16 @@ def adjusted_curve_parts(
 							of the approach part of the ideal curve.
 		contactPart(list): Piezo (x) and Deflection (y) values 
 						   of the contact part of the ideal curve.
-		kc(float): .
+		kc(float): Spring constant used to generate the ideal curve.
 
 	Returns:
-		adjustedApproachPart(list): TrueDistance (x) and Force (y) values.
-		adjustedContactPart(list): Force (x) and Deformation (y) values.
+		adjustedApproachPart(list): TrueDistance (x), Pseudo Force (y) 
+									and Force (y) values.
+		adjustedContactPart(list): Pseudo Force (x), Force (x) and 
+								   Deformation (y) values.
 	"""
-	adjustedApproachPart = adjust_approach_part(approachPart)
-	adjustedContactPart = adjust_contact_part(contactPart)
+	adjustedApproachPart = adjust_approach_part(approachPart, kc)
+	adjustedContactPart = adjust_contact_part(contactPart, kc)
 
 	return adjustedApproachPart, adjustedContactPart
 
@@ -257,196 +566,115 @@ def calculate_deformation(
 def calculate_parameters(
 	adjustedApproachPart: List,
 	adjustedContactPart: List,
-	inputParameters: NamedTuple
-) -> Tuple[List, List]:
+	parameterMaterial: NamedTuple
+) -> Tuple[ApproachParameters, ContactParameters]:
 	"""Calculate the theoretical parameters from the approach 
 	   and contact part from which the ideal curve is based.
 	
 	Parameters:
-		adjustedApproachPart(list): True Distance (x) and Force (y) values 
-						   			of the approach part of the ideal curve.
-		adjustedContactPart(list): Force (x) and Deformation (y) values 
-						   		   of the contact part of the ideal curve.
-		inputParameters(namedtuple): Parameters used to create the ideal curve.
+		adjustedApproachPart(list): True Distance (x), Pseudo Force (y) and Force (y) 
+									values of the approach part of the ideal curve.
+		adjustedContactPart(list): Pseudo Force (x), Force (x) and Deformation (y) 
+								   values of the contact part of the ideal curve.
+		parameterMaterial(namedtuple): Parameters used to create the ideal curve.
 
 	Returns:
-		approachParameters(tuple): Contains the theoretical values for kc, 
-								   radius and hamaker for every point of 
-								   the approach part of the ideal curve.
-		contactParameters(tuple): Contains the theoretical values for kc, 
-								   radius and etot for every point of 
-								   the contact part of the ideal curve.
+		approachParameters(ApproachParameters): Theoretical values for kc, radius 
+												and hamaker for every point of the 
+												approach part of the ideal curve.
+		contactParameters(ContactParameters): Theoretical values for kc, radius 
+											  and etot for every point of the 
+											  contact part of the ideal curve.
 	"""
 	approachParameters = calculate_approach_parameters(
 		adjustedApproachPart,
-		inputParameters
+		parameterMaterial
 	)
 	contactParameters = calculate_contact_parameters(
 		adjustedContactPart,
-		inputParameters
+		parameterMaterial
 	)
 
 	return approachParameters, contactParameters
 
 def calculate_approach_parameters(
 	adjustedApproachPart: List,
-	inputParameters: NamedTuple
-) -> Tuple[List, List, List]:
+	parameterMaterial: NamedTuple
+) -> ApproachParameters:
 	"""Calculate the theoretical kc, raidus and hamaker values 
 	   for every point of the approach part of the ideal curve
 	   using the actual parameter values.
 	
 	Parameters:
-		adjustedApproachPart(list): True Distance (x) and Force (y) values 
-						   			of the approach part of the ideal curve.
-		inputParameters(namedtuple): Parameters used to create the ideal curve.
+		adjustedApproachPart(list): True Distance (x), Pseudo Force (y) and Force (y) 
+									values of the approach part of the ideal curve.
+		parameterMaterial(namedtuple): Parameters used to create the ideal curve.
 
 	Returns:
-		springConstant(list): Theoretical kc values.
-		radius(list): Theoretical radius values.
-		hamaker(list): Theoretical hamaker values.
+		approachParameters(ApproachParameters): Theoretical kc, radius and hamaker values.
 	"""
-	springConstant = [
-		calculate_kc_approach(
-			trueDistance,
-			force,
-			inputParameters.hamaker,
-			inputParameters.radius
-		)
-		for trueDistance, force in zip(
-			adjustedApproachPart[0],
-			adjustedApproachPart[2],
-		)
-	]
+	trueDistance, pseudoForce, _ = adjustedApproachPart
 
-	radius = [
-		calculate_radius_approach(
+	return ApproachParameters(
+		kc=calculate_kc_approach(
 			trueDistance,
-			force,
-			inputParameters.hamaker,
-			inputParameters.kc
-		)
-		for trueDistance, force in zip(
-			adjustedApproachPart[0],
-			adjustedApproachPart[2],
-		)
-	]
-
-	hamaker = [
-		calculate_hamaker_approach(
+			pseudoForce,
+			parameterMaterial.Hamaker,
+			parameterMaterial.radius
+		),
+		radius=calculate_radius_approach(
 			trueDistance,
-			force,
-			inputParameters.radius,
-			inputParameters.kc
-		)
-		for trueDistance, force in zip(
-			adjustedApproachPart[0],
-			adjustedApproachPart[2],
+			pseudoForce,
+			parameterMaterial.Hamaker,
+			parameterMaterial.kc
+		),
+		hamaker=calculate_hamaker_approach(
+			trueDistance,
+			pseudoForce,
+			parameterMaterial.radius,
+			parameterMaterial.kc
 		)
-	]
-
-	return (
-		springConstant,
-		radius,
-		hamaker
 	)
 
 def calculate_contact_parameters(
 	adjustedContactPart: List,
-	inputParameters: NamedTuple
-) -> Tuple[List, List, List]:
+	parameterMaterial: NamedTuple
+) -> ContactParameters:
 	"""Calculate the theoretical kc, raidus and etot values 
 	   for every point of the contact part of the ideal curve
 	   using the actual parameter values.
 	
 	Parameters:
-		adjustedContactPart(list): Force (x) and Deformation (y) values 
-						   		   of the contact part of the ideal curve.
-		inputParameters(namedtuple): Parameters used to create the ideal curve.
+		adjustedContactPart(list): Pseudo Force (x), Force (x) and Deformation (y) 
+								   values of the contact part of the ideal curve.
+		parameterMaterial(namedtuple): Parameters used to create the ideal curve.
 
 	Returns:
-		springConstant(list): Theoretical kc values.
-		radius(list): Theoretical radius values.
-		etot(list): Theoretical etot values.
+		contactParameters(ContactParameters): Theoretical kc, radius and etot values.
 	"""
-	springConstant = [
-		calculate_kc_contact(
-			force,
-			deformation,
-			inputParameters.etot,
-			inputParameters.radius
-		)
-		for force, deformation in zip(
-			adjustedApproachPart[1],
-			adjustedApproachPart[2],
-		)
-	]
+	pseudoForce, _, deformation = adjustedContactPart
 
-	radius = [
-		calculate_radius_contact(
-			force,
+	return ContactParameters(
+		kc=calculate_kc_contact(
+			pseudoForce,
 			deformation,
-			inputParameters.etot,
-			inputParameters.kc
-		)
-		for force, deformation in zip(
-			adjustedApproachPart[1],
-			adjustedApproachPart[2],
-		)
-	]
-
-	etot = [
-		calculate_etot_contact(
-			force,
+			parameterMaterial.Etot,
+			parameterMaterial.radius
+		),
+		radius=calculate_radius_contact(
+			pseudoForce,
 			deformation,
-			inputParameters.radius,
-			inputParameters.kc
-		)
-		for force, deformation in zip(
-			adjustedApproachPart[1],
-			adjustedApproachPart[2],
+			parameterMaterial.Etot,
+			parameterMaterial.kc
+		),
+		etot=calculate_etot_contact(
+			pseudoForce,
+			deformation,
+			parameterMaterial.radius,
+			parameterMaterial.kc
 		)
-	]
-
-	return (
-		springConstant,
-		radius,
-		etot
 	)
 
-def wrapper_calculate_parameter(
-	calculateParameterFunction,
-	xValues,
-	yValues,
-	firstParameter,
-	secondParameter
-) -> List:
-	"""Calculates a parameter for each point of a part of the ideal curve.
-
-	Parameters:
-		calculateParameterFunction(function): Function to calculate a certain parameter.
-		xValues(): X values of a part of the ideal curve.
-		yValues(): Y values of a part of the ideal curve.
-		firstParameter(): First acutal parameter used to create the ideal curve.
-		secondParameter(): Second acutal parameter used to create the ideal curve.
-
-	Returns:
-		parameterValues(list): Parameter values for each point 
-							   of the part of the ideal curve.
-	"""
-	return [
-		calculateParameterFunction(
-			xValue,
-			yValue,
-			firstParameter,
-			secondParameter
-		)
-		for xValue, yValue in zip(
-			xValues,
-			yValues
-		)
-	]
-
 def calculate_kc_approach(
 	trueDistance: float,
 	pseudoForce: float,
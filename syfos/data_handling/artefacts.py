@@ -0,0 +1,227 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+This file contains artefacts of real measurements that are added to the
+synthetic deflection in addition to the white noise. Every artefact is
+calculated for the whole matrix of synthetic curves (one row per curve)
+at once, random artefacts use their own random number generator.
+"""
+from collections import namedtuple
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+ArtefactGenerators = namedtuple(
+	"ArtefactGenerators",
+	[
+		"colouredNoise",
+		"interference"
+	]
+)
+
+def has_artefacts(
+	parameterForceVolume: NamedTuple
+) -> bool:
+	"""Check if any artefact is selected.
+
+	Parameters:
+		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
+										  level, the virtual deflection and topography offset
+										  and the parameters of the artefacts.
+
+	Returns:
+		hasArtefacts(bool): True if an artefact has a nonzero amplitude.
+	"""
+	return any(
+		getattr(parameterForceVolume, parameterName) != 0
+		for parameterName in (
+			"colouredNoise",
+			"interferenceAmplitude",
+			"driftLinear",
+			"driftQuadratic",
+			"baselineTilt"
+		)
+	)
+
+def apply_artefacts(
+	syntheticDeflection: np.ndarray,
+	piezo: np.ndarray,
+	parameterForceVolume: NamedTuple,
+	artefactGenerators: ArtefactGenerators
+) -> None:
+	"""Add every selected artefact in place to the synthetic curves.
+
+	Parameters:
+		syntheticDeflection(np.ndarray): Synthetic deflection values with one row per curve.
+		piezo(np.ndarray): Piezo (x) values shared by all synthetic curves.
+		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
+										  level, the virtual deflection and topography offset
+										  and the parameters of the artefacts.
+		artefactGenerators(ArtefactGenerators): Generator of every random artefact.
+
+	Raises:
+		ValueError: If an amplitude or exponent is negative or the interference
+					period is not positive.
+	"""
+	if parameterForceVolume.colouredNoise < 0 or parameterForceVolume.interferenceAmplitude < 0:
+		raise ValueError("Artefact amplitudes must be positive.")
+	if parameterForceVolume.colouredNoiseExponent < 0:
+		raise ValueError("Exponent of the coloured noise must be positive.")
+
+	if parameterForceVolume.colouredNoise > 0:
+		syntheticDeflection += create_coloured_noise(
+			syntheticDeflection.shape,
+			parameterForceVolume.colouredNoise,
+			parameterForceVolume.colouredNoiseExponent,
+			artefactGenerators.colouredNoise
+		)
+
+	if parameterForceVolume.interferenceAmplitude > 0:
+		syntheticDeflection += create_interference(
+			piezo,
+			len(syntheticDeflection),
+			parameterForceVolume.interferenceAmplitude,
+			parameterForceVolume.interferencePeriod,
+			artefactGenerators.interference
+		)
+
+	if parameterForceVolume.driftLinear != 0 or parameterForceVolume.driftQuadratic != 0:
+		syntheticDeflection += create_drift(
+			syntheticDeflection.shape,
+			parameterForceVolume.driftLinear,
+			parameterForceVolume.driftQuadratic
+		)
+
+	if parameterForceVolume.baselineTilt != 0:
+		syntheticDeflection += create_baseline_tilt(
+			piezo,
+			parameterForceVolume.baselineTilt
+		)
+
+def create_coloured_noise(
+	shape: Tuple[int, int],
+	amplitude: float,
+	exponent: float,
+	randomGenerator: np.random.Generator
+) -> np.ndarray:
+	"""Create noise with a power spectral density proportional to 1/f^exponent
+	   by shaping the spectrum of white noise. An exponent of one creates pink
+	   noise, two brown noise. The spectra of all curves are shaped with one
+	   FFT along the points of the curves.
+
+	Parameters:
+		shape(tuple): Number of curves and number of points per curve.
+		amplitude(float): Expected standard deviation of the noise.
+		exponent(float): Exponent of the power spectral density.
+		randomGenerator(np.random.Generator): Generator used to draw the white noise.
+
+	Returns:
+		colouredNoise(np.ndarray): Noise values with one row per curve.
+	"""
+	numberOfPoints = shape[1]
+	if numberOfPoints < 2:
+		return np.zeros(shape)
+
+	frequencies = np.fft.rfftfreq(numberOfPoints)
+	filterValues = np.zeros_like(frequencies)
+	filterValues[1:] = frequencies[1:]**(-exponent / 2)
+
+	# Variance of the filtered unit white noise, every frequency except
+	# zero and the Nyquist frequency appears twice in the full spectrum.
+	spectrumWeights = np.full(len(frequencies), 2.0)
+	spectrumWeights[0] = 1
+	if numberOfPoints % 2 == 0:
+		spectrumWeights[-1] = 1
+	variance = np.sum(spectrumWeights * filterValues**2) / numberOfPoints
+
+	spectrum = np.fft.rfft(randomGenerator.standard_normal(shape), axis=1)
+	spectrum *= filterValues * (amplitude / np.sqrt(variance))
+
+	return np.fft.irfft(spectrum, n=numberOfPoints, axis=1)
+
+def create_interference(
+	piezo: np.ndarray,
+	numberOfCurves: int,
+	amplitude: float,
+	period: float,
+	randomGenerator: np.random.Generator
+) -> np.ndarray:
+	"""Create a sinusoidal baseline caused by the optical interference of the
+	   laser reflected by the sample. The phase of every curve is random.
+
+	Parameters:
+		piezo(np.ndarray): Piezo (x) values shared by all synthetic curves.
+		numberOfCurves(int): Number of synthetic curves.
+		amplitude(float): Amplitude of the interference.
+		period(float): Period of the interference in piezo units.
+		randomGenerator(np.random.Generator): Generator used to draw the phases.
+
+	Returns:
+		interference(np.ndarray): Interference values with one row per curve.
+
+	Raises:
+		ValueError: If the period is not positive.
+	"""
+	if period <= 0:
+		raise ValueError("Period of the interference must be positive.")
+
+	phases = randomGenerator.uniform(0, 2 * np.pi, size=(numberOfCurves, 1))
+
+	return amplitude * np.sin(2 * np.pi / period * np.asarray(piezo) + phases)
+
+def create_drift(
+	shape: Tuple[int, int],
+	driftLinear: float,
+	driftQuadratic: float
+) -> np.ndarray:
+	"""Create a slow thermal drift of the deflection during the measurement.
+	   The curves are measured one after the other, so the drift continues
+	   from the last point of a curve to the first point of the next curve.
+
+	Parameters:
+		shape(tuple): Number of curves and number of points per curve.
+		driftLinear(float): Linear drift of the deflection per curve.
+		driftQuadratic(float): Quadratic drift of the deflection per curve squared.
+
+	Returns:
+		drift(np.ndarray): Drift values with one row per curve.
+	"""
+	numberOfCurves, numberOfPoints = shape
+	measurementTime = (
+		np.arange(numberOfCurves)[:, np.newaxis]
+		+ np.arange(numberOfPoints) / numberOfPoints
+	)
+
+	return driftLinear * measurementTime + driftQuadratic * measurementTime**2
+
+def create_baseline_tilt(
+	piezo: np.ndarray,
+	baselineTilt: float
+) -> np.ndarray:
+	"""Create a baseline that rises linearly with the piezo position, for
+	   example caused by a misaligned laser spot. It is the same for all curves.
+
+	Parameters:
+		piezo(np.ndarray): Piezo (x) values shared by all synthetic curves.
+		baselineTilt(float): Change of the deflection per piezo unit.
+
+	Returns:
+		tilt(np.ndarray): Tilt of the baseline at every piezo value.
+	"""
+	piezo = np.asarray(piezo)
+
+	return baselineTilt * (piezo - piezo[0])
@@ -0,0 +1,424 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+This file runs generation jobs that are described in a spec file. A job
+spec contains the shared "parameters", a list of "volumes" with their own
+parameters, the export "formats", the "outputDirectory" and optionally a
+"seed", the "numberOfWorkers" and a "cacheDirectory". A parameter with a
+list of values creates one force volume for every combination of values.
+
+Every finished item is appended to a manifest in the output directory.
+If the job is interrupted, running it again skips the items of the
+manifest that are done and whose setup, seed and files did not change.
+Failed items are run again.
+A job without a seed draws one on its first run and stores it in the
+output directory, so a resumed job uses the same seed.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import json
+import os
+import time
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+
+from . import export_data as exp_data
+from . import generate_data as gen_data
+from .parameter_sweep import create_parameter_grid
+
+manifestFileName = "manifest.jsonl"
+jobSeedFileName = "job_seed.json"
+timingSummaryFileName = "timing_summary.csv"
+
+BatchItem = namedtuple(
+	"BatchItem",
+	[
+		"name",
+		"setup",
+		"seed"
+	]
+)
+
+BatchItemResult = namedtuple(
+	"BatchItemResult",
+	[
+		"name",
+		"status",
+		"message",
+		"outputFiles",
+		"generationTime",
+		"exportTime",
+		"setup",
+		"seed"
+	]
+)
+
+def create_batch_items(
+	jobSpec: Dict
+) -> List[BatchItem]:
+	"""Expand the volumes of a job spec into single force volumes. The
+	   seed of every item is derived from the seed of the job and the
+	   position of the item, so a resumed job creates the same noise.
+
+	Parameters:
+		jobSpec(dict): Content of the job spec file.
+
+	Returns:
+		batchItems(list): Name, setup and seed of every force volume.
+
+	Raises:
+		ValueError: If a parameter is missing, a volume has no unique
+					name or a format is unknown.
+	"""
+	unknownFormats = set(jobSpec.get("formats", ["npz"])) - set(exp_data.exportFormats)
+	if unknownFormats:
+		raise ValueError("Unknown export formats: " + ", ".join(sorted(unknownFormats)) + ".")
+
+	sharedParameters = jobSpec.get("parameters", {})
+	volumes = jobSpec.get("volumes", [{}])
+
+	items = []
+
+	for volumeIndex, volume in enumerate(volumes):
+		volumeName = str(volume.get("name", "volume_" + str(volumeIndex)))
+		sweepValues = dict(sharedParameters)
+		sweepValues.update(volume.get("parameters", {}))
+
+		missingParameters = [
+			parameterName
+			for parameterName in gen_data.setupParameterNames
+			if parameterName not in sweepValues
+		]
+		if missingParameters:
+			raise ValueError(
+				"Missing parameters of " + volumeName + ": "
+				+ ", ".join(missingParameters) + "."
+			)
+
+		parameterGrid = create_parameter_grid(sweepValues)
+
+		for setupIndex, setup in enumerate(parameterGrid):
+			itemName = volumeName if len(parameterGrid) == 1 else volumeName + "_" + str(setupIndex)
+			items.append((itemName, setup))
+
+	itemNames = [itemName for itemName, _ in items]
+	if len(set(itemNames)) != len(itemNames):
+		raise ValueError("Every volume of a job needs a unique name.")
+
+	itemSeeds = [
+		int(childSeed.generate_state(1, np.uint64)[0])
+		for childSeed in np.random.SeedSequence(jobSpec.get("seed")).spawn(len(items))
+	]
+
+	return [
+		BatchItem(itemName, setup, itemSeed)
+		for (itemName, setup), itemSeed in zip(items, itemSeeds)
+	]
+
+def run_batch_job(
+	jobSpec: Dict,
+	numberOfWorkers: int=None,
+	update_progress: Callable=None
+) -> List[BatchItemResult]:
+	"""Run every item of a job that is not yet completed and write a
+	   timing summary of all items at the end. Items that fail, because
+	   of invalid parameters or an error during the export, are recorded 
+	   as failed and repeated by the next run of the job. The seed of the 
+	   job is stored in the output directory, see resolve_job_seed.
+
+	Parameters:
+		jobSpec(dict): Content of the job spec file.
+		numberOfWorkers(int): Number of worker processes, one runs the job in the
+							  current process. Overrides the value of the spec.
+		update_progress(function): Called with every finished or skipped item.
+
+	Returns:
+		batchItemResults(list): Result of every item in the order of the spec.
+
+	Raises:
+		ValueError: If the output directory is missing or the spec is invalid.
+	"""
+	outputDirectory = jobSpec.get("outputDirectory")
+	if not outputDirectory:
+		raise ValueError("Please specify the outputDirectory of the job.")
+
+	pathJobSeedFile = os.path.join(outputDirectory, jobSeedFileName)
+	jobSeed = resolve_job_seed(jobSpec, pathJobSeedFile)
+	batchItems = create_batch_items(dict(jobSpec, seed=jobSeed))
+	selectedFormats = jobSpec.get("formats", ["npz"])
+	if numberOfWorkers is None:
+		numberOfWorkers = jobSpec.get("numberOfWorkers")
+
+	os.makedirs(outputDirectory, exist_ok=True)
+	with open(pathJobSeedFile, "w") as jobSeedFile:
+		json.dump({"seed": jobSeed}, jobSeedFile)
+	pathManifestFile = os.path.join(outputDirectory, manifestFileName)
+	manifest = read_manifest(pathManifestFile)
+
+	pendingItems = []
+
+	for batchItem in batchItems:
+		if is_item_completed(batchItem, manifest.get(batchItem.name)):
+			if update_progress is not None:
+				update_progress(manifest[batchItem.name])
+		else:
+			pendingItems.append(batchItem)
+
+	with open(pathManifestFile, "a") as manifestFile:
+		for batchItemResult in iter_batch_item_results(
+			pendingItems,
+			outputDirectory,
+			selectedFormats,
+			numberOfWorkers,
+			jobSpec.get("cacheDirectory")
+		):
+			manifestFile.write(json.dumps(batchItemResult._asdict()) + "\n")
+			manifestFile.flush()
+			os.fsync(manifestFile.fileno())
+			manifest[batchItemResult.name] = batchItemResult
+
+			if update_progress is not None:
+				update_progress(batchItemResult)
+
+	batchItemResults = [manifest[batchItem.name] for batchItem in batchItems]
+	write_timing_summary(
+		batchItemResults,
+		os.path.join(outputDirectory, timingSummaryFileName)
+	)
+
+	return batchItemResults
+
+def resolve_job_seed(
+	jobSpec: Dict,
+	pathJobSeedFile: str
+) -> int:
+	"""Get the seed of a job. Without a seed in the job spec, the seed 
+	   stored by a previous run is reused or a new seed is drawn.
+
+	Parameters:
+		jobSpec(dict): Content of the job spec file.
+		pathJobSeedFile(str): Path of the stored seed of the job.
+
+	Returns:
+		jobSeed(int): Seed of the job.
+	"""
+	if jobSpec.get("seed") is not None:
+		return jobSpec["seed"]
+
+	try:
+		with open(pathJobSeedFile) as jobSeedFile:
+			return int(json.load(jobSeedFile)["seed"])
+	except (OSError, ValueError, KeyError, TypeError):
+		return int(np.random.SeedSequence().entropy)
+
+def read_manifest(
+	pathManifestFile: str
+) -> Dict[str, BatchItemResult]:
+	"""Read the finished items of a previous run. A line that was
+	   only partially written when the job was interrupted is ignored.
+
+	Parameters:
+		pathManifestFile(str): Path of the manifest file.
+
+	Returns:
+		manifest(dict): Latest result of every finished item by its name.
+	"""
+	manifest = {}
+
+	if not os.path.exists(pathManifestFile):
+		return manifest
+
+	with open(pathManifestFile) as manifestFile:
+		for line in manifestFile:
+			try:
+				batchItemResult = BatchItemResult(**json.loads(line))
+			except (ValueError, TypeError):
+				continue
+			manifest[batchItemResult.name] = batchItemResult
+
+	return manifest
+
+def is_item_completed(
+	batchItem: BatchItem,
+	batchItemResult: BatchItemResult
+) -> bool:
+	"""Check if an item of a previous run can be reused.
+
+	Parameters:
+		batchItem(BatchItem): Item of the current job spec.
+		batchItemResult(BatchItemResult): Result of the item in the manifest or None.
+
+	Returns:
+		completed(bool): True if the item is done, the setup and seed are unchanged 
+						 and every output file exists.
+	"""
+	if batchItemResult is None or batchItemResult.status != "done":
+		return False
+	if batchItemResult.seed != batchItem.seed:
+		return False
+
+	# The setup is compared in its JSON form, as it is stored in the manifest.
+	if json.loads(json.dumps(batchItem.setup)) != batchItemResult.setup:
+		return False
+
+	return all(
+		os.path.exists(pathOutputFile)
+		for pathOutputFile in batchItemResult.outputFiles
+	)
+
+def iter_batch_item_results(
+	batchItems: List[BatchItem],
+	outputDirectory: str,
+	selectedFormats: List[str],
+	numberOfWorkers: int=None,
+	cacheDirectory: str=None
+) -> Iterator[BatchItemResult]:
+	"""Run the items of a job and yield their results in order of completion.
+
+	Parameters:
+		batchItems(list): Items that are run.
+		outputDirectory(str): Directory of the exported files.
+		selectedFormats(list): Selected formats out of exp_data.exportFormats.
+		numberOfWorkers(int): Number of worker processes, one runs the items
+							  in the current process.
+		cacheDirectory(str): Directory in which the workers share their ideal curves.
+
+	Yields:
+		batchItemResult(BatchItemResult): Result of a finished item.
+	"""
+	if numberOfWorkers == 1:
+		for batchItem in batchItems:
+			yield run_batch_item(batchItem, outputDirectory, selectedFormats, cacheDirectory)
+		return
+
+	with ProcessPoolExecutor(max_workers=numberOfWorkers) as executor:
+		futures = [
+			executor.submit(
+				run_batch_item,
+				batchItem,
+				outputDirectory,
+				selectedFormats,
+				cacheDirectory
+			)
+			for batchItem in batchItems
+		]
+
+		for future in as_completed(futures):
+			yield future.result()
+
+def run_batch_item(
+	batchItem: BatchItem,
+	outputDirectory: str,
+	selectedFormats: List[str],
+	cacheDirectory: str=None
+) -> BatchItemResult:
+	"""Create and export the force volume of a single item. The disk cache of 
+	   the ideal curves is only used for this item and restored afterwards, so 
+	   running the item in the current process does not change its cache.
+	   Every error of the item is recorded in its result, so a single item 
+	   can not abort the job.
+
+	Parameters:
+		batchItem(BatchItem): Name, setup and seed of the force volume.
+		outputDirectory(str): Directory of the exported files.
+		selectedFormats(list): Selected formats out of exp_data.exportFormats.
+		cacheDirectory(str): Directory in which the workers share their ideal curves.
+
+	Returns:
+		batchItemResult(BatchItemResult): Status, exported files and timing of the item.
+	"""
+	previousDiskCache = gen_data.idealCurveCache.diskCache
+	if cacheDirectory is not None:
+		gen_data.set_ideal_curve_disk_cache(cacheDirectory)
+
+	startTime = time.perf_counter()
+	generationTime = None
+
+	try:
+		parameterMaterial, parameterMeasurement, parameterForceVolume = gen_data.create_parameter_tuples(batchItem.setup)
+		forceVolume = gen_data.create_synthetic_force_volume(
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume,
+			batchItem.seed
+		)
+		generationTime = time.perf_counter() - startTime
+
+		outputFiles = exp_data.export_to_formats(
+			forceVolume,
+			os.path.join(outputDirectory, batchItem.name),
+			selectedFormats,
+			lambda **kwargs: None
+		)
+	except Exception as error:
+		if generationTime is None:
+			generationTime = time.perf_counter() - startTime
+		return BatchItemResult(
+			batchItem.name, "failed", str(error), [],
+			generationTime, time.perf_counter() - startTime - generationTime, 
+			batchItem.setup, batchItem.seed
+		)
+	finally:
+		gen_data.idealCurveCache.diskCache = previousDiskCache
+
+	exportTime = time.perf_counter() - startTime - generationTime
+
+	return BatchItemResult(
+		batchItem.name, "done", "", outputFiles,
+		generationTime, exportTime, batchItem.setup, batchItem.seed
+	)
+
+def write_timing_summary(
+	batchItemResults: List[BatchItemResult],
+	pathSummaryFile: str
+) -> None:
+	"""Write the status and timing of every item and the total time to a csv file.
+
+	Parameters:
+		batchItemResults(list): Result of every item of the job.
+		pathSummaryFile(str): Path of the summary file.
+	"""
+	with open(pathSummaryFile, "w", newline="") as summaryFile:
+		summaryWriter = csv.writer(summaryFile)
+		summaryWriter.writerow(
+			["name", "status", "generationTime", "exportTime", "totalTime", "message"]
+		)
+
+		for batchItemResult in batchItemResults:
+			summaryWriter.writerow(
+				[
+					batchItemResult.name,
+					batchItemResult.status,
+					format(batchItemResult.generationTime, ".4f"),
+					format(batchItemResult.exportTime, ".4f"),
+					format(batchItemResult.generationTime + batchItemResult.exportTime, ".4f"),
+					batchItemResult.message
+				]
+			)
+
+		summaryWriter.writerow(
+			[
+				"total",
+				"",
+				format(sum(result.generationTime for result in batchItemResults), ".4f"),
+				format(sum(result.exportTime for result in batchItemResults), ".4f"),
+				format(sum(result.generationTime + result.exportTime for result in batchItemResults), ".4f"),
+				""
+			]
+		)
@@ -13,12 +13,23 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
 """
+from collections import namedtuple
 import os 
 import csv
-from typing import List, NamedTuple, Dict, Callable
+from typing import List, NamedTuple, Dict, Callable, TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
+
+# pandas is only imported when data frames are created, so the npz 
+# export and the start of the gui do not have to load it.
+if TYPE_CHECKING:
+	import pandas as pd
+
+from .force_volume import ForceMap, ForceVolume
+from .ragged_curves import RaggedCurves
+
+exportFormats = ("csv", "excel", "npz")
+groundTruthFileSuffix = "_ground_truth"
 
 def export_data(
 	exportParameters: NamedTuple,
@@ -42,44 +53,121 @@ def export_data(
 		dataForceVolume["jtc"],
 		dataForceVolume["hamaker"]
 	)
+	dataFrameGroundTruth = None
+	if (
+		isinstance(dataForceVolume["data"], ForceVolume) 
+		and dataForceVolume["data"].groundTruth is not None
+	):
+		dataFrameGroundTruth = create_data_frame_ground_truth(
+			dataForceVolume["data"].groundTruth
+		)
 
 	if exportParameters.exportToCSV:
 		export_to_csv(
 			dataFrameForceVolume, 
 			exportParameters.pathOutputFile
 		)
+		if dataFrameGroundTruth is not None:
+			export_to_csv(
+				dataFrameGroundTruth,
+				exportParameters.pathOutputFile + groundTruthFileSuffix
+			)
 		update_progressbar(newLabel="Exporting to CSV")
 
 	if exportParameters.exportToExcel:
 		export_to_excel(
 			dataFrameForceVolume,
 			dataFrameMetaData, 
-			exportParameters.pathOutputFile
+			exportParameters.pathOutputFile,
+			dataFrameGroundTruth
 		)
 		update_progressbar(newLabel="Exporting to Excel")
 
 	update_progressbar(stop=True)
 
+def export_to_formats(
+	forceVolume: ForceVolume,
+	pathOutputFile: str,
+	selectedFormats: List[str],
+	update_progressbar: Callable
+) -> List[str]:
+	"""Export a force volume without the gui to every selected format.
+
+	Parameters:
+		forceVolume(ForceVolume): Contains the data of every curve of the force Volume.
+		pathOutputFile(str): Path of the output files without extension.
+		selectedFormats(list): Selected formats out of exportFormats.
+		update_progressbar(function): Indicates the export progress.
+
+	Returns:
+		outputFiles(list): Paths of the written files.
+
+	Raises:
+		ValueError: If a format is unknown.
+	"""
+	unknownFormats = set(selectedFormats) - set(exportFormats)
+	if unknownFormats:
+		raise ValueError("Unknown export formats: " + ", ".join(sorted(unknownFormats)) + ".")
+
+	outputFiles = []
+
+	if "npz" in selectedFormats:
+		export_to_npz(forceVolume, pathOutputFile + ".npz")
+		outputFiles.append(pathOutputFile + ".npz")
+
+	if "csv" in selectedFormats or "excel" in selectedFormats:
+		ExportOptions = namedtuple(
+			"ExportOptions",
+			[
+				"pathOutputFile",
+				"exportToCSV",
+				"exportToExcel"
+			]
+		)
+		export_data(
+			ExportOptions(
+				pathOutputFile=pathOutputFile,
+				exportToCSV="csv" in selectedFormats,
+				exportToExcel="excel" in selectedFormats
+			),
+			{
+				"data": forceVolume,
+				"etot": forceVolume.parameterMaterial.Etot,
+				"jtc": forceVolume.parameterMaterial.jtc,
+				"hamaker": forceVolume.parameterMaterial.Hamaker
+			},
+			update_progressbar
+		)
+		if "csv" in selectedFormats:
+			outputFiles.append(pathOutputFile + ".csv")
+			if forceVolume.groundTruth is not None:
+				outputFiles.append(pathOutputFile + groundTruthFileSuffix + ".csv")
+		if "excel" in selectedFormats:
+			outputFiles.append(pathOutputFile + ".xlsx")
+
+	return outputFiles
+
 def create_data_frame_force_volume(
-	dataForceVolumeCurves: np.ndarray
-) -> pd.DataFrame:
-	"""Create a data frame from the curve data of a force volume. 
+	dataForceVolumeCurves: ForceVolume
+) -> "pd.DataFrame":
+	"""Create a data frame from the curve data of a force volume. Curves
+	   of different lengths are padded with NaN.
 
 	Parameters:
-		dataForceVolumeCurves(np.ndarray): Contains the data of every curve of the force Volume.
+		dataForceVolumeCurves(ForceVolume): Contains the data of every curve of the force Volume,
+											ragged curves or a list of curves are possible as well.
 
 	Returns:
 		dataFrameForceVolume(pd.dataframe): Contains the data of every curve of the force Volume.
 	"""
-	dataForceVolumeCurvesStacked = np.column_stack(
-		[
-			np.column_stack((curve[0], curve[1]))
-			for curve 
-			in dataForceVolumeCurves
-		]
-	)
+	if not isinstance(dataForceVolumeCurves, (ForceVolume, RaggedCurves)):
+		dataForceVolumeCurves = RaggedCurves.from_curves(dataForceVolumeCurves)
+
+	dataForceVolumeCurvesStacked = dataForceVolumeCurves.stack_columns()
 	columnNames = create_column_names(len(dataForceVolumeCurves))
 
+	import pandas as pd
+
 	return pd.DataFrame(dataForceVolumeCurvesStacked, columns=columnNames)
 
 def create_column_names(
@@ -112,7 +200,7 @@ def create_data_frame_meta_data(
 	etot: float,
 	jtc: float,
 	hamaker: float
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
 	"""Create a data frame from the meta data of a force volume.
 
 	Parameter:
@@ -123,13 +211,41 @@ def create_data_frame_meta_data(
 	Returns:
 		dataFrameMetaData(pd.dataframe): Contains the meta data of the force Volume.
 	"""
+	import pandas as pd
+
 	return pd.DataFrame(
 		[[etot, jtc, hamaker]],
 		columns=["etot", "jtc", "hamaker"]
 	)
 
+def create_data_frame_ground_truth(
+	groundTruth: NamedTuple
+) -> "pd.DataFrame":
+	"""Create a data frame from the jump to contact, point of contact and
+	   shift of every synthetic curve.
+
+	Parameters:
+		groundTruth(GroundTruth): Contains the ground truth of every synthetic curve.
+
+	Returns:
+		dataFrameGroundTruth(pd.dataframe): Contains the indices of every synthetic curve.
+	"""
+	import pandas as pd
+
+	return pd.DataFrame(
+		{
+			"indexJumpToContact": groundTruth.indexJumpToContact,
+			"indexPointOfContact": groundTruth.indexPointOfContact,
+			"shiftIndex": groundTruth.shiftIndex
+		},
+		index=pd.Index(
+			np.arange(1, len(groundTruth.indexJumpToContact) + 1),
+			name="curve"
+		)
+	)
+
 def export_to_csv(
-	dataFrameForceVolume: pd.DataFrame,
+	dataFrameForceVolume: "pd.DataFrame",
 	pathOutputFile: str
 ) -> None:
 	"""Export the curve data of a force volume to the csv file format.
@@ -145,9 +261,10 @@ def export_to_csv(
 	)
 
 def export_to_excel(
-	dataFrameForceVolume: pd.DataFrame,
-	dataFrameMetaData: pd.DataFrame,
-	pathOutputFile: str
+	dataFrameForceVolume: "pd.DataFrame",
+	dataFrameMetaData: "pd.DataFrame",
+	pathOutputFile: str,
+	dataFrameGroundTruth: "pd.DataFrame"=None
 ) -> None:
 	"""Export the data of a force volume to the xlsx file format.
 	
@@ -155,7 +272,11 @@ def export_to_excel(
 		dataFrameForceVolume(pd.dataframe): Contains the data of every curve of the force Volume.
 		dataFrameMetaData(pd.dataframe): Contains the meta data of the force Volume.
 		pathOutputFile(str): Path of the output file.
+		dataFrameGroundTruth(pd.dataframe): Contains the ground truth of every synthetic 
+											curve, if it is known.
 	"""
+	import pandas as pd
+
 	pathOutputFileAsExcel = pathOutputFile + ".xlsx"
 
 	with pd.ExcelWriter(pathOutputFileAsExcel) as writer:  
@@ -166,4 +287,66 @@ def export_to_excel(
 		dataFrameMetaData.to_excel(
 			writer, 
 			sheet_name="Meta Data"
-		)
\ No newline at end of file
+		)
+		if dataFrameGroundTruth is not None:
+			dataFrameGroundTruth.to_excel(
+				writer,
+				sheet_name="Ground Truth"
+			)
+
+def export_to_npz(
+	forceVolume: ForceVolume,
+	pathOutputFile: str
+) -> None:
+	"""Export the curves and the calculated parameters 
+	   of a force volume to the npz file format. If the
+	   curves have individual parameters, these are exported 
+	   with the prefix "curve", e.g. curveKc, the ground truth 
+	   with the prefix "groundTruth". The ground truth includes 
+	   the true tip-sample distance of every point, together with 
+	   the start distance and step size of the piezo values. Force
+	   maps additionally export their topography and phase mask.
+
+	Parameters:
+		forceVolume(ForceVolume): Contains the data of every curve of the force Volume.
+		pathOutputFile(str): Path of the output file including the extension.
+	"""
+	arrays = {
+		"idealPiezo": forceVolume.idealPiezo,
+		"idealDeflection": forceVolume.idealDeflection,
+		"shiftedPiezo": forceVolume.shiftedPiezo,
+		"shiftedDeflection": forceVolume.shiftedDeflection,
+		"syntheticDeflection": forceVolume.syntheticDeflection,
+		"etot": forceVolume.parameterMaterial.Etot,
+		"jtc": forceVolume.parameterMaterial.jtc,
+		"hamaker": forceVolume.parameterMaterial.Hamaker
+	}
+
+	if forceVolume.curveParameters is not None:
+		for parameterName, parameterValues in zip(
+			forceVolume.curveParameters._fields, 
+			forceVolume.curveParameters
+		):
+			arrays["curve" + parameterName[0].upper() + parameterName[1:]] = parameterValues
+
+	if forceVolume.groundTruth is not None:
+		for fieldName, fieldValues in zip(
+			forceVolume.groundTruth._fields, 
+			forceVolume.groundTruth
+		):
+			arrays["groundTruth" + fieldName[0].upper() + fieldName[1:]] = fieldValues
+
+		# Imported on export, as the distance is only calculated for a ground truth.
+		from .generate_data import calculate_ground_truth_tip_sample_distance
+
+		arrays["groundTruthTipSampleDistance"] = calculate_ground_truth_tip_sample_distance(
+			forceVolume
+		)
+		arrays["startDistance"] = forceVolume.parameterMeasurement.startDistance
+		arrays["stepSize"] = forceVolume.parameterMeasurement.stepSize
+
+	if isinstance(forceVolume, ForceMap):
+		arrays["topography"] = forceVolume.topography
+		arrays["phaseMask"] = forceVolume.phaseMask
+
+	np.savez(pathOutputFile, **arrays)
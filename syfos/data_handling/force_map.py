@@ -0,0 +1,326 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from . import artefacts
+from . import generate_data as gen_data
+from .force_volume import ForceMap
+
+def create_topography_plane(
+	shape: Tuple[int, int],
+	height: float=0
+) -> np.ndarray:
+	"""Create a flat topography.
+
+	Parameters:
+		shape(tuple): Number of pixels in the x and y direction.
+		height(float): Height of every pixel.
+
+	Returns:
+		topography(np.ndarray): Height of every pixel.
+	"""
+	return np.full(shape, float(height))
+
+def create_topography_tilt(
+	shape: Tuple[int, int],
+	slopeX: float,
+	slopeY: float
+) -> np.ndarray:
+	"""Create a tilted plane, starting with a height of zero in the first pixel.
+
+	Parameters:
+		shape(tuple): Number of pixels in the x and y direction.
+		slopeX(float): Height difference between neighbouring pixels in the x direction.
+		slopeY(float): Height difference between neighbouring pixels in the y direction.
+
+	Returns:
+		topography(np.ndarray): Height of every pixel.
+	"""
+	return (
+		slopeX * np.arange(shape[0])[:, np.newaxis]
+		+ slopeY * np.arange(shape[1])
+	)
+
+def create_topography_steps(
+	shape: Tuple[int, int],
+	stepHeight: float,
+	numberOfSteps: int
+) -> np.ndarray:
+	"""Create terraces of equal width along the x direction.
+
+	Parameters:
+		shape(tuple): Number of pixels in the x and y direction.
+		stepHeight(float): Height difference between neighbouring terraces.
+		numberOfSteps(int): Number of steps between the terraces.
+
+	Returns:
+		topography(np.ndarray): Height of every pixel.
+	"""
+	terraces = np.arange(shape[0]) * (numberOfSteps + 1) // shape[0]
+
+	return np.broadcast_to(
+		stepHeight * terraces[:, np.newaxis],
+		shape
+	).copy()
+
+def create_topography_roughness(
+	shape: Tuple[int, int],
+	roughness: float,
+	numberOfOctaves: int=4,
+	seed: int=None
+) -> np.ndarray:
+	"""Create a rough surface by adding smoothly interpolated random grids
+	   of increasing resolution and decreasing amplitude, similar to
+	   Perlin noise.
+
+	Parameters:
+		shape(tuple): Number of pixels in the x and y direction.
+		roughness(float): Root mean square height of the surface.
+		numberOfOctaves(int): Number of added grids, every grid has twice
+							  the resolution and half the amplitude.
+		seed(int): Seed of the random number generator.
+
+	Returns:
+		topography(np.ndarray): Height of every pixel with a mean of zero.
+	"""
+	randomGenerator = np.random.default_rng(seed)
+	topography = np.zeros(shape)
+
+	for octave in range(numberOfOctaves):
+		numberOfNodes = 2**(octave + 1) + 1
+		nodes = randomGenerator.standard_normal((numberOfNodes, numberOfNodes))
+		topography += 0.5**octave * interpolate_nodes_smoothly(nodes, shape)
+
+	topography -= topography.mean()
+	rootMeanSquare = np.sqrt(np.mean(topography**2))
+	if rootMeanSquare > 0:
+		topography *= roughness / rootMeanSquare
+
+	return topography
+
+def interpolate_nodes_smoothly(
+	nodes: np.ndarray,
+	shape: Tuple[int, int]
+) -> np.ndarray:
+	"""Helper function for create_topography_roughness. Interpolates a grid
+	   of nodes onto the pixels with a smoothstep weighting between the nodes.
+
+	Parameters:
+		nodes(np.ndarray): Values of the nodes.
+		shape(tuple): Number of pixels in the x and y direction.
+
+	Returns:
+		interpolatedValues(np.ndarray): Value of every pixel.
+	"""
+	weights = []
+	lowerNodes = []
+
+	for numberOfPixels, numberOfNodes in zip(shape, nodes.shape):
+		position = np.linspace(0, numberOfNodes - 1, numberOfPixels)
+		lowerNode = np.minimum(position.astype(np.int64), numberOfNodes - 2)
+		fraction = position - lowerNode
+		weights.append(fraction**2 * (3 - 2*fraction))
+		lowerNodes.append(lowerNode)
+
+	weightX = weights[0][:, np.newaxis]
+	weightY = weights[1]
+	x = lowerNodes[0][:, np.newaxis]
+	y = lowerNodes[1]
+
+	return (
+		(1 - weightX) * (1 - weightY) * nodes[x, y]
+		+ weightX * (1 - weightY) * nodes[x + 1, y]
+		+ (1 - weightX) * weightY * nodes[x, y + 1]
+		+ weightX * weightY * nodes[x + 1, y + 1]
+	)
+
+def create_synthetic_force_map(
+	parameterMaterials: List[NamedTuple],
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple,
+	topography: np.ndarray,
+	phaseMask: np.ndarray=None,
+	seed: int=None
+) -> ForceMap:
+	"""Create a synthetic curve for every pixel of a topography. The ideal
+	   curve of every material phase is only created once and shifted by the
+	   height of every pixel, which is added to the topography offset and
+	   rounded to the step size. The number of curves in the force volume
+	   parameters is ignored.
+
+	Parameters:
+		parameterMaterials(list): Material parameters of every phase.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		parameterForceVolume(namedtupel): Contains the noise level and the virtual
+										  deflection and topography offset.
+		topography(np.ndarray): Height of every pixel.
+		phaseMask(np.ndarray): Index of the material phase of every pixel. If not
+							   specified, every pixel has the first phase.
+		seed(int): Seed of the random number generator, makes the noise reproducible.
+				   If not specified, a new seed is drawn and stored in the force map.
+
+	Returns:
+		syntheticForceMap(ForceMap): Synthetic force distance curves and ground truth of 
+									 every pixel and the ideal curve of the first phase.
+
+	Raises:
+		ValueError: If the topography is not two dimensional, the phase mask does not
+					match the topography or contains an unknown phase or per curve
+					jitter is selected.
+	"""
+	topography = np.asarray(topography, dtype=np.float64)
+	if topography.ndim != 2:
+		raise ValueError("Topography must be two dimensional.")
+
+	if phaseMask is None:
+		phaseMask = np.zeros(topography.shape, dtype=np.int64)
+	phaseMask = np.asarray(phaseMask)
+
+	if phaseMask.shape != topography.shape:
+		raise ValueError("Phase mask must have the same shape as the topography.")
+	if (
+		not np.issubdtype(phaseMask.dtype, np.integer)
+		or np.any((phaseMask < 0) | (phaseMask >= len(parameterMaterials)))
+	):
+		raise ValueError("Phase mask contains an unknown material phase.")
+	if gen_data.has_curve_jitter(parameterForceVolume):
+		raise ValueError("Force maps do not support per curve jitter.")
+
+	seed = gen_data.resolve_seed(seed)
+
+	numberOfPixels = topography.size
+	parameterForceVolume = parameterForceVolume._replace(numberOfCurves=numberOfPixels)
+	phases = np.unique(phaseMask)
+
+	idealCurves = {
+		phase: gen_data.get_ideal_curve(parameterMaterials[phase], parameterMeasurement)
+		for phase in phases
+	}
+	length = max(len(piezo) for piezo, _ in idealCurves.values())
+	idealCurves = {
+		phase: extend_ideal_curve(idealCurve, length, parameterMaterials[phase], parameterMeasurement)
+		for phase, idealCurve in idealCurves.items()
+	}
+
+	syntheticDeflection = gen_data.draw_synthetic_deflection(
+		np.zeros(length),
+		parameterForceVolume.noise,
+		numberOfPixels,
+		seed
+	)
+
+	curveParameters = gen_data.CurveParameters(
+		topographyOffset=parameterForceVolume.topographyOffset + topography.ravel(),
+		virtualDeflection=np.full(numberOfPixels, parameterForceVolume.virtualDeflection),
+		kc=np.empty(numberOfPixels),
+		radius=np.empty(numberOfPixels)
+	)
+
+	groundTruth = gen_data.GroundTruth(
+		indexJumpToContact=np.empty(numberOfPixels, dtype=np.int64),
+		indexPointOfContact=np.empty(numberOfPixels, dtype=np.int64),
+		shiftIndex=np.empty(numberOfPixels, dtype=np.int64)
+	)
+
+	for phase in phases:
+		pixels = np.flatnonzero(phaseMask.ravel() == phase)
+		parameterMaterial = parameterMaterials[phase]
+		curveParameters.kc[pixels] = parameterMaterial.kc
+		curveParameters.radius[pixels] = parameterMaterial.radius
+
+		jitteredDeflection, phaseGroundTruth = gen_data.create_jittered_deflection(
+			idealCurves[phase][1],
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume,
+			gen_data.CurveParameters(*(values[pixels] for values in curveParameters))
+		)
+		syntheticDeflection[pixels] += jitteredDeflection
+
+		for values, phaseValues in zip(groundTruth, phaseGroundTruth):
+			values[pixels] = phaseValues
+
+	piezo, deflection = idealCurves[phases[0]]
+	shiftedPiezo, shiftedDeflection = gen_data.shift_ideal_curve(
+		piezo,
+		deflection,
+		parameterForceVolume
+	)
+
+	# The pixels are measured row by row, so the drift follows the scan.
+	if artefacts.has_artefacts(parameterForceVolume):
+		artefacts.apply_artefacts(
+			syntheticDeflection,
+			shiftedPiezo,
+			parameterForceVolume,
+			gen_data.create_artefact_generators(seed)
+		)
+
+	forceMap = ForceMap(
+		piezo,
+		deflection,
+		shiftedPiezo,
+		shiftedDeflection,
+		syntheticDeflection,
+		topography,
+		phaseMask,
+		list(parameterMaterials),
+		parameterMeasurement,
+		parameterForceVolume,
+		seed,
+		curveParameters
+	)
+	forceMap.groundTruth = groundTruth
+
+	return forceMap
+
+def extend_ideal_curve(
+	idealCurve: Tuple[np.ndarray, np.ndarray],
+	length: int,
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Helper function for create_synthetic_force_map. Extends the ideal curve
+	   of a phase to the length of the longest ideal curve of all phases.
+
+	Parameters:
+		idealCurve(tuple): Piezo (x) and deflection (y) values of the ideal curve.
+		length(int): Length of the longest ideal curve.
+		parameterMaterial(namedtupel): Contains all parameters describing the material
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		piezo(np.ndarray): Piezo (x) values of the extended ideal curve.
+		deflection(np.ndarray): Deflection (y) values of the extended ideal curve.
+	"""
+	if len(idealCurve[0]) < length:
+		idealCurve = gen_data.get_ideal_curve(
+			parameterMaterial,
+			parameterMeasurement._replace(
+				maximumPiezo=gen_data.calculate_piezo_value(
+					parameterMeasurement.startDistance,
+					parameterMeasurement.stepSize,
+					length - 1
+				)
+			)
+		)
+
+	return idealCurve[0][:length], idealCurve[1][:length]
@@ -0,0 +1,342 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+class ForceVolume:
+	"""Synthetic curves sharing one piezo axis, stored as one contiguous
+	   deflection matrix, together with the ideal curve they are based on.
+
+	   Indexing and iteration follow the former list layout: the ideal
+	   curve, the shifted ideal curve and then every synthetic curve,
+	   each as a list of piezo (x) and deflection (y) values.
+
+	   If the curves were created with per curve jitter, the topography
+	   offset, virtual deflection, spring constant and tip radius of
+	   every curve are kept in curveParameters. The error of storing the
+	   values with a lower precision than they were calculated with is kept 
+	   in storageError. The jump to contact, point of contact and shift of
+	   every curve known from the generation are kept in groundTruth, the 
+	   true tip-sample distance is calculated from them when needed.
+	"""
+	__slots__ = (
+		"idealPiezo",
+		"idealDeflection",
+		"shiftedPiezo",
+		"shiftedDeflection",
+		"syntheticDeflection",
+		"parameterMaterial",
+		"parameterMeasurement",
+		"parameterForceVolume",
+		"seed",
+		"curveParameters",
+		"storageError",
+		"groundTruth"
+	)
+
+	def __init__(
+		self,
+		idealPiezo: np.ndarray,
+		idealDeflection: np.ndarray,
+		shiftedPiezo: np.ndarray,
+		shiftedDeflection: np.ndarray,
+		syntheticDeflection: np.ndarray,
+		parameterMaterial: NamedTuple=None,
+		parameterMeasurement: NamedTuple=None,
+		parameterForceVolume: NamedTuple=None,
+		seed: int=None,
+		curveParameters: NamedTuple=None
+	):
+		self.idealPiezo = idealPiezo
+		self.idealDeflection = idealDeflection
+		self.shiftedPiezo = shiftedPiezo
+		self.shiftedDeflection = shiftedDeflection
+		self.syntheticDeflection = syntheticDeflection
+		self.parameterMaterial = parameterMaterial
+		self.parameterMeasurement = parameterMeasurement
+		self.parameterForceVolume = parameterForceVolume
+		self.seed = seed
+		self.curveParameters = curveParameters
+		self.storageError = None
+		self.groundTruth = None
+
+	@property
+	def numberOfCurves(self) -> int:
+		"""Number of synthetic curves in the force volume."""
+		return len(self.syntheticDeflection)
+
+	def __len__(self) -> int:
+		return self.numberOfCurves + 2
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [
+				self[currentIndex]
+				for currentIndex in range(*index.indices(len(self)))
+			]
+
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError("Force volume index out of range.")
+
+		if index == 0:
+			return [self.idealPiezo, self.idealDeflection]
+		if index == 1:
+			return [self.shiftedPiezo, self.shiftedDeflection]
+
+		return [self.shiftedPiezo, self.get_synthetic_deflection(index - 2)]
+
+	def __iter__(self) -> Iterator[List]:
+		yield [self.idealPiezo, self.idealDeflection]
+		yield [self.shiftedPiezo, self.shiftedDeflection]
+
+		for index in range(self.numberOfCurves):
+			yield [self.shiftedPiezo, self.get_synthetic_deflection(index)]
+
+	def get_synthetic_deflection(
+		self,
+		indices
+	) -> np.ndarray:
+		"""Get the deflection (y) values of one or more synthetic curves.
+
+		Parameters:
+			indices(int, slice or array): Indices of the synthetic curves.
+
+		Returns:
+			syntheticDeflection(np.ndarray): Deflection values of a single curve
+											 or one row for every selected curve.
+		"""
+		return self.syntheticDeflection[indices]
+
+	def get_curve(
+		self,
+		index: int
+	) -> Tuple[np.ndarray, np.ndarray]:
+		"""Get a synthetic curve of the force volume.
+
+		Parameters:
+			index(int): Index of the synthetic curve.
+
+		Returns:
+			piezo(np.ndarray): Piezo (x) values of the synthetic curve.
+			deflection(np.ndarray): Deflection (y) values of the synthetic curve.
+		"""
+		return self.shiftedPiezo, self.get_synthetic_deflection(index)
+
+	def as_list(self) -> List:
+		"""Convert the force volume into the former list layout.
+
+		Returns:
+			forceVolume(list): List of synthetic force distance curves and
+							   the ideal curve on which they are based.
+		"""
+		return list(self)
+
+	def stack_columns(self) -> np.ndarray:
+		"""Arrange the x and y values of every curve as neighbouring columns.
+
+		Returns:
+			stackedColumns(np.ndarray): Matrix with one row per point and two
+										columns per curve, starting with the
+										ideal and shifted ideal curve.
+		"""
+		stackedColumns = np.empty(
+			(len(self.shiftedPiezo), 2 * len(self)),
+			dtype=np.result_type(self.shiftedDeflection, self.idealDeflection)
+		)
+		stackedColumns[:, 0] = self.idealPiezo
+		stackedColumns[:, 1] = self.idealDeflection
+		stackedColumns[:, 2] = self.shiftedPiezo
+		stackedColumns[:, 3] = self.shiftedDeflection
+		stackedColumns[:, 4::2] = self.shiftedPiezo[:, np.newaxis]
+		stackedColumns[:, 5::2] = self.get_synthetic_deflection(slice(None)).T
+
+		return stackedColumns
+
+class LazyForceVolume(ForceVolume):
+	"""A force volume that only stores the shifted ideal curve, the noise
+	   level and the seed. The noise of the synthetic curves is drawn on 
+	   demand from the stream of the curve, like the noise of a force volume
+	   with the same seed, so a curve is always the same regardless of the
+	   order or process in which it is accessed. Accessing a curve only 
+	   draws the noise of that curve. The curves are calculated with the 
+	   precision of the shifted ideal curve passed on creation and returned 
+	   with the storage type, like the curves of a force volume.
+	"""
+	__slots__ = (
+		"noise",
+		"lazyNumberOfCurves",
+		"computeShiftedDeflection",
+		"storageDtype"
+	)
+
+	def __init__(
+		self,
+		idealPiezo: np.ndarray,
+		idealDeflection: np.ndarray,
+		shiftedPiezo: np.ndarray,
+		shiftedDeflection: np.ndarray,
+		numberOfCurves: int,
+		noise: float,
+		seed: int=None,
+		parameterMaterial: NamedTuple=None,
+		parameterMeasurement: NamedTuple=None,
+		parameterForceVolume: NamedTuple=None,
+		storageDtype: type=None
+	):
+		if noise < 0:
+			raise ValueError("Noise value must be positive.")
+
+		if seed is None:
+			seed = int(np.random.SeedSequence().generate_state(1, np.uint64)[0])
+
+		self.idealPiezo = idealPiezo
+		self.idealDeflection = idealDeflection
+		self.shiftedPiezo = shiftedPiezo
+		self.shiftedDeflection = shiftedDeflection
+		self.parameterMaterial = parameterMaterial
+		self.parameterMeasurement = parameterMeasurement
+		self.parameterForceVolume = parameterForceVolume
+		self.seed = seed
+		self.curveParameters = None
+		self.storageError = None
+		self.groundTruth = None
+		self.noise = noise
+		self.lazyNumberOfCurves = numberOfCurves
+		self.computeShiftedDeflection = shiftedDeflection
+		self.storageDtype = shiftedDeflection.dtype if storageDtype is None else storageDtype
+
+	@property
+	def numberOfCurves(self) -> int:
+		"""Number of synthetic curves in the force volume."""
+		return self.lazyNumberOfCurves
+
+	def get_synthetic_deflection(
+		self,
+		indices
+	) -> np.ndarray:
+		"""Calculate the deflection (y) values of one or more synthetic curves.
+
+		Parameters:
+			indices(int, slice or array): Indices of the synthetic curves.
+
+		Returns:
+			syntheticDeflection(np.ndarray): Deflection values of a single curve
+											 or one row for every selected curve.
+		"""
+		# Imported on access, as generate_data imports this module.
+		from .generate_data import draw_curve_noise
+
+		if isinstance(indices, slice):
+			indices = range(*indices.indices(self.numberOfCurves))
+		elif np.ndim(indices) == 0:
+			return self.get_synthetic_deflection([indices])[0]
+
+		indices = np.asarray(indices, dtype=np.int64)
+		if np.any((indices < -self.numberOfCurves) | (indices >= self.numberOfCurves)):
+			raise IndexError("Force volume index out of range.")
+		indices = np.where(indices < 0, indices + self.numberOfCurves, indices)
+
+		syntheticDeflection = np.empty(
+			(len(indices), len(self.computeShiftedDeflection)),
+			dtype=np.result_type(self.computeShiftedDeflection, np.float64)
+		)
+		draw_curve_noise(self.seed, indices, syntheticDeflection)
+
+		syntheticDeflection *= self.noise
+		syntheticDeflection += self.computeShiftedDeflection
+
+		return syntheticDeflection.astype(self.storageDtype, copy=False)
+
+	@property
+	def syntheticDeflection(self) -> np.ndarray:
+		"""Deflection (y) values of every synthetic curve, calculated on access."""
+		return self.get_synthetic_deflection(slice(None))
+
+class ForceMap(ForceVolume):
+	"""A force volume whose synthetic curves belong to the pixels of a 
+	   grid, stored row by row. Every pixel has the height of the 
+	   topography and the material of its phase in the phase mask.
+	"""
+	__slots__ = (
+		"topography",
+		"phaseMask",
+		"parameterMaterials"
+	)
+
+	def __init__(
+		self,
+		idealPiezo: np.ndarray,
+		idealDeflection: np.ndarray,
+		shiftedPiezo: np.ndarray,
+		shiftedDeflection: np.ndarray,
+		syntheticDeflection: np.ndarray,
+		topography: np.ndarray,
+		phaseMask: np.ndarray,
+		parameterMaterials: List[NamedTuple],
+		parameterMeasurement: NamedTuple=None,
+		parameterForceVolume: NamedTuple=None,
+		seed: int=None,
+		curveParameters: NamedTuple=None
+	):
+		super().__init__(
+			idealPiezo,
+			idealDeflection,
+			shiftedPiezo,
+			shiftedDeflection,
+			syntheticDeflection,
+			parameterMaterials[0],
+			parameterMeasurement,
+			parameterForceVolume,
+			seed,
+			curveParameters
+		)
+		self.topography = topography
+		self.phaseMask = phaseMask
+		self.parameterMaterials = parameterMaterials
+
+	@property
+	def shape(self) -> Tuple[int, int]:
+		"""Number of pixels in the x and y direction."""
+		return self.topography.shape
+
+	def get_deflection_map(self) -> np.ndarray:
+		"""Get the deflection (y) values of every pixel.
+
+		Returns:
+			deflectionMap(np.ndarray): View of the synthetic deflection values
+									   with the shape (x pixels, y pixels, points).
+		"""
+		return self.syntheticDeflection.reshape(*self.shape, -1)
+
+	def get_pixel(
+		self,
+		x: int,
+		y: int
+	) -> Tuple[np.ndarray, np.ndarray]:
+		"""Get the synthetic curve of a pixel.
+
+		Parameters:
+			x(int): Index of the pixel in the x direction.
+			y(int): Index of the pixel in the y direction.
+
+		Returns:
+			piezo(np.ndarray): Piezo (x) values of the synthetic curve.
+			deflection(np.ndarray): Deflection (y) values of the synthetic curve.
+		"""
+		return self.shiftedPiezo, self.get_deflection_map()[x, y]
@@ -14,10 +14,89 @@ You should have received a copy of the GNU General Public License
 along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
-from typing import NamedTuple, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, NamedTuple, Tuple, List
 
 import numpy as np
 
+from . import artefacts
+from . import recurrence_backends
+from .force_volume import ForceMap, ForceVolume, LazyForceVolume
+from .ideal_curve_cache import IdealCurveCache, IdealCurveDiskCache
+
+# Increase the version whenever the values of the ideal curve change,
+# so curves cached on disk by an older solver are no longer used.
+solverVersion = "1"
+
+idealCurveCache = IdealCurveCache()
+
+# Adaptively sampled ideal curves up to this length are calculated at every
+# point, which is faster than calculating the points of every bisection level.
+maximumLengthDenseSampling = 16384
+# Number of synthetic curves drawn by one task of a worker. The noise of
+# every curve has its own stream, so the value does not change the noise.
+noiseBlockSize = 256
+
+IdealCurveBatch = namedtuple(
+	"IdealCurveBatch",
+	[
+		"piezo",
+		"deflection",
+		"lengths",
+		"indexJumpToContact",
+		"indexPointOfContact"
+	]
+)
+
+StorageError = namedtuple(
+	"StorageError",
+	[
+		"maximumAbsoluteError",
+		"maximumRelativeError"
+	]
+)
+
+# The extended precision is the longdouble of the platform, which
+# equals float64 on some platforms, e.g. with MSVC on Windows.
+computePrecisions = {
+	"float64": np.float64,
+	"extended": np.longdouble
+}
+
+storagePrecisions = {
+	"float32": np.float32,
+	"float64": np.float64
+}
+
+CurvePlan = namedtuple(
+	"CurvePlan",
+	[
+		"lengthApproach",
+		"indexPointOfContact",
+		"length",
+		"exact"
+	]
+)
+
+CurveParameters = namedtuple(
+	"CurveParameters",
+	[
+		"topographyOffset",
+		"virtualDeflection",
+		"kc",
+		"radius"
+	]
+)
+
+GroundTruth = namedtuple(
+	"GroundTruth",
+	[
+		"indexJumpToContact",
+		"indexPointOfContact",
+		"shiftIndex"
+	]
+)
+
 def get_parameter_tuples() -> Tuple: 
 	"""Combine the different components of the virtual setup
 	   into named tuples.
@@ -28,7 +107,9 @@ def get_parameter_tuples() -> Tuple:
 		parameterMeasurement(namedtupel): Combines all parameters describing the virtual
 										  measuring system.
 		parameterForceVolume(namedtupel): Combines the number of synthetic curves, the noise
-										  level and the virtual deflection and topography offset.
+										  level, the virtual deflection and topography offset,
+										  the spread of the per curve parameters and the
+										  parameters of the artefacts.
 	"""
 	ParameterMaterial = namedtuple(
 		"ParameterMaterial",
@@ -54,12 +135,143 @@ def get_parameter_tuples() -> Tuple:
 			"numberOfCurves",
 			"noise",
 			"virtualDeflection",
-			"topographyOffset"
-		]
+			"topographyOffset",
+			"topographyOffsetSpread",
+			"virtualDeflectionSpread",
+			"kcSpread",
+			"radiusSpread",
+			"colouredNoise",
+			"colouredNoiseExponent",
+			"interferenceAmplitude",
+			"interferencePeriod",
+			"driftLinear",
+			"driftQuadratic",
+			"baselineTilt"
+		],
+		defaults=(0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0)
 	)
 
 	return ParameterMaterial, ParameterMeasurement, ParameterForceVolume
 
+setupParameterNames = (
+	"eProbe",
+	"poissonRatioProbe",
+	"hamakerProbe",
+	"kc",
+	"radius",
+	"eSample",
+	"poissonRatioSample",
+	"hamakerSample",
+	"startDistance",
+	"stepSize",
+	"maximumPiezo",
+	"numberOfCurves",
+	"noise",
+	"virtualDeflection",
+	"topographyOffset"
+)
+
+# Optional parameters of a setup, a missing spread means no per curve jitter.
+setupSpreadParameterNames = (
+	"topographyOffsetSpread",
+	"virtualDeflectionSpread",
+	"kcSpread",
+	"radiusSpread"
+)
+
+# Optional parameters of the artefacts, see artefacts.apply_artefacts.
+# A missing parameter takes the default of the force volume parameters.
+setupArtefactParameterNames = (
+	"colouredNoise",
+	"colouredNoiseExponent",
+	"interferenceAmplitude",
+	"interferencePeriod",
+	"driftLinear",
+	"driftQuadratic",
+	"baselineTilt"
+)
+
+def create_parameter_tuples(
+	setup: Dict
+) -> Tuple:
+	"""Group the input parameters of a virtual setup into named tuples
+	   and calculate the etot, hamaker and jtc values.
+
+	Parameters:
+		setup(dict): Contains a value for every name in setupParameterNames and
+					 optionally for the names in setupSpreadParameterNames and
+					 setupArtefactParameterNames.
+
+	Returns:
+		parameterMaterial(namedtupel): Combines all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Combines all parameters describing the virtual
+										  measuring system.
+		parameterForceVolume(namedtupel): Combines the number of synthetic curves, the noise
+										  level and the virtual deflection and topography offset.
+
+	Raises:
+		ValueError: If a parameter of the setup is missing.
+	"""
+	missingParameters = [
+		parameterName
+		for parameterName in setupParameterNames
+		if parameterName not in setup
+	]
+	if missingParameters:
+		raise ValueError(
+			"Missing parameters: " + ", ".join(missingParameters) + "."
+		)
+
+	ParameterMaterial, ParameterMeasurement, ParameterForceVolume = get_parameter_tuples()
+
+	hamaker = calculate_hamaker(
+		float(setup["hamakerProbe"]),
+		float(setup["hamakerSample"])
+	)
+	jtc = calculate_jtc(
+		hamaker,
+		float(setup["radius"]),
+		float(setup["kc"])
+	)
+	etot = calculate_etot(
+		float(setup["poissonRatioProbe"]),
+		float(setup["eProbe"]),
+		float(setup["poissonRatioSample"]),
+		float(setup["eSample"])
+	)
+
+	parameterMaterial = ParameterMaterial(
+		kc=float(setup["kc"]),
+		radius=float(setup["radius"]),
+		Hamaker=hamaker,
+		Etot=etot,
+		jtc=jtc,
+	)
+	parameterMeasurement = ParameterMeasurement(
+		startDistance=float(setup["startDistance"]),
+		stepSize=float(setup["stepSize"]),
+		maximumPiezo=float(setup["maximumPiezo"]),	
+	)
+	parameterForceVolume = ParameterForceVolume(
+		numberOfCurves=int(setup["numberOfCurves"]),
+		noise=float(setup["noise"]),
+		virtualDeflection=float(setup["virtualDeflection"]),
+		topographyOffset=float(setup["topographyOffset"]),
+		**{
+			parameterName: float(setup.get(parameterName, 0))
+			for parameterName in setupSpreadParameterNames
+		},
+		**{
+			parameterName: float(
+				setup.get(parameterName, ParameterForceVolume._field_defaults[parameterName])
+			)
+			for parameterName in setupArtefactParameterNames
+		}
+	)
+
+	return parameterMaterial, parameterMeasurement, parameterForceVolume
+
 def calculate_jtc(
 	hamaker: float, 
 	radius: float, 
@@ -139,10 +351,16 @@ def calculate_hamaker(
 def create_synthetic_force_volume(
 	parameterMaterial: NamedTuple, 
 	parameterMeasurement: NamedTuple, 
-	parameterForceVolume: NamedTuple
-) -> List:
+	parameterForceVolume: NamedTuple,
+	seed: int=None,
+	lazy: bool=False,
+	computePrecision: str="float64",
+	storagePrecision: str="float64",
+	numberOfWorkers: int=1
+) -> ForceVolume:
 	"""Create a set of synthetic curves from given parameters, 
 	   including a noise level, virtual deflection and topography offset.
+	   The synthetic curves are identical for every number of workers.
 
 	Parameters:
 		parameterMaterial(namedtupel): Contains all parameters describing the material 
@@ -151,14 +369,32 @@ def create_synthetic_force_volume(
 										  measuring system.
 		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
 										  level and the virtual deflection and topography offset.
+		seed(int): Seed of the random number generator, makes the noise reproducible.
+				   If not specified, a new seed is drawn and stored in the force volume.
+		lazy(bool): If selected, the synthetic curves are only calculated when they
+					are accessed, see LazyForceVolume.
+		computePrecision(str): Precision of the contact part of the ideal curve, 
+							   see computePrecisions.
+		storagePrecision(str): Precision of the stored values, see storagePrecisions.
+		numberOfWorkers(int): Number of threads drawing the noise.
 	
 	Returns:
-		syntheticForceVolume(list): List of synthetic force distance curves and
-								 	the ideal curve on which they are based.
+		syntheticForceVolume(ForceVolume): Synthetic force distance curves, the ideal
+										   curve on which they are based and the 
+										   ground truth of every curve.
+
+	Raises:
+		ValueError: If per curve jitter or artefacts are selected for a lazy 
+					force volume, a precision is unknown or an artefact 
+					parameter is invalid.
 	"""
-	piezo, deflection = create_ideal_curve(
+	storageDtype = get_precision_dtype(storagePrecision, storagePrecisions)
+	seed = resolve_seed(seed)
+
+	piezo, deflection = get_ideal_curve(
 		parameterMaterial, 
-		parameterMeasurement
+		parameterMeasurement,
+		computePrecision
 	)
 	
 	shiftedPiezo, shiftedDeflection = shift_ideal_curve(
@@ -166,71 +402,1419 @@ def create_synthetic_force_volume(
 		deflection,
 		parameterForceVolume
 	)
+	# The ground truth is located before the values are stored with a 
+	# lower precision, which would change the deflection of the attraction.
+	groundTruth = create_ground_truth(
+		deflection,
+		parameterMeasurement,
+		parameterForceVolume.numberOfCurves
+	)
 
-	syntheticDeflectionValues = multiply_and_apply_noise_to_deflection(
-		shiftedDeflection, 
-		parameterForceVolume
+	if lazy and artefacts.has_artefacts(parameterForceVolume):
+		raise ValueError("Lazy force volumes do not support artefacts.")
+
+	if has_curve_jitter(parameterForceVolume):
+		if lazy:
+			raise ValueError("Lazy force volumes do not support per curve jitter.")
+
+		forceVolume = create_jittered_force_volume(
+			piezo,
+			deflection,
+			shiftedPiezo,
+			shiftedDeflection,
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume,
+			seed,
+			numberOfWorkers
+		)
+		groundTruth = forceVolume.groundTruth
+	elif lazy:
+		forceVolume = LazyForceVolume(
+			piezo,
+			deflection,
+			shiftedPiezo,
+			shiftedDeflection,
+			parameterForceVolume.numberOfCurves,
+			parameterForceVolume.noise,
+			seed,
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume,
+			storageDtype
+		)
+	else:
+		syntheticDeflectionValues = draw_synthetic_deflection(
+			shiftedDeflection, 
+			parameterForceVolume.noise,
+			parameterForceVolume.numberOfCurves,
+			seed,
+			numberOfWorkers=numberOfWorkers
+		)
+
+		forceVolume = ForceVolume(
+			piezo,
+			deflection,
+			shiftedPiezo,
+			shiftedDeflection,
+			syntheticDeflectionValues,
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume,
+			seed
+		)
+
+	if artefacts.has_artefacts(parameterForceVolume):
+		artefacts.apply_artefacts(
+			forceVolume.syntheticDeflection,
+			shiftedPiezo,
+			parameterForceVolume,
+			create_artefact_generators(seed)
+		)
+
+	forceVolume.storageError = convert_storage_precision(forceVolume, storageDtype)
+	forceVolume.groundTruth = groundTruth
+
+	return forceVolume
+
+def iter_synthetic_force_volume(
+	parameterMaterial: NamedTuple, 
+	parameterMeasurement: NamedTuple, 
+	parameterForceVolume: NamedTuple,
+	chunkSize: int,
+	seed: int=None,
+	storagePrecision: str="float64"
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+	"""Create the synthetic curves of a force volume in chunks, so the 
+	   size of the force volume is not limited by the available memory.
+	   The ideal and shifted ideal curve are only calculated once. For 
+	   the same seed the chunks are identical to the synthetic curves 
+	   of create_synthetic_force_volume, independent of the chunk size.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
+										  level and the virtual deflection and topography offset.
+		chunkSize(int): Maximum number of synthetic curves per chunk.
+		seed(int): Seed of the random number generator, makes the noise reproducible.
+		storagePrecision(str): Precision of the yielded values, see storagePrecisions.
+
+	Yields:
+		shiftedPiezo(np.ndarray): Piezo (x) values shared by all synthetic curves.
+		syntheticDeflectionChunk(np.ndarray): Deflection (y) values of the 
+											  synthetic curves in the chunk.
+
+	Raises:
+		ValueError: If the chunk size is not positive, per curve jitter or artefacts
+					are selected or the storage precision is unknown.
+	"""
+	if chunkSize < 1:
+		raise ValueError("Chunk size must be positive.")
+
+	if has_curve_jitter(parameterForceVolume):
+		raise ValueError("Chunked force volumes do not support per curve jitter.")
+	if artefacts.has_artefacts(parameterForceVolume):
+		raise ValueError("Chunked force volumes do not support artefacts.")
+
+	storageDtype = get_precision_dtype(storagePrecision, storagePrecisions)
+
+	piezo, deflection = get_ideal_curve(
+		parameterMaterial, 
+		parameterMeasurement
+	)
+	
+	shiftedPiezo, shiftedDeflection = shift_ideal_curve(piezo, deflection, parameterForceVolume)
+	storedShiftedPiezo = shiftedPiezo.astype(storageDtype, copy=False)
+
+	for startIndex in range(0, parameterForceVolume.numberOfCurves, chunkSize):
+		yield storedShiftedPiezo, draw_synthetic_deflection(
+			shiftedDeflection,
+			parameterForceVolume.noise,
+			min(chunkSize, parameterForceVolume.numberOfCurves - startIndex),
+			seed,
+			startIndex
+		).astype(storageDtype, copy=False)
+
+def get_precision_dtype(
+	precision: str,
+	precisions: Dict[str, type]
+) -> type:
+	"""Get the floating point type of a precision.
+
+	Parameters:
+		precision(str): Name of the precision.
+		precisions(dict): Available precisions, computePrecisions or storagePrecisions.
+
+	Returns:
+		dtype(type): Floating point type of the precision.
+
+	Raises:
+		ValueError: If the precision is unknown.
+	"""
+	try:
+		return precisions[precision]
+	except KeyError:
+		raise ValueError(
+			"Unknown precision: " + str(precision) + ". Choose from " 
+			+ ", ".join(precisions) + "."
+		)
+
+def measure_storage_error(
+	referenceValues: np.ndarray,
+	storageDtype: type,
+	storedValues: np.ndarray=None
+) -> StorageError:
+	"""Measure the error of storing values with a lower precision. The 
+	   relative error refers to the largest absolute reference value, 
+	   since the relative error of single values near zero is meaningless.
+
+	Parameters:
+		referenceValues(np.ndarray): Values in the precision of the calculation.
+		storageDtype(type): Floating point type of the stored values.
+		storedValues(np.ndarray): Reference values already converted to the 
+								  storage type. If not specified, they are converted.
+
+	Returns:
+		storageError(StorageError): Maximum absolute and relative error of the stored values.
+	"""
+	referenceValues = np.asarray(referenceValues)
+	if storedValues is None:
+		storedValues = referenceValues.astype(storageDtype)
+	absoluteError = storedValues.astype(referenceValues.dtype)
+	absoluteError -= referenceValues
+	np.abs(absoluteError, out=absoluteError)
+	maximumAbsoluteError = float(np.max(absoluteError, initial=0))
+	maximumReferenceValue = float(np.max(np.abs(referenceValues), initial=0))
+
+	return StorageError(
+		maximumAbsoluteError,
+		maximumAbsoluteError / maximumReferenceValue if maximumReferenceValue > 0 else 0.0
+	)
+
+def convert_storage_precision(
+	forceVolume: ForceVolume,
+	storageDtype: type
+) -> StorageError:
+	"""Store the values of a force volume, which are calculated with the 
+	   compute precision, with the storage precision. The values are only 
+	   converted once at the end, so the storage precision does not change 
+	   the noise or artefacts. The storage error is measured on the synthetic
+	   deflection values, a lazy force volume only stores its shifted ideal 
+	   curve and converts every accessed curve, see LazyForceVolume.
+
+	Parameters:
+		forceVolume(ForceVolume): Synthetic force volume with the compute precision.
+		storageDtype(type): Floating point type of the stored values.
+
+	Returns:
+		storageError(StorageError): Maximum absolute and relative error of the stored values.
+	"""
+	if isinstance(forceVolume, LazyForceVolume):
+		storageError = measure_storage_error(forceVolume.shiftedDeflection, storageDtype)
+	else:
+		storedDeflection = forceVolume.syntheticDeflection.astype(storageDtype, copy=False)
+		storageError = measure_storage_error(
+			forceVolume.syntheticDeflection,
+			storageDtype,
+			storedDeflection
+		)
+		forceVolume.syntheticDeflection = storedDeflection
+
+	forceVolume.idealPiezo = forceVolume.idealPiezo.astype(storageDtype, copy=False)
+	forceVolume.idealDeflection = forceVolume.idealDeflection.astype(storageDtype, copy=False)
+	forceVolume.shiftedPiezo = forceVolume.shiftedPiezo.astype(storageDtype, copy=False)
+	forceVolume.shiftedDeflection = forceVolume.shiftedDeflection.astype(storageDtype, copy=False)
+
+	return storageError
+
+def has_curve_jitter(
+	parameterForceVolume: NamedTuple
+) -> bool:
+	"""Check if any per curve parameter has a spread.
+
+	Parameters:
+		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
+										  level, the virtual deflection and topography offset
+										  and the spread of the per curve parameters.
+
+	Returns:
+		hasCurveJitter(bool): True if the curves of the force volume differ apart from the noise.
+	"""
+	return any(
+		spread != 0
+		for spread in (
+			parameterForceVolume.topographyOffsetSpread,
+			parameterForceVolume.virtualDeflectionSpread,
+			parameterForceVolume.kcSpread,
+			parameterForceVolume.radiusSpread
+		)
+	)
+
+def create_jittered_force_volume(
+	piezo: np.ndarray,
+	deflection: np.ndarray,
+	shiftedPiezo: np.ndarray,
+	shiftedDeflection: np.ndarray,
+	parameterMaterial: NamedTuple, 
+	parameterMeasurement: NamedTuple, 
+	parameterForceVolume: NamedTuple,
+	seed: int=None,
+	numberOfWorkers: int=1
+) -> ForceVolume:
+	"""Create a force volume in which the topography offset, virtual deflection,
+	   spring constant and tip radius of every curve are drawn from a normal 
+	   distribution around the parameters of the force volume. All curves keep 
+	   the shared piezo values of the shifted ideal curve.
+
+	Parameters:
+		piezo(np.ndarray): Piezo (x) values of the ideal curve.
+		deflection(np.ndarray): Deflection (y) values of the ideal curve. 
+		shiftedPiezo(np.ndarray): Piezo (x) values shifted by the topography offset.
+		shiftedDeflection(np.ndarray): Deflection (y) values shifted by the virtual deflection.
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
+										  level, the virtual deflection and topography offset
+										  and the spread of the per curve parameters.
+		seed(int): Seed of the random number generator, makes the jitter and noise reproducible.
+		numberOfWorkers(int): Number of threads drawing the noise.
+
+	Returns:
+		syntheticForceVolume(ForceVolume): Synthetic force distance curves, the ideal curve
+										   on which they are based and the parameters and
+										   ground truth of every curve.
+	"""
+	curveParameters = draw_curve_parameters(
+		parameterMaterial,
+		parameterForceVolume,
+		create_curve_parameter_generator(seed)
+	)
+	jitteredDeflection, groundTruth = create_jittered_deflection(
+		deflection,
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		curveParameters
+	)
+	syntheticDeflectionValues = draw_synthetic_deflection(
+		jitteredDeflection,
+		parameterForceVolume.noise,
+		parameterForceVolume.numberOfCurves,
+		seed,
+		numberOfWorkers=numberOfWorkers
 	)
 
-	syntheticCurves = create_synthetic_curves(
+	forceVolume = ForceVolume(
+		piezo,
+		deflection,
 		shiftedPiezo,
-		syntheticDeflectionValues
+		shiftedDeflection,
+		syntheticDeflectionValues,
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed,
+		curveParameters
+	)
+	forceVolume.groundTruth = groundTruth
+
+	return forceVolume
+
+def resolve_seed(
+	seed: int=None
+) -> int:
+	"""Draw a new seed if none is specified, so the seed of every
+	   force volume is known and the force volume can be reproduced.
+
+	Parameters:
+		seed(int): Specified seed or None.
+
+	Returns:
+		seed(int): Specified or newly drawn seed.
+	"""
+	if seed is None:
+		seed = int(np.random.SeedSequence().generate_state(1, np.uint64)[0])
+
+	return seed
+
+def create_noise_generator(
+	seed: int,
+	curveIndex: int
+) -> np.random.Generator:
+	"""Create the random number generator of a single synthetic curve. Its 
+	   seed sequence is the child curveIndex of the noise stream, the first
+	   stream spawned from the seed, without spawning the other curves. 
+	   The noise of a curve therefore only depends on the seed and its 
+	   index and not on the order, chunk or worker in which it is drawn.
+
+	Parameters:
+		seed(int): Seed of the force volume.
+		curveIndex(int): Index of the synthetic curve.
+
+	Returns:
+		noiseGenerator(np.random.Generator): Generator of the synthetic curve.
+	"""
+	return np.random.default_rng(
+		np.random.SeedSequence(seed, spawn_key=(0, curveIndex))
+	)
+
+def draw_curve_noise(
+	seed: int,
+	curveIndices: np.ndarray,
+	noiseValues: np.ndarray
+) -> None:
+	"""Draw the standard normal noise of several synthetic curves, 
+	   each from the generator of its index. The noise is always drawn 
+	   as float64 values, so it does not depend on the type of the array.
+
+	Parameters:
+		seed(int): Seed of the force volume.
+		curveIndices(np.ndarray): Index of every synthetic curve.
+		noiseValues(np.ndarray): Array with one row per curve, filled in place.
+	"""
+	for row, curveIndex in enumerate(curveIndices):
+		noiseGenerator = create_noise_generator(seed, int(curveIndex))
+		if noiseValues.dtype == np.float64:
+			noiseGenerator.standard_normal(out=noiseValues[row])
+		else:
+			noiseValues[row] = noiseGenerator.standard_normal(noiseValues.shape[-1])
+
+def create_curve_parameter_generator(
+	seed: int
+) -> np.random.Generator:
+	"""Create the random number generator of the per curve parameters,
+	   which is independent of the noise generators of the same seed.
+	   It uses the second stream spawned from the seed.
+
+	Parameters:
+		seed(int): Seed of the force volume.
+
+	Returns:
+		curveParameterGenerator(np.random.Generator): Generator of the per curve parameters.
+	"""
+	_, curveParameterSeedSequence = np.random.SeedSequence(seed).spawn(2)
+
+	return np.random.default_rng(curveParameterSeedSequence)
+
+def create_artefact_generators(
+	seed: int
+) -> artefacts.ArtefactGenerators:
+	"""Create the random number generators of the artefacts, which are
+	   independent of the noise and per curve parameters of the same seed.
+	   They use the third (coloured noise) and fourth (interference) stream
+	   spawned from the seed. New streams have to be appended after them,
+	   so the random numbers of the existing streams do not change.
+
+	Parameters:
+		seed(int): Seed of the force volume.
+
+	Returns:
+		artefactGenerators(ArtefactGenerators): Generator of every random artefact.
+	"""
+	_, _, colouredNoiseSeedSequence, interferenceSeedSequence = np.random.SeedSequence(seed).spawn(4)
+
+	return artefacts.ArtefactGenerators(
+		colouredNoise=np.random.default_rng(colouredNoiseSeedSequence),
+		interference=np.random.default_rng(interferenceSeedSequence)
 	)
+
+def draw_curve_parameters(
+	parameterMaterial: NamedTuple, 
+	parameterForceVolume: NamedTuple,
+	randomGenerator: np.random.Generator
+) -> CurveParameters:
+	"""Draw the topography offset, virtual deflection, spring constant and
+	   tip radius of every curve. Parameters without spread are not drawn,
+	   so they do not change the random numbers of the other parameters.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
+										  level, the virtual deflection and topography offset
+										  and the spread of the per curve parameters.
+		randomGenerator(np.random.Generator): Generator used to draw the parameters.
+
+	Returns:
+		curveParameters(CurveParameters): One value of every parameter per curve.
+
+	Raises:
+		ValueError: If a spread is negative or a spring constant or tip radius is not positive.
+	"""
+	parameterValues = []
+
+	for mean, spread in (
+		(parameterForceVolume.topographyOffset, parameterForceVolume.topographyOffsetSpread),
+		(parameterForceVolume.virtualDeflection, parameterForceVolume.virtualDeflectionSpread),
+		(parameterMaterial.kc, parameterForceVolume.kcSpread),
+		(parameterMaterial.radius, parameterForceVolume.radiusSpread)
+	):
+		if spread < 0:
+			raise ValueError("Spread values must be positive.")
+
+		if spread == 0:
+			parameterValues.append(
+				np.full(parameterForceVolume.numberOfCurves, float(mean))
+			)
+		else:
+			parameterValues.append(
+				mean + spread * randomGenerator.standard_normal(parameterForceVolume.numberOfCurves)
+			)
+
+	curveParameters = CurveParameters(*parameterValues)
+
+	if np.any(curveParameters.kc <= 0) or np.any(curveParameters.radius <= 0):
+		raise ValueError(
+			"The spread of the spring constant or tip radius is too large."
+		)
+
+	return curveParameters
+
+def create_jittered_deflection(
+	deflection: np.ndarray,
+	parameterMaterial: NamedTuple, 
+	parameterMeasurement: NamedTuple, 
+	parameterForceVolume: NamedTuple,
+	curveParameters: CurveParameters
+) -> np.ndarray:
+	"""Create the deflection of every curve on the shifted piezo values of the 
+	   ideal curve. The difference between the topography offset of a curve and 
+	   the topography offset of the force volume is rounded to the step size and 
+	   applied by shifting the indices of the curve. Values before the start are 
+	   padded with the first value, values after the end are calculated by 
+	   extending the ideal curve. Curves with a jittered spring constant or tip
+	   radius are created with create_ideal_curve_batch. The ground truth of
+	   every curve is taken from the ideal curves and shifted by the same indices.
+	   The shift of every curve is kept in the ground truth, so the tip-sample 
+	   distance can be calculated when needed, see 
+	   calculate_ground_truth_tip_sample_distance.
+
+	Parameters:
+		deflection(np.ndarray): Deflection (y) values of the ideal curve. 
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
+										  level, the virtual deflection and topography offset
+										  and the spread of the per curve parameters.
+		curveParameters(CurveParameters): One value of every parameter per curve.
+
+	Returns:
+		jitteredDeflection(np.ndarray): Deflection values without noise with one row per curve.
+		groundTruth(GroundTruth): Jump to contact, point of contact and shift of every curve.
+	"""
+	length = len(deflection)
+	shiftIndices = np.rint(
+		(curveParameters.topographyOffset - parameterForceVolume.topographyOffset)
+		/ parameterMeasurement.stepSize
+	).astype(np.int64)
+	extendedMeasurement, lengthExtension = extend_measurement(
+		parameterMeasurement,
+		length,
+		shiftIndices
+	)
+
+	if parameterForceVolume.kcSpread != 0 or parameterForceVolume.radiusSpread != 0:
+		idealCurveBatch = create_ideal_curve_batch(
+			parameterMaterial._replace(
+				kc=curveParameters.kc,
+				radius=curveParameters.radius,
+				jtc=calculate_jtc(
+					parameterMaterial.Hamaker,
+					curveParameters.radius,
+					curveParameters.kc
+				)
+			),
+			extendedMeasurement
+		)
+		idealDeflection = idealCurveBatch.deflection[:, :length + lengthExtension]
+		indexJumpToContact = idealCurveBatch.indexJumpToContact
+		indexPointOfContact = idealCurveBatch.indexPointOfContact
+	else:
+		if lengthExtension > 0:
+			idealDeflection = get_ideal_curve(
+				parameterMaterial,
+				extendedMeasurement
+			)[1][np.newaxis, :length + lengthExtension]
+		else:
+			idealDeflection = np.asarray(deflection)[np.newaxis]
+
+		indexJumpToContact, indexPointOfContact = locate_ideal_curve_events(
+			deflection,
+			parameterMeasurement
+		)
+
+	columnIndices = np.maximum(
+		np.arange(length) - shiftIndices[:, np.newaxis],
+		0
+	)
+
+	if len(idealDeflection) == 1:
+		jitteredDeflection = idealDeflection[0][columnIndices]
+	else:
+		jitteredDeflection = np.take_along_axis(idealDeflection, columnIndices, axis=1)
+
+	groundTruth = GroundTruth(
+		indexJumpToContact=(indexJumpToContact + shiftIndices).astype(np.int64),
+		indexPointOfContact=(indexPointOfContact + shiftIndices).astype(np.int64),
+		shiftIndex=shiftIndices
+	)
+
+	jitteredDeflection += curveParameters.virtualDeflection[:, np.newaxis]
+
+	return jitteredDeflection, groundTruth
+
+def create_ground_truth(
+	deflection: np.ndarray,
+	parameterMeasurement: NamedTuple,
+	numberOfCurves: int
+) -> GroundTruth:
+	"""Create the ground truth of a force volume whose curves are all based on
+	   the same shifted ideal curve. The topography offset and virtual deflection
+	   do not change the indices, so no curve is shifted against the ideal curve.
+
+	Parameters:
+		deflection(np.ndarray): Deflection (y) values of the ideal curve. 
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		numberOfCurves(int): Number of synthetic curves.
+
+	Returns:
+		groundTruth(GroundTruth): Jump to contact, point of contact and shift of every curve.
+	"""
+	indexJumpToContact, indexPointOfContact = locate_ideal_curve_events(
+		deflection,
+		parameterMeasurement
+	)
+
+	return GroundTruth(
+		indexJumpToContact=np.full(numberOfCurves, indexJumpToContact, dtype=np.int64),
+		indexPointOfContact=np.full(numberOfCurves, indexPointOfContact, dtype=np.int64),
+		shiftIndex=np.zeros(numberOfCurves, dtype=np.int64)
+	)
+
+def calculate_ground_truth_tip_sample_distance(
+	forceVolume: ForceVolume,
+	indices=slice(None)
+) -> np.ndarray:
+	"""Calculate the true tip-sample distance of every point of one or more
+	   synthetic curves. Only the shift of every curve is kept in the ground 
+	   truth, the distance is calculated from the ideal curve of the curve and 
+	   the piezo values before the shift. Curves of the same material share 
+	   one ideal curve, only curves with a jittered spring constant or tip 
+	   radius are created with create_ideal_curve_batch.
+
+	Parameters:
+		forceVolume(ForceVolume): Synthetic force volume or force map with a ground truth.
+		indices(int, slice or array): Indices of the synthetic curves.
+
+	Returns:
+		tipSampleDistance(np.ndarray): Tip-sample distance of a single curve or one row 
+									   for every selected curve, with the precision of
+									   the stored deflection values.
+	"""
+	parameterMaterial = forceVolume.parameterMaterial
+	parameterMeasurement = forceVolume.parameterMeasurement
+	parameterForceVolume = forceVolume.parameterForceVolume
+	shiftIndices = np.atleast_1d(forceVolume.groundTruth.shiftIndex[indices])
+	length = len(forceVolume.shiftedPiezo)
+
+	extendedMeasurement, lengthExtension = extend_measurement(
+		parameterMeasurement,
+		length,
+		shiftIndices
+	)
+
+	if isinstance(forceVolume, ForceMap):
+		phases, idealCurveRows = np.unique(
+			np.atleast_1d(forceVolume.phaseMask.ravel()[indices]),
+			return_inverse=True
+		)
+		idealDeflection = np.stack([
+			get_ideal_curve(
+				forceVolume.parameterMaterials[phase], 
+				extendedMeasurement
+			)[1][:length + lengthExtension]
+			for phase in phases
+		])
+	elif (
+		forceVolume.curveParameters is not None
+		and (parameterForceVolume.kcSpread != 0 or parameterForceVolume.radiusSpread != 0)
+	):
+		kc = np.atleast_1d(forceVolume.curveParameters.kc[indices])
+		radius = np.atleast_1d(forceVolume.curveParameters.radius[indices])
+		idealDeflection = create_ideal_curve_batch(
+			parameterMaterial._replace(
+				kc=kc,
+				radius=radius,
+				jtc=calculate_jtc(parameterMaterial.Hamaker, radius, kc)
+			),
+			extendedMeasurement
+		).deflection[:, :length + lengthExtension]
+		idealCurveRows = np.arange(len(shiftIndices))
+	else:
+		idealDeflection = get_ideal_curve(
+			parameterMaterial,
+			extendedMeasurement
+		)[1][np.newaxis, :length + lengthExtension]
+		idealCurveRows = np.zeros(len(shiftIndices), dtype=np.int64)
+
+	# The indices of the ideal curves before the start are negative, 
+	# their piezo values continue the piezo values of the ideal curve.
+	columnIndices = np.arange(length) - shiftIndices[:, np.newaxis]
+	tipSampleDistance = calculate_tip_sample_distance(
+		calculate_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			columnIndices
+		),
+		idealDeflection[idealCurveRows[:, np.newaxis], np.maximum(columnIndices, 0)]
+	).astype(forceVolume.shiftedDeflection.dtype, copy=False)
+
+	if np.ndim(indices) == 0 and not isinstance(indices, slice):
+		return tipSampleDistance[0]
+
+	return tipSampleDistance
+
+def extend_measurement(
+	parameterMeasurement: NamedTuple,
+	length: int,
+	shiftIndices: np.ndarray
+) -> Tuple[NamedTuple, int]:
+	"""Extend the maximum piezo of the measurement, so the ideal curve 
+	   covers every point of curves that are shifted to lower indices.
+
+	Parameters:
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		length(int): Length of the ideal curve.
+		shiftIndices(np.ndarray): Shift of every curve in points.
+
+	Returns:
+		extendedMeasurement(namedtupel): Measurement parameters with the extended maximum piezo.
+		lengthExtension(int): Number of points added to the end of the ideal curve.
+	"""
+	lengthExtension = max(0, -int(np.min(shiftIndices, initial=0)))
+
+	extendedMeasurement = parameterMeasurement._replace(
+		maximumPiezo=calculate_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			length - 1 + lengthExtension
+		)
+	)
+
+	return extendedMeasurement, lengthExtension
+
+def locate_ideal_curve_events(
+	deflection: np.ndarray,
+	parameterMeasurement: NamedTuple
+) -> Tuple[int, int]:
+	"""Locate the jump to contact and the point of contact of an ideal curve.
+	   The deflection of the attraction part equals the piezo value, while the
+	   deflection of the approach part is the attractive force. The first point 
+	   after the start whose deflection equals its piezo value is therefore the
+	   first point after the jump to contact, which gives the length of the 
+	   approach part. The point of contact follows from this length like in
+	   create_ideal_curve, also if the jump occurs at a positive piezo value.
+
+	Parameters:
+		deflection(np.ndarray): Deflection (y) values of the ideal curve. 
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		indexJumpToContact(int): Index of the last point of the approach part.
+		indexPointOfContact(int): Index of the point of contact.
+	"""
+	piezoValues = calculate_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		np.arange(1, len(deflection))
+	)
+	# The deflection of the start is zero, which equals a start distance of zero.
+	lengthApproach = 1 + int(np.argmax(np.asarray(deflection)[1:] == piezoValues))
+	indexPointOfContact = calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		0,
+		lengthApproach
+	)
+
+	return lengthApproach - 1, indexPointOfContact
+
+def get_ideal_curve(
+	parameterMaterial: NamedTuple, 
+	parameterMeasurement: NamedTuple,
+	computePrecision: str="float64",
+	samplingTolerance: float=None
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Get the ideal curve for the given virtual setup from the cache 
+	   or create it, if it is not cached yet. Only uniformly sampled 
+	   ideal curves computed with float64 precision are cached.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		computePrecision(str): Precision of the contact part, see computePrecisions.
+		samplingTolerance(float): If specified, the ideal curve is sampled adaptively
+								  within this tolerance, see create_ideal_curve_adaptive.
+
+	Returns:
+		piezo(np.ndarray): Read only piezo (x) values of the ideal curve.
+		deflection(np.ndarray): Read only deflection (y) values of the ideal curve. 
+
+	Raises:
+		ValueError: If the compute precision is unknown.
+	"""
+	if computePrecision != "float64" or samplingTolerance is not None:
+		return create_ideal_curve(
+			parameterMaterial,
+			parameterMeasurement,
+			computePrecision,
+			samplingTolerance
+		)
+
+	return idealCurveCache.get_ideal_curve(
+		parameterMaterial,
+		parameterMeasurement,
+		create_ideal_curve
+	)
+
+def set_ideal_curve_disk_cache(
+	cacheDirectory: str=None,
+	maximumSize: int=2**30
+) -> None:
+	"""Store the ideal curves additionally in a cache directory, so they 
+	   are shared between sessions and processes.
+
+	Parameters:
+		cacheDirectory(str): Directory of the cached curves. If not specified,
+							 the disk cache is disabled.
+		maximumSize(int): Maximum size of the cached files in bytes.
+	"""
+	if cacheDirectory is None:
+		idealCurveCache.diskCache = None
+	else:
+		idealCurveCache.diskCache = IdealCurveDiskCache(
+			cacheDirectory,
+			solverVersion,
+			maximumSize
+		)
+
+def create_ideal_curve(
+	parameterMaterial: NamedTuple, 
+	parameterMeasurement: NamedTuple,
+	computePrecision: str="float64",
+	samplingTolerance: float=None
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Create an ideal curve for the given virtual setup. The bounds of the
+	   parts are planned first, so unreachable setups are rejected before any
+	   value is calculated and all parts are written into one preallocated array.
+	   If a sampling tolerance is specified, only the points needed to keep the
+	   linear interpolation within the tolerance are returned.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		computePrecision(str): Precision of the contact part, see computePrecisions.
+							   The approach part has no cancellation and is always
+							   calculated with float64 precision.
+		samplingTolerance(float): If specified, the ideal curve is sampled adaptively
+								  within this tolerance, see create_ideal_curve_adaptive.
+
+	Returns:
+		piezo(np.ndarray): Piezo (x) values of the ideal curve.
+		deflection(np.ndarray): Deflection (y) values of the ideal curve. 
+
+	Raises:
+		ValueError: If the compute precision is unknown, the sampling tolerance 
+					is not positive or the point of contact can not be reached.
+	"""
+	if samplingTolerance is not None:
+		return create_ideal_curve_adaptive(
+			parameterMaterial,
+			parameterMeasurement,
+			samplingTolerance,
+			computePrecision
+		)
+
+	computeDtype = get_precision_dtype(computePrecision, computePrecisions)
+	curvePlan = plan_ideal_curve(parameterMaterial, parameterMeasurement)
+
+	piezo = np.empty(curvePlan.length)
+	deflection = np.empty(curvePlan.length)
+	piezo[0] = parameterMeasurement.startDistance
+	deflection[0] = 0
+
+	piezo, deflection, lengthApproach = run_ideal_curve_approach_part(
+		piezo,
+		deflection,
+		parameterMaterial,
+		parameterMeasurement
+	)
+
+	indexPointOfContact = calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		0,
+		lengthApproach
+	)
+	check_point_of_contact_reachable(
+		parameterMeasurement,
+		lengthApproach,
+		indexPointOfContact
+	)
+	length = calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		parameterMeasurement.maximumPiezo,
+		indexPointOfContact + 1
+	) + 1
+
+	# Only necessary if the plan contains bounds instead of the exact length.
+	if length > len(piezo):
+		piezo = np.concatenate((piezo, np.empty(length - len(piezo))))
+		deflection = np.concatenate((deflection, np.empty(length - len(deflection))))
+	piezo = piezo[:length]
+	deflection = deflection[:length]
+
+	piezo[lengthApproach:] = calculate_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		np.arange(lengthApproach, length)
+	)
+	deflection[lengthApproach:indexPointOfContact + 1] = calculate_deflection_attraction_part(
+		piezo[lengthApproach:indexPointOfContact + 1]
+	)
+
+	if np.result_type(deflection, computeDtype) != deflection.dtype:
+		deflection = deflection.astype(np.result_type(deflection, computeDtype))
+	parameterSubstitut = parameterMaterial.kc / (np.sqrt(parameterMaterial.radius) * parameterMaterial.Etot)
+	deflection[indexPointOfContact + 1:] = calculate_deflection_contact_part_vectorized(
+		parameterSubstitut,
+		piezo[indexPointOfContact + 1:],
+		computeDtype
+	)
+
+	return piezo, deflection
+
+def create_ideal_curve_adaptive(
+	parameterMaterial: NamedTuple, 
+	parameterMeasurement: NamedTuple,
+	samplingTolerance: float,
+	computePrecision: str="float64"
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Create an ideal curve that only contains the points of the uniformly
+	   sampled ideal curve which are needed to interpolate it linearly within 
+	   the sampling tolerance. The last point before and the first point after 
+	   the jump to contact and the points around the point of contact are always
+	   kept, close to them the curvature is high and many points are kept, while 
+	   the flat approach and the smooth contact part only need few points. Only 
+	   the kept points of the attraction and contact part are calculated.
+
+	   The points are selected by bisecting the index ranges of the parts. An 
+	   interval is split if its midpoint deviates more than half the tolerance 
+	   from the line between its end points. Since every part has a curvature 
+	   of a single sign, the deviation within an interval is at most twice the 
+	   deviation at its midpoint. The bisection starts from intervals that double
+	   in length with the distance to the jump to contact and the point of contact,
+	   which saves most bisection levels. Curves with at most 
+	   maximumLengthDenseSampling points are calculated completely and the 
+	   bisection only looks up their values.
+
+	   The bisection has a fixed cost per level, so the adaptive curve is not 
+	   faster to create than the uniform curve for coarse step sizes. With a 
+	   tolerance of 1 pm the reference machine took 0.28 ms instead of 0.06 ms 
+	   at a step size of 0.2 nm and 0.49 ms instead of 0.26 ms at 0.01 nm, but 
+	   0.96 ms instead of 2.7 ms at 0.001 nm. The benefit is the small number 
+	   of points of the created curve.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		samplingTolerance(float): Maximum deviation of the linear interpolation from
+								  the uniformly sampled deflection values.
+		computePrecision(str): Precision of the contact part, see computePrecisions.
+
+	Returns:
+		piezo(np.ndarray): Piezo (x) values of the kept points.
+		deflection(np.ndarray): Deflection (y) values of the kept points.
+
+	Raises:
+		ValueError: If the tolerance is not positive, the compute precision is 
+					unknown or the point of contact can not be reached.
+	"""
+	if not samplingTolerance > 0:
+		raise ValueError("Sampling tolerance must be positive.")
+
+	computeDtype = get_precision_dtype(computePrecision, computePrecisions)
+	curvePlan = plan_ideal_curve(parameterMaterial, parameterMeasurement)
+
+	piezoApproach = np.empty(curvePlan.lengthApproach)
+	deflectionApproach = np.empty(curvePlan.lengthApproach)
+	piezoApproach[0] = parameterMeasurement.startDistance
+	deflectionApproach[0] = 0
+
+	_, deflectionApproach, lengthApproach = run_ideal_curve_approach_part(
+		piezoApproach,
+		deflectionApproach,
+		parameterMaterial,
+		parameterMeasurement
+	)
+
+	indexPointOfContact = calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		0,
+		lengthApproach
+	)
+	check_point_of_contact_reachable(
+		parameterMeasurement,
+		lengthApproach,
+		indexPointOfContact
+	)
+	length = calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		parameterMeasurement.maximumPiezo,
+		indexPointOfContact + 1
+	) + 1
+
+	parameterSubstitut = parameterMaterial.kc / (np.sqrt(parameterMaterial.radius) * parameterMaterial.Etot)
+	deflectionDtype = np.result_type(np.float64, computeDtype)
+
+	def calculate_deflection(indices: np.ndarray) -> np.ndarray:
+		piezoValues = calculate_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			indices
+		)
+		deflectionValues = np.empty(len(indices), dtype=deflectionDtype)
+
+		approachPart = indices < lengthApproach
+		contactPart = indices > indexPointOfContact
+		attractionPart = ~approachPart & ~contactPart
+
+		deflectionValues[approachPart] = deflectionApproach[indices[approachPart]]
+		deflectionValues[attractionPart] = calculate_deflection_attraction_part(
+			piezoValues[attractionPart]
+		)
+		deflectionValues[contactPart] = calculate_deflection_contact_part_vectorized(
+			parameterSubstitut,
+			piezoValues[contactPart],
+			computeDtype
+		)
+
+		return deflectionValues
+
+	if length <= maximumLengthDenseSampling:
+		deflectionValues = calculate_deflection(np.arange(length))
+		calculate_deflection = deflectionValues.__getitem__
+
+	# The first point is not part of the convex approach part, as its
+	# deflection is set to zero instead of the attractive force.
+	boundaries = (
+		np.array([0, 0]),
+		calculate_geometric_boundaries(lengthApproach - 1, 1),
+		np.array([lengthApproach, indexPointOfContact]),
+		calculate_geometric_boundaries(indexPointOfContact + 1, length - 1)
+	)
+	indices = select_adaptive_indices(
+		np.concatenate([partBoundaries[:-1] for partBoundaries in boundaries]),
+		np.concatenate([partBoundaries[1:] for partBoundaries in boundaries]),
+		calculate_deflection,
+		samplingTolerance / 2
+	)
+
+	return (
+		calculate_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			indices
+		),
+		calculate_deflection(indices)
+	)
+
+def calculate_geometric_boundaries(
+	criticalIndex: int,
+	lastIndex: int
+) -> np.ndarray:
+	"""Helper function for create_ideal_curve_adaptive. Splits the index range
+	   between a critical index and the last index of a part into intervals 
+	   that double in length with the distance to the critical index, so the 
+	   bisection starts with short intervals where the curvature is high.
+
+	Parameters:
+		criticalIndex(int): Index next to the jump to contact or the point of contact.
+		lastIndex(int): Index at the other end of the part.
+
+	Returns:
+		boundaries(np.ndarray): Sorted boundaries of the intervals, including 
+								both indices, even if they are equal.
+	"""
+	distance = abs(lastIndex - criticalIndex)
+	offsets = 2**np.arange(max(distance, 1).bit_length())
+	offsets = np.concatenate(([0], offsets[offsets < distance], [distance]))
+
+	return np.sort(criticalIndex + np.sign(lastIndex - criticalIndex) * offsets)
+
+def select_adaptive_indices(
+	segmentStarts: np.ndarray,
+	segmentStops: np.ndarray,
+	calculate_deflection: Callable,
+	midpointTolerance: float
+) -> np.ndarray:
+	"""Helper function for create_ideal_curve_adaptive. Bisects the index 
+	   ranges of all segments at once, every level of the bisection calculates
+	   the deflection of all new midpoints in one call.
+
+	Parameters:
+		segmentStarts(np.ndarray): First index of every segment.
+		segmentStops(np.ndarray): Last index of every segment.
+		calculate_deflection(function): Calculates the deflection values at an array of indices.
+		midpointTolerance(float): Maximum deviation of a midpoint from the line between
+								  the end points of its interval.
+
+	Returns:
+		indices(np.ndarray): Sorted indices of the kept points.
+	"""
+	starts = segmentStarts.astype(np.int64)
+	stops = segmentStops.astype(np.int64)
+	startValues = calculate_deflection(starts)
+	stopValues = calculate_deflection(stops)
+	selectedIndices = [starts, stops]
+
+	while len(starts) > 0:
+		splittable = stops - starts > 1
+		starts, stops = starts[splittable], stops[splittable]
+		startValues, stopValues = startValues[splittable], stopValues[splittable]
+
+		midpoints = (starts + stops) // 2
+		midpointValues = calculate_deflection(midpoints)
+		interpolatedValues = startValues + (stopValues - startValues) * (
+			(midpoints - starts) / (stops - starts)
+		)
+
+		split = np.abs(midpointValues - interpolatedValues) > midpointTolerance
+		selectedIndices.append(midpoints[split])
+
+		starts, stops = (
+			np.concatenate((starts[split], midpoints[split])),
+			np.concatenate((midpoints[split], stops[split]))
+		)
+		startValues, stopValues = (
+			np.concatenate((startValues[split], midpointValues[split])),
+			np.concatenate((midpointValues[split], stopValues[split]))
+		)
+
+	return np.unique(np.concatenate(selectedIndices))
+
+def resample_to_uniform_grid(
+	piezo: np.ndarray,
+	deflection: np.ndarray,
+	parameterMeasurement: NamedTuple
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Interpolate adaptively sampled curves linearly onto the uniform piezo
+	   values of the measurement parameters, like np.interp for every curve.
+	   The interpolation weights are calculated once for all curves.
+
+	Parameters:
+		piezo(np.ndarray): Increasing piezo (x) values shared by all curves.
+		deflection(np.ndarray): Deflection (y) values of one curve or with one row per curve.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		uniformPiezo(np.ndarray): Uniformly spaced piezo (x) values.
+		uniformDeflection(np.ndarray): Interpolated deflection (y) values.
+	"""
+	piezo = np.asarray(piezo)
+	deflection = np.asarray(deflection)
+
+	numberOfPoints = int(np.rint(
+		(piezo[-1] - parameterMeasurement.startDistance) / parameterMeasurement.stepSize
+	)) + 1
+	uniformPiezo = calculate_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		np.arange(numberOfPoints)
+	)
+
+	lowerIndices = np.clip(
+		np.searchsorted(piezo, uniformPiezo, side="right") - 1,
+		0,
+		len(piezo) - 2
+	)
+	weights = np.clip(
+		(uniformPiezo - piezo[lowerIndices]) 
+		/ (piezo[lowerIndices + 1] - piezo[lowerIndices]),
+		0,
+		1
+	)
+	uniformDeflection = (
+		deflection[..., lowerIndices] * (1 - weights)
+		+ deflection[..., lowerIndices + 1] * weights
+	)
+
+	return uniformPiezo, uniformDeflection
+
+def plan_ideal_curve(
+	parameterMaterial: NamedTuple, 
+	parameterMeasurement: NamedTuple
+) -> CurvePlan:
+	"""Calculate the bounds of the parts of the ideal curve without calculating
+	   any value. Before the jump to contact the absolute tip sample distance is 
+	   at least the absolute jtc, so the absolute deflection is at most 
+	   maximumAttraction = hamaker*radius / (6*kc*jtc**2) and the tip sample 
+	   distance lies between the piezo value and the piezo value plus 
+	   maximumAttraction. This bounds the index of the jump to contact from 
+	   both sides:
+	
+	   - The jump can not occur before the piezo value exceeds 
+	     -(abs(jtc) + maximumAttraction). If the maximum piezo is exceeded 
+	     first, or the start distance is at least abs(jtc), the setup is rejected.
+	   - The jump occurs at the latest at the first piezo value above -abs(jtc),
+	     as long as this value plus maximumAttraction is below abs(jtc).
+
+	   If the jump occurs before the piezo value zero, the index of the point of 
+	   contact and the length of the ideal curve follow exactly from the start 
+	   distance, step size and maximum piezo.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		curvePlan(CurvePlan): Upper bound of the length of the approach part, the index of
+							  the point of contact, the length of the ideal curve and whether
+							  the last two values are exact or only bounds.
+
+	Raises:
+		ValueError: If the step size is not positive or the point of contact can not be reached.
+	"""
+	startDistance = parameterMeasurement.startDistance
+	stepSize = parameterMeasurement.stepSize
+	maximumPiezo = parameterMeasurement.maximumPiezo
+
+	if not stepSize > 0:
+		raise ValueError("Step size must be positive.")
+
+	absoluteJtc = np.abs(parameterMaterial.jtc)
+	maximumAttraction = (
+		(parameterMaterial.Hamaker*parameterMaterial.radius)
+		/ (6*parameterMaterial.kc*absoluteJtc**2)
+	)
+
+	indexEarliestJump = calculate_index_piezo_value(
+		startDistance,
+		stepSize,
+		- (absoluteJtc + maximumAttraction)
+	)
+	if (
+		startDistance >= absoluteJtc
+		or (
+			indexEarliestJump > 0 
+			and calculate_piezo_value(startDistance, stepSize, indexEarliestJump) > maximumPiezo
+		)
+	):
+		raise ValueError(
+			"No ideal curve could be created. Please change the iput parameters."
+		)
+
+	indexLatestJump = calculate_index_piezo_value(
+		startDistance,
+		stepSize,
+		- absoluteJtc,
+		1
+	)
+	lengthApproach = indexLatestJump + 2
+	boundedApproach = (
+		calculate_piezo_value(startDistance, stepSize, indexLatestJump) + maximumAttraction
+		< absoluteJtc
+	)
+
+	indexPiezoZero = calculate_index_piezo_value(startDistance, stepSize, 0)
+
+	if (
+		boundedApproach
+		and lengthApproach < indexPiezoZero
+		and calculate_piezo_value(startDistance, stepSize, indexPiezoZero - 1) > maximumPiezo
+	):
+		raise ValueError(
+			"No ideal curve could be created. Please change the iput parameters."
+		)
+
+	indexPointOfContact = max(indexPiezoZero, lengthApproach)
+	length = calculate_index_piezo_value(
+		startDistance,
+		stepSize,
+		maximumPiezo,
+		indexPointOfContact + 1
+	) + 1
+
+	return CurvePlan(
+		lengthApproach,
+		indexPointOfContact,
+		length,
+		bool(boundedApproach and lengthApproach <= indexPiezoZero)
+	)
+
+def create_ideal_curve_approach_part(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	backendName: str=None
+) -> Tuple[np.ndarray, np.ndarray]: 
+	"""Generate the approach part of the ideal curve. The setup is checked 
+	   with plan_ideal_curve and the output arrays are preallocated from its 
+	   bound of the jump to contact and extended if the recurrence needs more values.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		backendName(str): Name of the recurrence backend, see recurrence_backends.
+
+	Returns:
+		piezoApproach(np.ndarray): Piezo (x) values of the approach part of the ideal curve.
+		deflectionApproach(np.ndarray): Deflection (y) values of the approach part of the ideal curve. 
 	
-	syntheticForceVolume = arrange_curves_in_force_volume(
-		piezo, 
-		deflection, 
-		shiftedPiezo, 
-		shiftedDeflection, 
-		syntheticCurves
+	Raises:
+		ValueError: If the step size is not positive or the maximum piezo is reached 
+					before the jumpt to contact occurs.
+	"""
+	curvePlan = plan_ideal_curve(parameterMaterial, parameterMeasurement)
+	piezoApproach = np.empty(curvePlan.lengthApproach)
+	deflectionApproach = np.empty(curvePlan.lengthApproach)
+	piezoApproach[0] = parameterMeasurement.startDistance
+	deflectionApproach[0] = 0
+
+	piezoApproach, deflectionApproach, length = run_ideal_curve_approach_part(
+		piezoApproach,
+		deflectionApproach,
+		parameterMaterial,
+		parameterMeasurement,
+		backendName
 	)
 
-	return syntheticForceVolume
+	return piezoApproach[:length], deflectionApproach[:length]
 
-def create_ideal_curve(
-	parameterMaterial: NamedTuple, 
-	parameterMeasurement: NamedTuple
-) -> Tuple[List, List]:
-	"""Create an ideal curve for the given virtual setup.
+def run_ideal_curve_approach_part(
+	piezo: np.ndarray,
+	deflection: np.ndarray,
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	backendName: str=None
+) -> Tuple[np.ndarray, np.ndarray, int]:
+	"""Run the recurrence of the approach part in preallocated arrays, 
+	   which are only extended if the recurrence needs more values.
 
 	Parameters:
+		piezo(np.ndarray): Preallocated piezo (x) values, the first value is the start distance.
+		deflection(np.ndarray): Preallocated deflection (y) values, the first value is zero.
 		parameterMaterial(namedtupel): Contains all parameters describing the material 
 									   and geometriy of the virtual measuring system.
 		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
 										  measuring system.
+		backendName(str): Name of the recurrence backend, see recurrence_backends.
 
 	Returns:
-		piezo(list): Piezo (x) values of the ideal curve.
-		deflection(list): Deflection (y) values of the ideal curve. 
+		piezo(np.ndarray): Piezo (x) values, starting with the approach part.
+		deflection(np.ndarray): Deflection (y) values, starting with the approach part.
+		lengthApproach(int): Length of the approach part.
+
+	Raises:
+		ValueError: If the maximum piezo is reached before the jumpt to contact occurs.
 	"""
-	piezoApproach, deflectionApproach = create_ideal_curve_approach_part(
-		parameterMaterial,
-		parameterMeasurement,
-	)
-	lengthApproach = len(piezoApproach)
+	run_approach_recurrence = recurrence_backends.get_approach_backend(backendName)
+
+	maximumCapacity = calculate_maximum_length_approach_part(parameterMeasurement)
+	length = 1
+	status = recurrence_backends.statusCapacityReached
+
+	while status == recurrence_backends.statusCapacityReached:
+		if length == len(piezo):
+			extension = np.empty(calculate_grown_capacity(len(piezo), maximumCapacity) - len(piezo))
+			piezo = np.concatenate((piezo, extension))
+			deflection = np.concatenate((deflection, extension))
+
+		length, status = run_approach_recurrence(
+			piezo,
+			deflection,
+			length,
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			parameterMeasurement.maximumPiezo,
+			parameterMaterial.Hamaker,
+			parameterMaterial.radius,
+			parameterMaterial.kc,
+			parameterMaterial.jtc
+		)
 
-	piezoAttraction, deflectionAttraction = create_ideal_curve_attraction_part(
-		parameterMeasurement,
-		lengthApproach
-	)
-	lengthUntilContact = lengthApproach + len(piezoAttraction)
-	
-	piezoContact, deflectionContact = create_ideal_curve_contact_part(
-		parameterMaterial,
-		parameterMeasurement,
-		lengthUntilContact
-	)
+	if status == recurrence_backends.statusMaximumPiezo:
+		raise ValueError(
+			"No ideal curve could be created. Please change the iput parameters."
+		)
 
-	piezo = piezoApproach + piezoAttraction + piezoContact
-	deflection = deflectionApproach + deflectionAttraction + deflectionContact
+	return piezo, deflection, length
 
-	return piezo, deflection
-		
-def create_ideal_curve_approach_part(
+def calculate_maximum_length_approach_part(
+	parameterMeasurement: NamedTuple
+) -> int:
+	"""Calculate the length at which the recurrence of the approach part 
+	   stops at the latest, because the piezo value exceeds the maximum piezo.
+
+	Parameters:
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		maximumLength(int): Largest possible length of the approach part.
+	"""
+	return calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		parameterMeasurement.maximumPiezo
+	) + 2
+
+def calculate_grown_capacity(
+	capacity: int,
+	maximumCapacity: int
+) -> int:
+	"""Double the capacity of a preallocated array without exceeding the 
+	   maximum capacity, so repeated extensions copy every value only a 
+	   constant number of times on average.
+
+	Parameters:
+		capacity(int): Current capacity of the array.
+		maximumCapacity(int): Largest capacity that can be needed.
+
+	Returns:
+		capacity(int): Extended capacity of the array.
+	"""
+	return max(capacity + 1, min(2*capacity, maximumCapacity))
+
+def create_ideal_curve_approach_part_scalar(
 	parameterMaterial: NamedTuple,
 	parameterMeasurement: NamedTuple
 ) -> Tuple[List, List]: 
-	"""Generate the approach part of the ideal curve.
+	"""Generate the approach part of the ideal curve point by point. 
+	   Reference implementation for create_ideal_curve_approach_part.
 
 	Parameters:
 		parameterMaterial(namedtupel): Contains all parameters describing the material 
@@ -283,8 +1867,10 @@ def create_ideal_curve_approach_part(
 def create_ideal_curve_attraction_part(
 	parameterMeasurement: NamedTuple,
 	lengthApproach: int
-) -> Tuple[List, List]: 
-	"""Generate the attraction part of the ideal curve.
+) -> Tuple[np.ndarray, np.ndarray]: 
+	"""Generate the attraction part of the ideal curve. Since the deflection
+	   equals the piezo value, the part ends at the first non negative piezo
+	   value and its bounds can be calculated directly.
 
 	Parameters:
 		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
@@ -292,45 +1878,112 @@ def create_ideal_curve_attraction_part(
 		lengthApproach(int): Length of the approach part of the ideal curve.
 
 	Returns:
-		piezoAttraction(list): Piezo (x) values of the attraction part of the ideal curve.
-		deflectionAttraction(list): Deflection (y) values of the attraction part of the ideal curve. 
+		piezoAttraction(np.ndarray): Piezo (x) values of the attraction part of the ideal curve.
+		deflectionAttraction(np.ndarray): Deflection (y) values of the attraction part of the ideal curve. 
 
 	Raises:
 		ValueError: If the maximum piezo is reached before the point of contact occurs.
 	"""
-	piezoAttraction = []
-	deflectionAttraction = []
+	indexPointOfContact = calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		0,
+		lengthApproach
+	)
+	check_point_of_contact_reachable(
+		parameterMeasurement,
+		lengthApproach,
+		indexPointOfContact
+	)
 
-	while(True):
-		piezoAttraction.append(
-			calculate_piezo_value(
-				parameterMeasurement.startDistance,
-				parameterMeasurement.stepSize,
-				len(piezoAttraction) + lengthApproach
-			)
-		)
-		deflectionAttraction.append(
-			calculate_deflection_attraction_part(
-				piezoAttraction[-1]
-			)
-		)
+	piezoAttraction = calculate_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		np.arange(lengthApproach, indexPointOfContact + 1)
+	)
+	deflectionAttraction = calculate_deflection_attraction_part(
+		piezoAttraction
+	)
 
-		if (deflectionAttraction[-1] >= 0):
-			break
+	return piezoAttraction, deflectionAttraction
 
-		if (piezoAttraction[-1] > parameterMeasurement.maximumPiezo):
-			raise ValueError(
-				"No ideal curve could be created. Please change the iput parameters."
-			)
+def check_point_of_contact_reachable(
+	parameterMeasurement: NamedTuple,
+	lengthApproach: int,
+	indexPointOfContact: int
+) -> None:
+	"""Check that the attraction part reaches the point of contact 
+	   before the maximum piezo.
 
-	return piezoAttraction, deflectionAttraction
+	Parameters:
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		lengthApproach(int): Length of the approach part of the ideal curve.
+		indexPointOfContact(int): Index of the point of contact.
+
+	Raises:
+		ValueError: If the maximum piezo is reached before the point of contact occurs.
+	"""
+	if (
+		indexPointOfContact > lengthApproach
+		and calculate_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			indexPointOfContact - 1
+		) > parameterMeasurement.maximumPiezo
+	):
+		raise ValueError(
+			"No ideal curve could be created. Please change the iput parameters."
+		)
 
 def create_ideal_curve_contact_part(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	lengthUntilContact: int,
+	computeDtype: type=np.float64
+) -> Tuple[np.ndarray, np.ndarray]: 
+	"""Generate the contact part of the ideal curve for all piezo values at once.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+		lengthUntilContact(int): Length of the ideal curve until the point of contact.
+		computeDtype(type): Floating point type of the calculated deflection values.
+
+	Returns:
+		piezoContact(np.ndarray): Piezo (x) values of the contact part of the ideal curve.
+		deflectionContact(np.ndarray): Deflection (y) values of the contact part of the ideal curve.
+	"""
+	parameterSubstitut = parameterMaterial.kc / (np.sqrt(parameterMaterial.radius) * parameterMaterial.Etot)
+
+	indexMaximumPiezo = calculate_index_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		parameterMeasurement.maximumPiezo,
+		lengthUntilContact
+	)
+	piezoContact = calculate_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		np.arange(lengthUntilContact, indexMaximumPiezo + 1)
+	)
+	deflectionContact = calculate_deflection_contact_part_vectorized(
+		parameterSubstitut,
+		piezoContact,
+		computeDtype
+	)
+
+	return piezoContact, deflectionContact
+
+def create_ideal_curve_contact_part_scalar(
 	parameterMaterial: NamedTuple,
 	parameterMeasurement: NamedTuple,
 	lengthUntilContact: int
 ) -> Tuple[List, List]: 
-	"""Generate the contact part of the ideal curve.
+	"""Generate the contact part of the ideal curve point by point. 
+	   Reference implementation for create_ideal_curve_contact_part.
 
 	Parameters:
 		parameterMaterial(namedtupel): Contains all parameters describing the material 
@@ -368,6 +2021,257 @@ def create_ideal_curve_contact_part(
 
 	return piezoContact, deflectionContact
 
+def create_ideal_curve_batch(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+) -> IdealCurveBatch:
+	"""Create the ideal curves of many material parameter sets at once.
+	   All curves share the piezo values of the measurement parameters,
+	   so the approach parts are calculated together in lockstep and the
+	   attraction and contact parts for all curves in one step.
+
+	Parameters:
+		parameterMaterial(namedtupel): Contains all parameters describing the material 
+									   and geometriy of the virtual measuring system,
+									   with one value per curve in every field.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		idealCurveBatch(IdealCurveBatch): The shared piezo (x) values, the deflection (y) 
+										  values of every curve as rows padded with NaN, 
+										  the length of every curve, the index of the last
+										  point before the jump to contact and the index 
+										  of the point of contact.
+
+	Raises:
+		ValueError: If the maximum piezo is reached before the point of contact 
+					occurs for one of the curves.
+	"""
+	kc, radius, etot, hamaker, jtc = np.broadcast_arrays(
+		*(
+			np.atleast_1d(np.asarray(field, dtype=np.float64))
+			for field in (
+				parameterMaterial.kc,
+				parameterMaterial.radius,
+				parameterMaterial.Etot,
+				parameterMaterial.Hamaker,
+				parameterMaterial.jtc
+			)
+		)
+	)
+
+	deflectionApproach, lengthsApproach = create_ideal_curve_approach_part_batch(
+		kc,
+		radius,
+		hamaker,
+		jtc,
+		parameterMeasurement
+	)
+
+	indexPointOfContact = np.maximum(
+		calculate_index_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			0
+		),
+		lengthsApproach
+	)
+
+	if np.any(
+		(indexPointOfContact > lengthsApproach)
+		& (
+			calculate_piezo_value(
+				parameterMeasurement.startDistance,
+				parameterMeasurement.stepSize,
+				indexPointOfContact - 1
+			) > parameterMeasurement.maximumPiezo
+		)
+	):
+		raise ValueError(
+			"No ideal curve could be created. Please change the iput parameters."
+		)
+
+	lengths = np.maximum(
+		calculate_index_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			parameterMeasurement.maximumPiezo
+		),
+		indexPointOfContact + 1
+	) + 1
+
+	piezo = calculate_piezo_value(
+		parameterMeasurement.startDistance,
+		parameterMeasurement.stepSize,
+		np.arange(lengths.max())
+	)
+	deflection = np.full((len(lengths), len(piezo)), np.nan)
+	columnIndices = np.arange(len(piezo))
+
+	widthApproach = min(deflectionApproach.shape[1], len(piezo))
+	approachPart = columnIndices[:widthApproach] < lengthsApproach[:, np.newaxis]
+	deflection[:, :widthApproach][approachPart] = deflectionApproach[:, :widthApproach][approachPart]
+
+	attractionPart = (
+		(columnIndices >= lengthsApproach[:, np.newaxis])
+		& (columnIndices <= indexPointOfContact[:, np.newaxis])
+	)
+	deflection[attractionPart] = calculate_deflection_attraction_part(
+		np.broadcast_to(piezo, deflection.shape)[attractionPart]
+	)
+
+	rowsContact, columnsContact = np.nonzero(
+		(columnIndices > indexPointOfContact[:, np.newaxis])
+		& (columnIndices < lengths[:, np.newaxis])
+	)
+	parameterSubstitut = kc / (np.sqrt(radius) * etot)
+	deflection[rowsContact, columnsContact] = calculate_deflection_contact_part_vectorized(
+		parameterSubstitut[rowsContact],
+		piezo[columnsContact]
+	)
+
+	return IdealCurveBatch(
+		piezo,
+		deflection,
+		lengths,
+		lengthsApproach - 1,
+		indexPointOfContact
+	)
+
+def create_ideal_curve_approach_part_batch(
+	kc: np.ndarray,
+	radius: np.ndarray,
+	hamaker: np.ndarray,
+	jtc: np.ndarray,
+	parameterMeasurement: NamedTuple
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Generate the approach parts of many ideal curves in lockstep. Every 
+	   step is calculated for all curves before the jump to contact at once,
+	   with the same operations as run_approach_recurrence.
+
+	Parameters:
+		kc(np.ndarray): Spring constant of every curve.
+		radius(np.ndarray): Tip radius of every curve.
+		hamaker(np.ndarray): Hamaker value of every curve.
+		jtc(np.ndarray): Jtc value of every curve.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		deflectionApproach(np.ndarray): Deflection (y) values of the approach parts as rows.
+		lengthsApproach(np.ndarray): Length of the approach part of every curve.
+	
+	Raises:
+		ValueError: If the step size is not positive or the maximum piezo is reached 
+					before the jumpt to contact occurs for one of the curves.
+	"""
+	capacity = max(
+		curvePlan.lengthApproach
+		for curvePlan in plan_ideal_curves_critical(kc, radius, hamaker, jtc, parameterMeasurement)
+	)
+	maximumCapacity = calculate_maximum_length_approach_part(parameterMeasurement)
+	deflectionApproach = np.empty((len(kc), capacity))
+	deflectionApproach[:, 0] = 0
+	lengthsApproach = np.zeros(len(kc), dtype=np.int64)
+
+	# Only the curves before the jump to contact are kept in these arrays.
+	activeCurves = np.arange(len(kc))
+	activeNumerator = - (hamaker*radius)
+	activeKc = kc
+	activeJtc = np.abs(jtc)
+	previousDeflection = np.zeros(len(kc))
+	previousPiezo = parameterMeasurement.startDistance
+	index = 1
+
+	while len(activeCurves) > 0:
+		if index == deflectionApproach.shape[1]:
+			capacity = calculate_grown_capacity(index, maximumCapacity)
+			deflectionApproach = np.concatenate(
+				(deflectionApproach, np.empty((len(kc), capacity - index))),
+				axis=1
+			)
+
+		tipSampleDistance = previousPiezo - previousDeflection
+
+		previousPiezo = calculate_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			index
+		)
+		previousDeflection = activeNumerator / (6*tipSampleDistance**2*activeKc)
+		deflectionApproach[activeCurves, index] = previousDeflection
+		index += 1
+
+		jumpToContact = np.abs(tipSampleDistance) < activeJtc
+		if np.any(jumpToContact):
+			lengthsApproach[activeCurves[jumpToContact]] = index
+
+			beforeJumpToContact = ~jumpToContact
+			activeCurves = activeCurves[beforeJumpToContact]
+			activeNumerator = activeNumerator[beforeJumpToContact]
+			activeKc = activeKc[beforeJumpToContact]
+			activeJtc = activeJtc[beforeJumpToContact]
+			previousDeflection = previousDeflection[beforeJumpToContact]
+
+		if len(activeCurves) > 0 and previousPiezo > parameterMeasurement.maximumPiezo:
+			raise ValueError(
+				"No ideal curve could be created. Please change the iput parameters."
+			)
+
+	return deflectionApproach, lengthsApproach
+
+def plan_ideal_curves_critical(
+	kc: np.ndarray,
+	radius: np.ndarray,
+	hamaker: np.ndarray,
+	jtc: np.ndarray,
+	parameterMeasurement: NamedTuple
+) -> List[CurvePlan]:
+	"""Plan the ideal curves of the parameter sets that limit a batch. The 
+	   smallest absolute jtc bounds the jump to contact from above, the smallest 
+	   sum of the absolute jtc and the maximum attraction from below, so if 
+	   plan_ideal_curve accepts these two curves, the approach parts of all 
+	   curves can be reached.
+
+	Parameters:
+		kc(np.ndarray): Spring constant of every curve.
+		radius(np.ndarray): Tip radius of every curve.
+		hamaker(np.ndarray): Hamaker value of every curve.
+		jtc(np.ndarray): Jtc value of every curve.
+		parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+										  measuring system.
+
+	Returns:
+		curvePlans(list): Plans of the limiting curves.
+
+	Raises:
+		ValueError: If the step size is not positive or the point of contact 
+					of a limiting curve can not be reached.
+	"""
+	ParameterMaterial, _, _ = get_parameter_tuples()
+
+	absoluteJtc = np.abs(jtc)
+	maximumAttraction = (hamaker*radius) / (6*kc*absoluteJtc**2)
+	indicesCritical = {
+		int(np.argmin(absoluteJtc)), 
+		int(np.argmin(absoluteJtc + maximumAttraction))
+	}
+
+	return [
+		plan_ideal_curve(
+			ParameterMaterial(
+				kc=kc[index],
+				radius=radius[index],
+				Etot=np.nan,
+				Hamaker=hamaker[index],
+				jtc=jtc[index]
+			),
+			parameterMeasurement
+		)
+		for index in sorted(indicesCritical)
+	]
+
 def calculate_piezo_value(
 	startDistance: float,
 	stepSize: float,
@@ -378,13 +2282,50 @@ def calculate_piezo_value(
 	Parameters:
 		startDistance(float): Initial distance of the given virtual system.
 		stepSize(float): Distance interval of the given virtual system.
-		currentLength(int): Current lenght of the ideal curve.
+		currentLength(int): Current lenght of the ideal curve. An array of
+							lengths returns an array of piezo values.
 
 	Returns:
 		piezoValue(float): Current piezo value of the ideal curve.
 	"""
 	return startDistance + stepSize * currentLength
 
+def calculate_index_piezo_value(
+	startDistance: float,
+	stepSize: float,
+	piezoValue: float,
+	minimumIndex: int=0
+) -> int:
+	"""Calculate the first index at which the piezo value reaches 
+	   a given value. The index is checked against calculate_piezo_value,
+	   so it matches the index at which a point by point loop would stop.
+
+	Parameters:
+		startDistance(float): Initial distance of the given virtual system.
+		stepSize(float): Distance interval of the given virtual system.
+		piezoValue(float): Piezo value that has to be reached.
+		minimumIndex(int): Smallest index that can be returned.
+
+	Returns:
+		index(int): First index not smaller than the minimum index 
+					whose piezo value is greater or equal the given value.
+	"""
+	index = max(
+		minimumIndex, 
+		int(np.ceil((piezoValue - startDistance) / stepSize))
+	)
+
+	while (
+		index > minimumIndex 
+		and calculate_piezo_value(startDistance, stepSize, index - 1) >= piezoValue
+	):
+		index -= 1
+
+	while calculate_piezo_value(startDistance, stepSize, index) < piezoValue:
+		index += 1
+
+	return index
+
 def calculate_tip_sample_distance(
 	piezo: float,
 	deflection: float
@@ -471,6 +2412,90 @@ def calculate_deflection_contact_part(
 		)
 	))
 
+def calculate_deflection_contact_part_vectorized(
+	parameterSubstitut: float,
+	piezoValues: np.ndarray,
+	computeDtype: type=np.float64
+) -> np.ndarray:
+	"""Calculate the deflection for an array of piezo values after probe and 
+	   sample are in contact, using the Hertzian contact theory.
+
+	   Instead of the complex valued root of the cubic in the deflection used 
+	   by calculate_deflection_contact_part, the cubic is solved for the square 
+	   root of the deformation, which only has one positive real root. The 
+	   deflection follows from this root without cancellation. Compared to the 
+	   scalar path the results agree within a relative tolerance of 1e-6, as 
+	   long as the deflection is larger than 1e-6 times the piezo value. For 
+	   very soft contacts the scalar path loses its precision, while the 
+	   results of this function still fulfill the Hertz equation.
+
+	Parameters:
+		parameterSubstitut(float): Interim result from kc, radius and etot.
+		piezoValues(np.ndarray): Corresponding piezo values.
+		computeDtype(type): Floating point type of the calculation.
+
+	Returns:
+		deflectionValues(np.ndarray): Deflection values while the probe 
+									  is in contact.
+	"""
+	parameterSubstitut = np.asarray(parameterSubstitut, dtype=computeDtype)
+	squareRootDeformation = calculate_square_root_deformation(
+		parameterSubstitut,
+		piezoValues
+	)
+
+	return squareRootDeformation**3 / parameterSubstitut
+
+def calculate_square_root_deformation(
+	parameterSubstitut: float,
+	piezoValues: np.ndarray
+) -> np.ndarray:
+	"""Helper function for calculate_deflection_contact_part_vectorized. 
+	   Solves t**3 + s*t**2 - s*z = 0 with the trigonometric or hyperbolic 
+	   form of the real root and refines the result with two newton steps.
+
+	Parameters:
+		parameterSubstitut(float): Interim result from kc, radius and etot.
+		piezoValues(np.ndarray): Corresponding piezo values.
+
+	Returns:
+		squareRootDeformation(np.ndarray): Square root of the deformation 
+										   for every piezo value.
+	"""
+	piezoValues = np.asarray(
+		piezoValues, 
+		dtype=np.result_type(parameterSubstitut, np.float64)
+	)
+
+	shapeParameter = np.maximum(
+		27 * piezoValues / (2 * parameterSubstitut**2) - 1, 
+		-1
+	)
+	rootFactor = np.where(
+		shapeParameter <= 1,
+		np.cos(np.arccos(np.minimum(shapeParameter, 1)) / 3),
+		np.cosh(np.arccosh(np.maximum(shapeParameter, 1)) / 3)
+	)
+	squareRootDeformation = parameterSubstitut / 3 * (2 * rootFactor - 1)
+
+	for _ in range(2):
+		squareRootDeformation = squareRootDeformation - (
+			squareRootDeformation**3 
+			+ parameterSubstitut * squareRootDeformation**2
+			- parameterSubstitut * piezoValues
+		) / np.where(
+			squareRootDeformation > 0,
+			3 * squareRootDeformation**2 
+			+ 2 * parameterSubstitut * squareRootDeformation,
+			1
+		)
+
+	return np.where(
+		piezoValues > 0,
+		np.maximum(squareRootDeformation, 0),
+		0
+	)
+
 def calculate_deflection_contact_first_term(
 	parameterSubstitut: float,
 	currentPiezoValue: float
@@ -602,27 +2627,105 @@ def shift_ideal_curve(
 
 def multiply_and_apply_noise_to_deflection(
 	shiftedDeflection: np.ndarray, 
-	parameterForceVolume: NamedTuple
-) -> List[np.ndarray]:
+	parameterForceVolume: NamedTuple,
+	seed: int=None
+) -> np.ndarray:
 	"""Multiplies the deflection (y) values of the shifted 
-	   ideal curve and applies noise to each copy.
+	   ideal curve and applies noise to each copy. The noise 
+	   of all copies is drawn at once into one array.
 
 	Parameters:
 		shiftedDeflection(np.ndarray): Shifted deflection (y) values of the ideal curve.
 		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
 										  level and the virtual deflection and topography offset.
+		seed(int): Seed of the random number generator, makes the noise reproducible.
 
 	Returns:
-		syntheticDeflectionValues(list): List of synthetic deflection values.
+		syntheticDeflectionValues(np.ndarray): Synthetic deflection values with one row per curve.
+
+	Raises:
+		ValueError: If the noise value is negative.
 	"""
-	return [
-		apply_noise_to_deflection(shiftedDeflection, parameterForceVolume)
-		for _ in range(parameterForceVolume.numberOfCurves)
+	return draw_synthetic_deflection(
+		shiftedDeflection,
+		parameterForceVolume.noise,
+		parameterForceVolume.numberOfCurves,
+		seed
+	)
+
+def draw_synthetic_deflection(
+	shiftedDeflection: np.ndarray,
+	noise: float,
+	numberOfCurves: int,
+	seed: int,
+	firstCurve: int=0,
+	numberOfWorkers: int=1
+) -> np.ndarray:
+	"""Draw the noise of several synthetic curves into one array 
+	   and add the shifted deflection in place. Every curve is drawn
+	   from its own generator, see create_noise_generator, so blocks
+	   of noiseBlockSize curves can be drawn by several threads and 
+	   chunks of a force volume match the curves of the force volume.
+	   The values are calculated with the precision of the shifted 
+	   deflection, but at least float64.
+
+	Parameters:
+		shiftedDeflection(np.ndarray): Shifted deflection (y) values of the ideal curve
+									   or one row of shifted deflection values per curve.
+		noise(float): Standard deviation of the noise.
+		numberOfCurves(int): Number of synthetic curves.
+		seed(int): Seed of the force volume.
+		firstCurve(int): Index of the first drawn curve within the force volume.
+		numberOfWorkers(int): Number of threads drawing the blocks.
+
+	Returns:
+		syntheticDeflectionValues(np.ndarray): Synthetic deflection values with one row per curve.
+
+	Raises:
+		ValueError: If the noise value is negative.
+	"""
+	if noise < 0:
+		raise ValueError("Noise value must be positive.")
+
+	shiftedDeflection = np.asarray(shiftedDeflection)
+	syntheticDeflectionValues = np.empty(
+		(numberOfCurves, shiftedDeflection.shape[-1]),
+		dtype=np.result_type(shiftedDeflection, np.float64)
+	)
+
+	segments = [
+		(start, min(start + noiseBlockSize, numberOfCurves))
+		for start in range(0, numberOfCurves, noiseBlockSize)
 	]
 
+	def draw_segment(segment: Tuple[int, int]) -> None:
+		start, stop = segment
+		syntheticDeflectionSegment = syntheticDeflectionValues[start:stop]
+		draw_curve_noise(
+			seed,
+			range(firstCurve + start, firstCurve + stop),
+			syntheticDeflectionSegment
+		)
+		syntheticDeflectionSegment *= noise
+		if shiftedDeflection.ndim == 2:
+			syntheticDeflectionSegment += shiftedDeflection[start:stop]
+		else:
+			syntheticDeflectionSegment += shiftedDeflection
+
+	if numberOfWorkers == 1 or len(segments) < 2:
+		for segment in segments:
+			draw_segment(segment)
+	else:
+		# The generators and ufuncs release the GIL, so threads draw the blocks in parallel.
+		with ThreadPoolExecutor(max_workers=numberOfWorkers) as executor:
+			list(executor.map(draw_segment, segments))
+
+	return syntheticDeflectionValues
+
 def apply_noise_to_deflection(
 	shiftedDeflection: List, 
-	parameterForceVolume: NamedTuple
+	parameterForceVolume: NamedTuple,
+	randomGenerator: np.random.Generator=None
 ) -> np.ndarray:
 	"""Apply noise to the deflection (y) values of the shifted ideal curve.
 
@@ -630,6 +2733,7 @@ def apply_noise_to_deflection(
 		shiftedDeflection(list): Shifted deflection (y) values of the ideal curve.
 		parameterForceVolume(namedtupel): Contains the number of synthetic curves, the noise
 										  level and the virtual deflection and topography offset.
+		randomGenerator(np.random.Generator): Generator used to draw the noise values.
 
 	Returns:
 		(np.ndarray): Shifted deflection (y) values of the ideal curve with added noise.
@@ -637,56 +2741,12 @@ def apply_noise_to_deflection(
 	Raises:
 		ValueError: If the noise value is negative.
 	"""
+	if randomGenerator is None:
+		randomGenerator = np.random.default_rng()
 
 	try:
-		noiseValues = np.random.normal(0, parameterForceVolume.noise, size=len(shiftedDeflection))
+		noiseValues = randomGenerator.normal(0, parameterForceVolume.noise, size=len(shiftedDeflection))
 	except ValueError:
 		raise ValueError("Noise value must be positive.")
 
-	return shiftedDeflection + noiseValues
-
-def create_synthetic_curves(
-	shiftedPiezo: np.ndarray,
-	syntheticDeflectionValues: List
-) -> List:
-	"""Combines the shifted piezo (x) values with the 
-	   corresponding synthetic deflection (y) values.
-	
-	Parameters:
-		shiftedPiezo(np.ndarray): Shifted piezo (x) values of the ideal curve.
-		syntheticDeflectionValues(list): List of synthetic deflection values.
-
-	Returns:
-		syntheticCurves(list): List of synthetic force distance curves.
-	"""
-	return [
-		[shiftedPiezo, syntheticDeflection]
-		for syntheticDeflection in syntheticDeflectionValues
-	]
-
-def arrange_curves_in_force_volume(
-	piezo: List,
-	deflection: List,  
-	shiftedPiezo: np.ndarray, 
-	shiftedDeflection: np.ndarray, 
-	syntheticCurves: List
-) -> List:
-	"""Arrange the ideal curve, the shifted ideal curve 
-	   and the synthetic curves in a force volume.
-
-	Parameters:
-		piezo(list): Piezo (x) values of the ideal curve.
-		deflection(list): Deflection (y) values of the ideal curve.
-		shiftedPiezo(np.ndarray): Piezo (x) values of the shifted ideal curve.
-		shiftedDeflection(np.ndarray): Deflection (y) values of the shifted ideal curve.
-		syntheticCurves(list): List of synthetic force distance curves based on the 
-							   shifted ideal curve.
-
-	Returns:
-		forceVolume(list): List of synthetic force distance curves and
-						   the ideal curve on which they are based.
-	"""
-	return [
-		[piezo, deflection],
-		[shiftedPiezo, shiftedDeflection],
-	] + syntheticCurves
\ No newline at end of file
+	return shiftedDeflection + noiseValues
\ No newline at end of file
@@ -0,0 +1,388 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+class IdealCurveCache:
+	"""A least recently used cache for ideal curves. The ideal curve only
+	   depends on the material and measurement parameters, so these are
+	   used as key. The cache is bounded by the number of curves and by
+	   the memory of the cached arrays.
+	"""
+	def __init__(
+		self,
+		maximumNumberOfCurves: int=128,
+		maximumMemory: int=256 * 2**20,
+		diskCache: "IdealCurveDiskCache"=None
+	):
+		self.maximumNumberOfCurves = maximumNumberOfCurves
+		self.maximumMemory = maximumMemory
+		self.diskCache = diskCache
+
+		self.idealCurves = OrderedDict()
+		self.currentMemory = 0
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self) -> int:
+		return len(self.idealCurves)
+
+	def __contains__(self, parameters: Tuple[NamedTuple, NamedTuple]) -> bool:
+		return self.create_key(*parameters) in self.idealCurves
+
+	@staticmethod
+	def create_key(
+		parameterMaterial: NamedTuple,
+		parameterMeasurement: NamedTuple
+	) -> Tuple:
+		"""Create the key of an ideal curve.
+
+		Parameters:
+			parameterMaterial(namedtupel): Contains all parameters describing the material
+										   and geometriy of the virtual measuring system.
+			parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+											  measuring system.
+
+		Returns:
+			key(tuple): Values of the material and measurement parameters.
+		"""
+		return tuple(parameterMaterial), tuple(parameterMeasurement)
+
+	def get_ideal_curve(
+		self,
+		parameterMaterial: NamedTuple,
+		parameterMeasurement: NamedTuple,
+		create_ideal_curve: Callable
+	) -> Tuple[np.ndarray, np.ndarray]:
+		"""Get a cached ideal curve or create and cache it.
+
+		Parameters:
+			parameterMaterial(namedtupel): Contains all parameters describing the material
+										   and geometriy of the virtual measuring system.
+			parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+											  measuring system.
+			create_ideal_curve(function): Creates the ideal curve if it is not cached.
+
+		Returns:
+			piezo(np.ndarray): Read only piezo (x) values of the ideal curve.
+			deflection(np.ndarray): Read only deflection (y) values of the ideal curve.
+		"""
+		key = self.create_key(parameterMaterial, parameterMeasurement)
+
+		try:
+			idealCurve = self.idealCurves[key]
+		except KeyError:
+			self.misses += 1
+		else:
+			self.hits += 1
+			self.idealCurves.move_to_end(key)
+			return idealCurve
+
+		idealCurve = None
+		if self.diskCache is not None:
+			idealCurve = self.diskCache.load(parameterMaterial, parameterMeasurement)
+
+		if idealCurve is None:
+			idealCurve = create_ideal_curve(parameterMaterial, parameterMeasurement)
+
+			if self.diskCache is not None:
+				self.diskCache.save(parameterMaterial, parameterMeasurement, *idealCurve)
+
+		idealCurve = self.add_ideal_curve(key, *idealCurve)
+
+		return idealCurve
+
+	def add_ideal_curve(
+		self,
+		key: Tuple,
+		piezo: np.ndarray,
+		deflection: np.ndarray
+	) -> Tuple[np.ndarray, np.ndarray]:
+		"""Add an ideal curve and remove the least recently used
+		   curves until the cache is within its bounds again.
+
+		Parameters:
+			key(tuple): Values of the material and measurement parameters.
+			piezo(np.ndarray): Piezo (x) values of the ideal curve.
+			deflection(np.ndarray): Deflection (y) values of the ideal curve.
+
+		Returns:
+			piezo(np.ndarray): Read only piezo (x) values of the ideal curve.
+			deflection(np.ndarray): Read only deflection (y) values of the ideal curve.
+		"""
+		piezo = np.asarray(piezo)
+		deflection = np.asarray(deflection)
+		if piezo.flags.writeable:
+			piezo.setflags(write=False)
+		if deflection.flags.writeable:
+			deflection.setflags(write=False)
+
+		memory = piezo.nbytes + deflection.nbytes
+		if memory > self.maximumMemory or self.maximumNumberOfCurves < 1:
+			return piezo, deflection
+
+		self.idealCurves[key] = (piezo, deflection)
+		self.currentMemory += memory
+
+		while (
+			len(self.idealCurves) > self.maximumNumberOfCurves
+			or self.currentMemory > self.maximumMemory
+		):
+			_, (removedPiezo, removedDeflection) = self.idealCurves.popitem(last=False)
+			self.currentMemory -= removedPiezo.nbytes + removedDeflection.nbytes
+
+		return piezo, deflection
+
+	def clear(self) -> None:
+		"""Remove all cached ideal curves and reset the counters."""
+		self.idealCurves.clear()
+		self.currentMemory = 0
+		self.hits = 0
+		self.misses = 0
+
+class IdealCurveDiskCache:
+	"""A persistent cache for ideal curves shared between sessions and processes.
+	   Every ideal curve is stored as a pair of npy files named after a hash of
+	   the material and measurement parameters and the solver version. Files are
+	   written to a temporary file first and then renamed, so other processes
+	   never read an incomplete curve. If the cache exceeds its maximum size, the
+	   least recently used curves are removed.
+	"""
+	def __init__(
+		self,
+		cacheDirectory: str,
+		solverVersion: str,
+		maximumSize: int=2**30
+	):
+		self.cacheDirectory = cacheDirectory
+		self.solverVersion = solverVersion
+		self.maximumSize = maximumSize
+
+		os.makedirs(cacheDirectory, exist_ok=True)
+
+	def create_hash(
+		self,
+		parameterMaterial: NamedTuple,
+		parameterMeasurement: NamedTuple
+	) -> str:
+		"""Create the hash of an ideal curve from the exact values of its parameters.
+
+		Parameters:
+			parameterMaterial(namedtupel): Contains all parameters describing the material
+										   and geometriy of the virtual measuring system.
+			parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+											  measuring system.
+
+		Returns:
+			hash(str): Hexadecimal hash of the canonicalized parameters.
+		"""
+		canonicalParameters = json.dumps(
+			{
+				"solverVersion": self.solverVersion,
+				"material": {
+					name: float(value).hex()
+					for name, value in zip(parameterMaterial._fields, parameterMaterial)
+				},
+				"measurement": {
+					name: float(value).hex()
+					for name, value in zip(parameterMeasurement._fields, parameterMeasurement)
+				}
+			},
+			sort_keys=True
+		)
+
+		return hashlib.sha256(canonicalParameters.encode()).hexdigest()
+
+	def get_file_paths(
+		self,
+		curveHash: str
+	) -> Tuple[str, str]:
+		"""Get the paths of the piezo and deflection file of an ideal curve.
+
+		Parameters:
+			curveHash(str): Hash of the ideal curve.
+
+		Returns:
+			pathPiezo(str): Path of the piezo file.
+			pathDeflection(str): Path of the deflection file.
+		"""
+		return (
+			os.path.join(self.cacheDirectory, curveHash + "_piezo.npy"),
+			os.path.join(self.cacheDirectory, curveHash + "_deflection.npy")
+		)
+
+	def load(
+		self,
+		parameterMaterial: NamedTuple,
+		parameterMeasurement: NamedTuple
+	) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+		"""Load an ideal curve as memory mapped arrays.
+
+		Parameters:
+			parameterMaterial(namedtupel): Contains all parameters describing the material
+										   and geometriy of the virtual measuring system.
+			parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+											  measuring system.
+
+		Returns:
+			idealCurve(tuple): Piezo (x) and deflection (y) values of the ideal curve
+							   or None if the curve is not cached.
+		"""
+		filePaths = self.get_file_paths(
+			self.create_hash(parameterMaterial, parameterMeasurement)
+		)
+
+		try:
+			idealCurve = tuple(
+				np.load(filePath, mmap_mode="r")
+				for filePath in filePaths
+			)
+			for filePath in filePaths:
+				os.utime(filePath)
+		except (OSError, ValueError):
+			return None
+
+		return idealCurve
+
+	def save(
+		self,
+		parameterMaterial: NamedTuple,
+		parameterMeasurement: NamedTuple,
+		piezo: np.ndarray,
+		deflection: np.ndarray
+	) -> None:
+		"""Save an ideal curve and remove old curves if the cache is too large.
+
+		Parameters:
+			parameterMaterial(namedtupel): Contains all parameters describing the material
+										   and geometriy of the virtual measuring system.
+			parameterMeasurement(namedtupel): Contains all parameters describing the virtual
+											  measuring system.
+			piezo(np.ndarray): Piezo (x) values of the ideal curve.
+			deflection(np.ndarray): Deflection (y) values of the ideal curve.
+		"""
+		pathPiezo, pathDeflection = self.get_file_paths(
+			self.create_hash(parameterMaterial, parameterMeasurement)
+		)
+		# The piezo file is written last, so a curve is complete once it exists.
+		self.save_array_atomically(deflection, pathDeflection)
+		self.save_array_atomically(piezo, pathPiezo)
+
+		self.remove_least_recently_used_curves()
+
+	def save_array_atomically(
+		self,
+		array: np.ndarray,
+		filePath: str
+	) -> None:
+		"""Write an array to a temporary file and rename it afterwards.
+
+		Parameters:
+			array(np.ndarray): Array that is saved.
+			filePath(str): Final path of the npy file.
+		"""
+		fileDescriptor, pathTemporaryFile = tempfile.mkstemp(
+			dir=self.cacheDirectory,
+			suffix=".tmp"
+		)
+
+		try:
+			with os.fdopen(fileDescriptor, "wb") as temporaryFile:
+				np.save(temporaryFile, np.asarray(array))
+			os.replace(pathTemporaryFile, filePath)
+		except BaseException:
+			if os.path.exists(pathTemporaryFile):
+				os.remove(pathTemporaryFile)
+			raise
+
+	def get_cached_files(self) -> list:
+		"""Get all cached files with their size and last access.
+
+		Returns:
+			cachedFiles(list): Path, size and modification time of every npy file.
+		"""
+		cachedFiles = []
+
+		for entry in os.scandir(self.cacheDirectory):
+			if not entry.name.endswith(".npy"):
+				continue
+			try:
+				fileStatus = entry.stat()
+			except OSError:
+				continue
+			cachedFiles.append((entry.path, fileStatus.st_size, fileStatus.st_mtime))
+
+		return cachedFiles
+
+	def get_size(self) -> int:
+		"""Get the size of all cached files.
+
+		Returns:
+			size(int): Size of all cached files in bytes.
+		"""
+		return sum(fileSize for _, fileSize, _ in self.get_cached_files())
+
+	def get_cached_curves(self) -> list:
+		"""Group the cached files by the hash of their ideal curve. The last
+		   access of a curve is the last access of any of its files.
+
+		Returns:
+			cachedCurves(list): Paths, combined size and last access of every curve.
+		"""
+		cachedCurves = {}
+
+		for filePath, fileSize, modificationTime in self.get_cached_files():
+			curveHash = os.path.basename(filePath).rsplit("_", 1)[0]
+			filePaths, curveSize, lastAccess = cachedCurves.get(curveHash, ([], 0, modificationTime))
+			cachedCurves[curveHash] = (
+				filePaths + [filePath],
+				curveSize + fileSize,
+				max(lastAccess, modificationTime)
+			)
+
+		return list(cachedCurves.values())
+
+	def remove_least_recently_used_curves(self) -> None:
+		"""Remove the least recently used curves until the cache is within its maximum 
+		   size. Both files of a curve are removed together, the piezo file first, 
+		   so no other process loads a curve of which only one file is left.
+		"""
+		cachedCurves = sorted(self.get_cached_curves(), key=lambda cachedCurve: cachedCurve[2])
+		size = sum(curveSize for _, curveSize, _ in cachedCurves)
+
+		for filePaths, curveSize, _ in cachedCurves:
+			if size <= self.maximumSize:
+				break
+			for filePath in sorted(filePaths, key=lambda filePath: not filePath.endswith("_piezo.npy")):
+				try:
+					os.remove(filePath)
+				except OSError:
+					pass
+			size -= curveSize
+
+	def clear(self) -> None:
+		"""Remove all cached files."""
+		for filePath, _, _ in self.get_cached_files():
+			try:
+				os.remove(filePath)
+			except OSError:
+				pass
@@ -0,0 +1,231 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import itertools
+import os
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from . import export_data as exp_data
+from . import generate_data as gen_data
+
+SweepResult = namedtuple(
+	"SweepResult",
+	[
+		"taskIndex",
+		"status",
+		"message",
+		"pathOutputFile",
+		"setup"
+	]
+)
+
+def create_parameter_grid(
+	sweepValues: Dict[str, Sequence]
+) -> List[Dict]:
+	"""Expand the values of every swept parameter into a grid of setups.
+
+	Parameters:
+		sweepValues(dict): Contains a value or a list of values for every
+						   name in gen_data.setupParameterNames.
+
+	Returns:
+		parameterGrid(list): One setup for every combination of values.
+	"""
+	parameterNames = list(sweepValues.keys())
+	parameterValues = [
+		values if isinstance(values, (list, tuple, np.ndarray)) else [values]
+		for values in sweepValues.values()
+	]
+
+	return [
+		dict(zip(parameterNames, combination))
+		for combination in itertools.product(*parameterValues)
+	]
+
+def run_parameter_sweep(
+	sweepValues: Dict[str, Sequence],
+	outputDirectory: str,
+	numberOfWorkers: int=None,
+	seed: int=None,
+	update_progress: Callable=None,
+	cacheDirectory: str=None
+) -> List[SweepResult]:
+	"""Create a force volume for every setup of a parameter grid in parallel.
+	   Every force volume is written to its own file as soon as it is created
+	   and every finished task is appended to a summary file. A task that fails,
+	   for example because the point of contact can not be reached, is reported
+	   without aborting the sweep.
+
+	Parameters:
+		sweepValues(dict): Contains a value or a list of values for every
+						   name in gen_data.setupParameterNames.
+		outputDirectory(str): Directory of the force volume and summary files.
+		numberOfWorkers(int): Number of worker processes, one runs the sweep
+							  in the current process.
+		seed(int): Root seed from which the seed of every task is derived.
+		update_progress(function): Called with every finished task.
+		cacheDirectory(str): Directory in which the workers share their ideal curves.
+
+	Returns:
+		sweepResults(list): Result of every task, sorted by the task index.
+
+	Raises:
+		ValueError: If a parameter of the setup is missing.
+	"""
+	missingParameters = [
+		parameterName
+		for parameterName in gen_data.setupParameterNames
+		if parameterName not in sweepValues
+	]
+	if missingParameters:
+		raise ValueError(
+			"Missing parameters: " + ", ".join(missingParameters) + "."
+		)
+
+	parameterGrid = create_parameter_grid(sweepValues)
+	taskSeeds = [
+		int(childSeed.generate_state(1, np.uint64)[0])
+		for childSeed in np.random.SeedSequence(seed).spawn(len(parameterGrid))
+	]
+
+	os.makedirs(outputDirectory, exist_ok=True)
+	pathSummaryFile = os.path.join(outputDirectory, "sweep_summary.csv")
+
+	sweepResults = []
+
+	with open(pathSummaryFile, "w", newline="") as summaryFile:
+		summaryWriter = csv.writer(summaryFile)
+		summaryWriter.writerow(
+			["taskIndex", "status", "message", "pathOutputFile"]
+			+ list(sweepValues.keys())
+		)
+
+		for sweepResult in iter_sweep_results(
+			parameterGrid,
+			taskSeeds,
+			outputDirectory,
+			numberOfWorkers,
+			cacheDirectory
+		):
+			summaryWriter.writerow(
+				[
+					sweepResult.taskIndex,
+					sweepResult.status,
+					sweepResult.message,
+					sweepResult.pathOutputFile
+				]
+				+ [sweepResult.setup[name] for name in sweepValues.keys()]
+			)
+			summaryFile.flush()
+			sweepResults.append(sweepResult)
+
+			if update_progress is not None:
+				update_progress(sweepResult)
+
+	return sorted(sweepResults, key=lambda sweepResult: sweepResult.taskIndex)
+
+def iter_sweep_results(
+	parameterGrid: List[Dict],
+	taskSeeds: List[int],
+	outputDirectory: str,
+	numberOfWorkers: int=None,
+	cacheDirectory: str=None
+):
+	"""Run the tasks of a sweep and yield their results in order of completion.
+
+	Parameters:
+		parameterGrid(list): Setup of every task.
+		taskSeeds(list): Seed of every task.
+		outputDirectory(str): Directory of the force volume files.
+		numberOfWorkers(int): Number of worker processes, one runs the tasks
+							  in the current process.
+		cacheDirectory(str): Directory in which the workers share their ideal curves.
+
+	Yields:
+		sweepResult(SweepResult): Result of a finished task.
+	"""
+	if numberOfWorkers == 1:
+		for taskIndex, (setup, taskSeed) in enumerate(zip(parameterGrid, taskSeeds)):
+			yield run_sweep_task(taskIndex, setup, taskSeed, outputDirectory, cacheDirectory)
+		return
+
+	with ProcessPoolExecutor(max_workers=numberOfWorkers) as executor:
+		futures = [
+			executor.submit(
+				run_sweep_task,
+				taskIndex,
+				setup,
+				taskSeed,
+				outputDirectory,
+				cacheDirectory
+			)
+			for taskIndex, (setup, taskSeed) in enumerate(zip(parameterGrid, taskSeeds))
+		]
+
+		for future in as_completed(futures):
+			yield future.result()
+
+def run_sweep_task(
+	taskIndex: int,
+	setup: Dict,
+	seed: int,
+	outputDirectory: str,
+	cacheDirectory: str=None
+) -> SweepResult:
+	"""Create and save the force volume of a single setup. The disk cache of 
+	   the ideal curves is only used for this task and restored afterwards, so 
+	   running the task in the current process does not change its cache.
+	   Every error of the task is reported in its result, so a single task 
+	   can not abort the sweep.
+
+	Parameters:
+		taskIndex(int): Index of the task within the sweep.
+		setup(dict): Contains a value for every name in gen_data.setupParameterNames.
+		seed(int): Seed of the noise of the force volume.
+		outputDirectory(str): Directory of the force volume file.
+		cacheDirectory(str): Directory in which the workers share their ideal curves.
+
+	Returns:
+		sweepResult(SweepResult): Status of the task and path of the force volume file.
+	"""
+	previousDiskCache = gen_data.idealCurveCache.diskCache
+	if cacheDirectory is not None:
+		gen_data.set_ideal_curve_disk_cache(cacheDirectory)
+
+	try:
+		parameterMaterial, parameterMeasurement, parameterForceVolume = gen_data.create_parameter_tuples(setup)
+		forceVolume = gen_data.create_synthetic_force_volume(
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume,
+			seed
+		)
+
+		pathOutputFile = os.path.join(
+			outputDirectory,
+			"force_volume_" + str(taskIndex) + ".npz"
+		)
+		exp_data.export_to_npz(forceVolume, pathOutputFile)
+	except Exception as error:
+		return SweepResult(taskIndex, "failed", str(error), "", setup)
+	finally:
+		gen_data.idealCurveCache.diskCache = previousDiskCache
+
+	return SweepResult(taskIndex, "done", "", pathOutputFile, setup)
@@ -0,0 +1,206 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+class RaggedCurves:
+	"""Curves of different lengths stored in one flat array for the piezo (x)
+	   and one for the deflection (y) values. The values of curve i are
+	   stored between offsets[i] and offsets[i+1].
+
+	   Indexing with an integer and iteration return views of the flat
+	   arrays in the list layout of a force volume, indexing with a slice
+	   or an array of indices returns new ragged curves.
+	"""
+	__slots__ = (
+		"piezo",
+		"deflection",
+		"offsets"
+	)
+
+	def __init__(
+		self,
+		piezo: np.ndarray,
+		deflection: np.ndarray,
+		offsets: np.ndarray
+	):
+		offsets = np.asarray(offsets, dtype=np.int64)
+
+		if (
+			len(piezo) != len(deflection)
+			or len(offsets) == 0
+			or offsets[0] != 0
+			or offsets[-1] != len(piezo)
+			or np.any(np.diff(offsets) < 0)
+		):
+			raise ValueError("Offsets do not match the piezo and deflection values.")
+
+		self.piezo = piezo
+		self.deflection = deflection
+		self.offsets = offsets
+
+	@classmethod
+	def from_curves(
+		cls,
+		curves: Iterable
+	) -> "RaggedCurves":
+		"""Create ragged curves from piezo (x) and deflection (y) value pairs.
+
+		Parameters:
+			curves(iterable): Piezo and deflection values of every curve.
+
+		Returns:
+			raggedCurves(RaggedCurves): Values of all curves in flat arrays.
+		"""
+		curves = [
+			(np.asarray(curve[0]), np.asarray(curve[1]))
+			for curve in curves
+		]
+		lengths = [len(piezo) for piezo, _ in curves]
+
+		if not curves:
+			return cls(np.empty(0), np.empty(0), np.zeros(1))
+
+		return cls(
+			np.concatenate([piezo for piezo, _ in curves]),
+			np.concatenate([deflection for _, deflection in curves]),
+			np.concatenate(([0], np.cumsum(lengths)))
+		)
+
+	@classmethod
+	def from_padded(
+		cls,
+		piezo: np.ndarray,
+		deflection: np.ndarray,
+		lengths: np.ndarray
+	) -> "RaggedCurves":
+		"""Create ragged curves from padded rows, for example the result of
+		   create_ideal_curve_batch.
+
+		Parameters:
+			piezo(np.ndarray): Piezo (x) values with one row per curve or
+							   one row shared by every curve.
+			deflection(np.ndarray): Deflection (y) values with one row per curve.
+			lengths(np.ndarray): Number of valid values in every row.
+
+		Returns:
+			raggedCurves(RaggedCurves): Values of all curves in flat arrays.
+		"""
+		lengths = np.asarray(lengths, dtype=np.int64)
+		validValues = np.arange(deflection.shape[1]) < lengths[:, np.newaxis]
+
+		return cls(
+			np.broadcast_to(piezo, deflection.shape)[validValues],
+			deflection[validValues],
+			np.concatenate(([0], np.cumsum(lengths)))
+		)
+
+	@property
+	def lengths(self) -> np.ndarray:
+		"""Number of values of every curve."""
+		return np.diff(self.offsets)
+
+	def __len__(self) -> int:
+		return len(self.offsets) - 1
+
+	def __getitem__(self, index):
+		if isinstance(index, slice) or np.ndim(index) > 0:
+			return self.select_curves(index)
+
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError("Ragged curves index out of range.")
+
+		start, stop = self.offsets[index], self.offsets[index + 1]
+
+		return [self.piezo[start:stop], self.deflection[start:stop]]
+
+	def __iter__(self) -> Iterator[List]:
+		for start, stop in zip(self.offsets[:-1], self.offsets[1:]):
+			yield [self.piezo[start:stop], self.deflection[start:stop]]
+
+	def select_curves(
+		self,
+		indices
+	) -> "RaggedCurves":
+		"""Select several curves without a loop over the curves.
+
+		Parameters:
+			indices(slice or array): Indices of the selected curves.
+
+		Returns:
+			raggedCurves(RaggedCurves): Values of the selected curves.
+		"""
+		indices = np.arange(len(self))[indices]
+		starts = self.offsets[indices]
+		lengths = self.offsets[indices + 1] - starts
+		offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+		valueIndices = (
+			np.repeat(starts - offsets[:-1], lengths)
+			+ np.arange(offsets[-1])
+		)
+
+		return RaggedCurves(
+			self.piezo[valueIndices],
+			self.deflection[valueIndices],
+			offsets
+		)
+
+	def to_padded(
+		self,
+		fillValue: float=np.nan
+	) -> Tuple[np.ndarray, np.ndarray]:
+		"""Arrange the curves as rows of equal length.
+
+		Parameters:
+			fillValue(float): Value after the end of shorter curves.
+
+		Returns:
+			piezo(np.ndarray): Piezo (x) values with one row per curve.
+			deflection(np.ndarray): Deflection (y) values with one row per curve.
+		"""
+		lengths = self.lengths
+		shape = (len(self), int(lengths.max(initial=0)))
+		rows = np.repeat(np.arange(len(self)), lengths)
+		columns = np.arange(len(self.piezo)) - np.repeat(self.offsets[:-1], lengths)
+
+		piezo = np.full(shape, fillValue, dtype=np.result_type(self.piezo, fillValue))
+		deflection = np.full(shape, fillValue, dtype=np.result_type(self.deflection, fillValue))
+		piezo[rows, columns] = self.piezo
+		deflection[rows, columns] = self.deflection
+
+		return piezo, deflection
+
+	def stack_columns(self) -> np.ndarray:
+		"""Arrange the x and y values of every curve as neighbouring columns,
+		   shorter curves are padded with NaN.
+
+		Returns:
+			stackedColumns(np.ndarray): Matrix with one row per point and two
+										columns per curve.
+		"""
+		piezo, deflection = self.to_padded()
+		stackedColumns = np.empty(
+			(piezo.shape[1], 2 * len(self)),
+			dtype=np.result_type(piezo, deflection)
+		)
+		stackedColumns[:, 0::2] = piezo.T
+		stackedColumns[:, 1::2] = deflection.T
+
+		return stackedColumns
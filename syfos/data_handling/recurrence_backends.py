@@ -0,0 +1,137 @@
+"""
+This file is part of SyFoS.
+SyFoS is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+SyFoS is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+This file contains the backends to run the recurrence of the approach
+part of the ideal curve. Every backend has the signature of
+run_approach_recurrence and writes into preallocated arrays.
+The numba backend is only available if numba is installed and is
+compiled when it is used for the first time, so importing this file
+does not import numba.
+"""
+import importlib.util
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+numbaAvailable = importlib.util.find_spec("numba") is not None
+
+statusJumpToContact = 0
+statusMaximumPiezo = 1
+statusCapacityReached = 2
+
+def run_approach_recurrence(
+	piezo: np.ndarray,
+	deflection: np.ndarray,
+	startIndex: int,
+	startDistance: float,
+	stepSize: float,
+	maximumPiezo: float,
+	hamaker: float,
+	radius: float,
+	kc: float,
+	jtc: float
+) -> Tuple[int, int]:
+	"""Continue the recurrence of the approach part until the jump to contact
+	   occurs, the maximum piezo is exceeded or the arrays are full. Every
+	   value is calculated with the same operations as calculate_piezo_value,
+	   calculate_tip_sample_distance and calculate_deflection_approach_part.
+
+	Parameters:
+		piezo(np.ndarray): Preallocated piezo (x) values of the approach part.
+		deflection(np.ndarray): Preallocated deflection (y) values of the approach part.
+		startIndex(int): Number of values that are already calculated, at least one.
+		startDistance(float): Initial distance of the given virtual system.
+		stepSize(float): Distance interval of the given virtual system.
+		maximumPiezo(float): Maximum piezo value of the given virtual system.
+		hamaker(float): Hamaker value of the given virtual system.
+		radius(float): Value for the specified tip radius.
+		kc(float): Value for the specified spring constant.
+		jtc(float): Jtc value of the given virtual system.
+
+	Returns:
+		length(int): Number of calculated values.
+		status(int): Reason why the recurrence stopped.
+	"""
+	capacity = piezo.shape[0]
+	absoluteJtc = abs(jtc)
+	index = startIndex
+	# Keep the previous values as scalars to avoid array reads in the python backend.
+	previousPiezo = float(piezo[index - 1])
+	previousDeflection = float(deflection[index - 1])
+
+	while index < capacity:
+		tipSampleDistance = previousPiezo - previousDeflection
+
+		previousPiezo = startDistance + stepSize * index
+		previousDeflection = (
+			- (hamaker*radius)
+			/ (6*tipSampleDistance**2*kc)
+		)
+		piezo[index] = previousPiezo
+		deflection[index] = previousDeflection
+		index += 1
+
+		if abs(tipSampleDistance) < absoluteJtc:
+			return index, statusJumpToContact
+
+		if previousPiezo > maximumPiezo:
+			return index, statusMaximumPiezo
+
+	return index, statusCapacityReached
+
+approachBackends: Dict[str, Callable] = {
+	"python": run_approach_recurrence
+}
+
+def compile_numba_backend() -> Callable:
+	"""Compile run_approach_recurrence with numba, the compiled 
+	   function is cached on disk between sessions.
+
+	Returns:
+		backend(function): Compiled function running the recurrence of the approach part.
+	"""
+	import numba
+
+	return numba.njit(cache=True)(run_approach_recurrence)
+
+def get_approach_backend(
+	backendName: str=None
+) -> Callable:
+	"""Get the function of a recurrence backend.
+
+	Parameters:
+		backendName(str): Name of the backend. If not specified, the
+						  numba backend is used when it is available.
+
+	Returns:
+		backend(function): Function running the recurrence of the approach part.
+
+	Raises:
+		ValueError: If the backend is unknown or not available.
+	"""
+	if backendName is None:
+		backendName = "numba" if numbaAvailable else "python"
+
+	if backendName == "numba" and numbaAvailable and backendName not in approachBackends:
+		approachBackends[backendName] = compile_numba_backend()
+
+	try:
+		return approachBackends[backendName]
+	except KeyError:
+		raise ValueError(
+			"Unknown or unavailable recurrence backend: " + str(backendName) + "."
+		)
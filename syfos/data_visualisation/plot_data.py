@@ -13,7 +13,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with SyFoS.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import List
+from typing import Iterable, List
 import functools
 
 import numpy as np
@@ -55,12 +55,12 @@ def decorator_update_plot(function):
 	return wrapper_update_plot
 
 def create_line_collection(
-	forceVolume: np.ndarray
+	forceVolume: Iterable
 ) -> List[Line2D]:
 	"""Create a list of displayable lines from the data of a force volume.
 
 	Parameters:
-		forceVolume(np.ndarray): x and y data of every curve in the force volume.
+		forceVolume(ForceVolume): x and y data of every curve in the force volume.
 
 	Returns:
 		lineCollection(list): List of displayable Line2D objects.
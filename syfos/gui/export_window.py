@@ -24,8 +24,6 @@ from tkinter import messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-import data_handling.export_data as exp_data
-
 def decorator_check_if_file_name_selected(function):
 	"""Check if a file name is selected."""
 	@functools.wraps(function)
@@ -189,6 +187,9 @@ class ExportWindow(ttk.Frame):
 		Returns:
 			userFeedback(tk.messagebox): Informs the user whether the data could be exported or not.
 		"""
+		# Imported on first use, since it loads pandas.
+		import data_handling.export_data as exp_data
+
 		selectedExportParameters = self._create_selected_export_parameters()
 
 		exp_data.export_data(
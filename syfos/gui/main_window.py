@@ -33,9 +33,9 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 import gui.default_parameters as dp
 from gui.tkinter_utility import LabeledParameterInput, ParameterLabel
-from gui.export_window import ExportWindow
 
 import data_handling.generate_data as gen_data
+from data_handling.force_volume import ForceVolume
 import data_visualisation.plot_data as plot_data
 from data_visualisation.toolbars.toolbar_line_plot import ToolbarLinePlot
 
@@ -577,13 +577,15 @@ class MainWindow(ttk.Frame):
 		"""
 		try:
 			self._check_parameters()
+			parameterMaterial, parameterMeasurement, parameterForceVolume = self._get_parameters()
+			# Rejects unreachable setups before any curve is calculated
+			# and keeps the parameters, so they can be corrected.
+			gen_data.plan_ideal_curve(parameterMaterial, parameterMeasurement)
 		except ValueError as e:
 			return messagebox.showerror(
-				"Error", 
+				"Error",
 				e
 			)
-		else:
-			parameterMaterial, parameterMeasurement, parameterForceVolume = self._get_parameters()
 
 		try:
 			forceVolume = gen_data.create_synthetic_force_volume(
@@ -671,42 +673,25 @@ class MainWindow(ttk.Frame):
 			parameterMeasurement(namedtuple): Contains every measurment parameter.
 			parameterForceVolume(namedtuple): Contains every force volume parameter.
 		"""
-		ParameterMaterial, ParameterMeasurement, ParameterForceVolume = gen_data.get_parameter_tuples()
-
-		hamaker = gen_data.calculate_hamaker(
-			float(self.inputHamakerProbe.get()),
-			float(self.inputHamakerSample.get())
-		)
-		jtc = gen_data.calculate_jtc(
-			hamaker,
-			float(self.inputRadius.get()),
-			float(self.inputSpringConstant.get())
-		)
-		etot = gen_data.calculate_etot(
-			float(self.inputPoissonRatioProbe.get()),
-			float(self.inputEProbe.get()),
-			float(self.inputPoissonRatioSample.get()),
-			float(self.inputESample.get())
-		)
+		setup = {
+			"eProbe": self.inputEProbe.get(),
+			"poissonRatioProbe": self.inputPoissonRatioProbe.get(),
+			"hamakerProbe": self.inputHamakerProbe.get(),
+			"kc": self.inputSpringConstant.get(),
+			"radius": self.inputRadius.get(),
+			"eSample": self.inputESample.get(),
+			"poissonRatioSample": self.inputPoissonRatioSample.get(),
+			"hamakerSample": self.inputHamakerSample.get(),
+			"startDistance": self.inputStartDistance.get(),
+			"stepSize": self.inputStepSize.get(),
+			"maximumPiezo": self.inputMaximumPiezo.get(),
+			"numberOfCurves": self.inputNumberOfCurves.get(),
+			"noise": self.inputNoise.get(),
+			"virtualDeflection": self.inputVirtualDeflection.get(),
+			"topographyOffset": self.inputTopographyOffset.get()
+		}
 
-		parameterMaterial = ParameterMaterial(
-			kc=float(self.inputSpringConstant.get()),
-			radius=float(self.inputRadius.get()),
-			Hamaker=hamaker,
-			Etot=etot,
-			jtc=jtc,
-		)
-		parameterMeasurement = ParameterMeasurement(
-			startDistance=float(self.inputStartDistance.get()),
-			stepSize=float(self.inputStepSize.get()),
-			maximumPiezo=float(self.inputMaximumPiezo.get()),	
-		)
-		parameterForceVolume = ParameterForceVolume(
-			numberOfCurves=int(self.inputNumberOfCurves.get()),
-			noise=float(self.inputNoise.get()),
-			virtualDeflection=float(self.inputVirtualDeflection.get()),
-			topographyOffset=float(self.inputTopographyOffset.get())
-		)
+		parameterMaterial, parameterMeasurement, parameterForceVolume = gen_data.create_parameter_tuples(setup)
 
 		return parameterMaterial, parameterMeasurement, parameterForceVolume
 
@@ -731,7 +716,7 @@ class MainWindow(ttk.Frame):
 	def _cache_force_volume(
 		self,
 		identifier: str,
-		forceVolume: np.ndarray, 
+		forceVolume: ForceVolume, 
 		etot: float, 
 		jtc: float,
 		hamaker: float
@@ -740,7 +725,7 @@ class MainWindow(ttk.Frame):
 
 		Parameters:
 			identifier(str): Identifier of the force volume.
-			forceVolume(np.ndarray): Data of the force volume.
+			forceVolume(ForceVolume): Data of the force volume.
 			etot(float): etot value of the force volume.
 			jtc(float): jtc value of the force volume.
 			hamaker(float): hamaker value of the force volume.
@@ -820,6 +805,9 @@ class MainWindow(ttk.Frame):
 	@decorator_check_if_force_volume_selected
 	def _export_force_volume(self) -> None:
 		"""Open a window to export the data of the active force volume."""
+		# Imported on first use, the export is not needed to start the gui.
+		from gui.export_window import ExportWindow
+
 		exportWindow = ttk.Toplevel("Export Force Volume")
 		ExportWindow(
 			exportWindow,
@@ -113,7 +113,7 @@ def get_parameters_for_synthetic_force_volume() -> Tuple:
 	ParameterMaterial, ParameterMeasurement, ParameterForceVolume = gen_data.get_parameter_tuples()
 
 	hamaker = gen_data.calculate_hamaker(
-		hamkerProbe=66e-21,
+		hamakerProbe=66e-21,
 		hamakerSample=90e-21
 	)
 	jtc = gen_data.calculate_jtc(
@@ -144,14 +144,12 @@ def get_parameters_for_synthetic_force_volume() -> Tuple:
 		numberOfCurves=1,
 		noise=1e-10,
 		virtualDeflection=3e-9,
-		topography=10e-9
+		topographyOffset=10e-9
 	)
 
 	return parameterMaterial, parameterMeasurement, parameterForceVolume
 
-@fixture(
-	unpack_into="syntheticForcevolume"
-)
+@pytest.fixture(name="syntheticForcevolume")
 def create_synthetic_test_force_volume(
 	parameterMaterial: NamedTuple,
 	parameterMeasurement: NamedTuple,
@@ -174,7 +172,8 @@ def create_synthetic_test_force_volume(
 	syntheticForcevolume = gen_data.create_synthetic_force_volume(
 		parameterMaterial, 
 		parameterMeasurement, 
-		parameterForcevolume
+		parameterForceVolume,
+		seed=0
 	)
 
 	return syntheticForcevolume
@@ -183,7 +182,8 @@ def create_synthetic_test_force_volume(
 	unpack_into="syntheticApproachParameters, syntheticContactParameters"
 )
 def get_parameters_synthetic_force_volume(
-	syntheticForcevolume: np.ndarray
+	syntheticForcevolume: np.ndarray,
+	parameterMaterial: NamedTuple
 ) -> Tuple:
 	"""Calculate the theoretical parameters kc, radius, 
 	   hamaker and etot from the ideal curve of the 
@@ -192,6 +192,8 @@ def get_parameters_synthetic_force_volume(
 	Parameters:
 		syntheticForcevolume(np.ndarray): Set of generated synthetic force distance curves
 										  from a silicon/gold setup.
+		parameterMaterial(namedtupel): Combines all parameters describing the material 
+									   and geometriy of the virtual measuring system.
 
 	Returns: 
 		approachParameters(tuple): Contains the theoretical values for kc, 
@@ -203,6 +205,9 @@ def get_parameters_synthetic_force_volume(
 	"""
 	idealCurve = syntheticForcevolume[0]
 
-	approachParameters, contactParameters = analyse_data.calculate_ideal_curve_parameters(idealCurve)
+	approachParameters, contactParameters = analyse_data.calculate_ideal_curve_parameters(
+		idealCurve,
+		parameterMaterial
+	)
 
 	return approachParameters, contactParameters
\ No newline at end of file
@@ -4,6 +4,7 @@ import pytest
 import numpy as np
 
 import syfos.data_handling.analyse_data as analyse_data
+import syfos.data_handling.generate_data as gen_data
 
 def test_get_approach_part_simple_ideal_curve(
 	simple_ideal_curve: List,
@@ -200,4 +201,189 @@ def test_calculate_etot_contact(
 
 	expectedEtot = 3200
 
-	assert np.isclose(etot, expectedEtot)
\ No newline at end of file
+	assert np.isclose(etot, expectedEtot)
+
+def test_calculate_ideal_curve_parameters_synthetic_force_volume(
+	syntheticApproachParameters,
+	syntheticContactParameters,
+	parameterMaterial
+):
+	"""Test that the contact part of the ideal curve results in the actual parameters."""
+	contactPoints = ~np.isnan(syntheticContactParameters.kc)
+
+	assert np.any(contactPoints)
+	assert np.any(~np.isnan(syntheticApproachParameters.kc))
+	np.testing.assert_allclose(syntheticContactParameters.kc[contactPoints], parameterMaterial.kc)
+	np.testing.assert_allclose(syntheticContactParameters.radius[contactPoints], parameterMaterial.radius)
+	np.testing.assert_allclose(syntheticContactParameters.etot[contactPoints], parameterMaterial.Etot)
+
+def test_calculate_ideal_curve_parameters_matrix(
+	parameterMaterial,
+	parameterMeasurement
+):
+	"""Test that every row of a matrix of curves results in the parameters 
+	   of the single curve and that the spring constant is applied."""
+	parameterMaterial = parameterMaterial._replace(
+		kc=2,
+		jtc=gen_data.calculate_jtc(parameterMaterial.Hamaker, parameterMaterial.radius, 2)
+	)
+	piezo, deflection = gen_data.create_ideal_curve(
+		parameterMaterial,
+		parameterMeasurement._replace(stepSize=0.01e-9)
+	)
+
+	approachParameters, contactParameters = analyse_data.calculate_ideal_curve_parameters(
+		[piezo, deflection],
+		parameterMaterial
+	)
+	approachParametersMatrix, contactParametersMatrix = analyse_data.calculate_ideal_curve_parameters(
+		[piezo, np.stack((deflection, deflection))],
+		parameterMaterial
+	)
+
+	for parameters, parametersMatrix in zip(
+		approachParameters + contactParameters,
+		approachParametersMatrix + contactParametersMatrix
+	):
+		np.testing.assert_array_equal(parametersMatrix, np.stack((parameters, parameters)))
+
+	assert np.isclose(np.nanmedian(approachParameters.kc), 2, rtol=1e-2)
+	assert np.isclose(np.nanmedian(approachParameters.hamaker), parameterMaterial.Hamaker, rtol=1e-2)
+	np.testing.assert_allclose(contactParameters.kc[~np.isnan(contactParameters.kc)], 2)
+
+def test_calculate_ideal_curve_parameters_per_curve_values(
+	parameterMaterial,
+	parameterMeasurement,
+	parameterForceVolume
+):
+	"""Test that the per curve spring constant and tip radius of jittered curves
+	   can be passed with one value per curve, as they are drawn."""
+	parameterForceVolume = parameterForceVolume._replace(
+		numberOfCurves=2,
+		noise=0,
+		virtualDeflection=0,
+		topographyOffset=0,
+		kcSpread=0.1 * parameterMaterial.kc,
+		radiusSpread=0.1 * parameterMaterial.radius
+	)
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement._replace(stepSize=0.01e-9),
+		parameterForceVolume,
+		seed=2
+	)
+	curveParameters = forceVolume.curveParameters
+	perCurveMaterial = parameterMaterial._replace(
+		kc=curveParameters.kc,
+		radius=curveParameters.radius,
+		jtc=gen_data.calculate_jtc(parameterMaterial.Hamaker, curveParameters.radius, curveParameters.kc)
+	)
+
+	approachParameters, contactParameters = analyse_data.calculate_ideal_curve_parameters(
+		[forceVolume.shiftedPiezo, forceVolume.syntheticDeflection],
+		perCurveMaterial
+	)
+	approachParametersColumns, contactParametersColumns = analyse_data.calculate_ideal_curve_parameters(
+		[forceVolume.shiftedPiezo, forceVolume.syntheticDeflection],
+		perCurveMaterial._replace(
+			**{
+				fieldName: values[:, np.newaxis]
+				for fieldName, values in perCurveMaterial._asdict().items()
+				if np.ndim(values) == 1
+			}
+		)
+	)
+
+	for parameters, parametersColumns in zip(
+		approachParameters + contactParameters,
+		approachParametersColumns + contactParametersColumns
+	):
+		np.testing.assert_array_equal(parameters, parametersColumns)
+
+	for curveIndex in range(2):
+		contactPoints = ~np.isnan(contactParameters.kc[curveIndex])
+		np.testing.assert_allclose(contactParameters.kc[curveIndex][contactPoints], curveParameters.kc[curveIndex])
+		np.testing.assert_allclose(
+			contactParameters.radius[curveIndex][contactPoints], 
+			curveParameters.radius[curveIndex]
+		)
+
+def test_locate_curve_parts_without_contact():
+	"""Test that a curve without a point of contact raises an error."""
+	with pytest.raises(ValueError):
+		analyse_data.locate_curve_parts(np.array([[0.0, -0.1, -0.2, -1.0], [1.0, 2.0, 3.0, 4.0]]))
+
+def test_segment_curves_ideal_curve(
+	parameterMaterial,
+	parameterMeasurement,
+	parameterForceVolume
+):
+	"""Test that the segmentation of the ideal and the shifted ideal curve 
+	   finds the last point before the jump to contact and the point of contact."""
+	parameterMeasurement = parameterMeasurement._replace(stepSize=0.01e-9)
+
+	piezo, deflection = gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement)
+	piezoApproach, _ = gen_data.create_ideal_curve_approach_part(parameterMaterial, parameterMeasurement)
+	_, shiftedDeflection = gen_data.shift_ideal_curve(piezo, deflection, parameterForceVolume)
+
+	curveSegments = analyse_data.segment_curves(np.stack((deflection, shiftedDeflection)))
+
+	np.testing.assert_array_equal(curveSegments.indexJumpToContact, len(piezoApproach) - 1)
+	np.testing.assert_array_equal(curveSegments.indexPointOfContact, np.argmax(piezo >= 0))
+	assert curveSegments.indexJumpToContact.dtype == np.int64
+
+@pytest.mark.parametrize(
+	"smoothingMethod, windowSize",
+	[
+		("movingAverage", 21),
+		("savitzkyGolay", 41)
+	]
+)
+def test_segment_curves_smoothing_noisy_curves(
+	parameterMaterial,
+	parameterMeasurement,
+	parameterForceVolume,
+	smoothingMethod: str,
+	windowSize: int
+):
+	"""Test that smoothing makes the segmentation of noisy curves more robust."""
+	parameterMeasurement = parameterMeasurement._replace(stepSize=0.05e-9)
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume._replace(numberOfCurves=200),
+		seed=0
+	)
+	expectedSegments = analyse_data.segment_curves(forceVolume.shiftedDeflection)
+
+	curveSegments = analyse_data.segment_curves(forceVolume.syntheticDeflection)
+	smoothedCurveSegments = analyse_data.segment_curves(
+		forceVolume.syntheticDeflection,
+		smoothingMethod,
+		windowSize
+	)
+
+	assert np.mean(smoothedCurveSegments.indexJumpToContact == expectedSegments.indexJumpToContact) > 0.95
+	assert (
+		np.mean(np.abs(smoothedCurveSegments.indexPointOfContact - expectedSegments.indexPointOfContact))
+		< np.mean(np.abs(curveSegments.indexPointOfContact - expectedSegments.indexPointOfContact))
+	)
+
+def test_smooth_curves():
+	"""Test that the Savitzky-Golay filter keeps a quadratic polynomial
+	   and the moving average a constant."""
+	points = np.arange(20.0)
+	curves = np.stack((points**2, np.full(20, 3.0)))
+
+	savitzkyGolayCurves = analyse_data.smooth_curves(curves, "savitzkyGolay", 7, 2)
+	movingAverageCurves = analyse_data.smooth_curves(curves, "movingAverage", 5)
+
+	np.testing.assert_allclose(savitzkyGolayCurves[:, 3:-3], curves[:, 3:-3])
+	np.testing.assert_allclose(movingAverageCurves[1], curves[1])
+
+	with pytest.raises(ValueError):
+		analyse_data.smooth_curves(curves, "median", 5)
+	with pytest.raises(ValueError):
+		analyse_data.smooth_curves(curves, "movingAverage", 4)
+	with pytest.raises(ValueError):
+		analyse_data.smooth_curves(curves, "savitzkyGolay", 3, 3)
@@ -0,0 +1,83 @@
+from typing import NamedTuple
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.artefacts as artefacts
+import syfos.data_handling.generate_data as gen_data
+
+@pytest.mark.parametrize("exponent", [1, 2])
+def test_create_coloured_noise_spectrum(exponent: float):
+	"""Test that the coloured noise has the selected amplitude and spectral slope."""
+	colouredNoise = artefacts.create_coloured_noise(
+		(400, 512), 2e-10, exponent, np.random.default_rng(1)
+	)
+
+	frequencies = np.fft.rfftfreq(512)[1:]
+	powerSpectralDensity = np.mean(np.abs(np.fft.rfft(colouredNoise, axis=1)[:, 1:])**2, axis=0)
+	slope = np.polyfit(np.log(frequencies), np.log(powerSpectralDensity), 1)[0]
+
+	assert np.isclose(np.std(colouredNoise), 2e-10, rtol=0.1)
+	assert np.isclose(slope, -exponent, atol=0.1)
+
+def test_create_interference_random_phase():
+	"""Test that every curve has a sine of the selected period with its own phase."""
+	piezo = np.linspace(-10e-9, 30e-9, 201)
+
+	interference = artefacts.create_interference(
+		piezo, 5, 1e-10, 20e-9, np.random.default_rng(3)
+	)
+
+	np.testing.assert_allclose(interference[:, :100], interference[:, 100:200], atol=1e-20)
+	assert np.all(np.abs(interference) <= 1e-10)
+	assert len(np.unique(interference[:, 0])) == 5
+
+	with pytest.raises(ValueError):
+		artefacts.create_interference(piezo, 5, 1e-10, 0, np.random.default_rng(3))
+
+def test_create_drift_continues_between_curves():
+	"""Test that the drift continues from the last point of a curve to the next curve."""
+	drift = artefacts.create_drift((3, 4), 1e-9, 0)
+
+	np.testing.assert_allclose(np.diff(drift.ravel()), 0.25e-9)
+
+def test_create_synthetic_force_volume_artefacts_keep_noise(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that artefacts are added without changing the white noise of the same seed."""
+	parameterForceVolume = parameterForceVolume._replace(numberOfCurves=6)
+	artefactForceVolume = parameterForceVolume._replace(
+		colouredNoise=1e-10,
+		interferenceAmplitude=5e-11,
+		interferencePeriod=10e-9,
+		driftLinear=1e-10,
+		baselineTilt=1e-3
+	)
+
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, parameterForceVolume, seed=2
+	)
+	driftForceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement,
+		parameterForceVolume._replace(driftLinear=1e-10), seed=2
+	)
+	firstResult = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, artefactForceVolume, seed=2
+	)
+	secondResult = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, artefactForceVolume, seed=2
+	)
+
+	np.testing.assert_allclose(
+		driftForceVolume.syntheticDeflection - forceVolume.syntheticDeflection,
+		artefacts.create_drift(forceVolume.syntheticDeflection.shape, 1e-10, 0),
+		rtol=0, atol=1e-22
+	)
+	np.testing.assert_array_equal(firstResult.syntheticDeflection, secondResult.syntheticDeflection)
+
+	with pytest.raises(ValueError):
+		gen_data.create_synthetic_force_volume(
+			parameterMaterial, parameterMeasurement, artefactForceVolume, lazy=True
+		)
@@ -0,0 +1,160 @@
+import csv
+import os
+from typing import Dict
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.batch_job as batch_job
+import syfos.data_handling.generate_data as gen_data
+
+@pytest.fixture
+def job_spec(tmp_path) -> Dict:
+	"""Define a job of a soft and a stiff volume and one volume that can not
+	   reach the point of contact.
+
+	Returns:
+		jobSpec(dict): Content of a job spec file.
+	"""
+	return {
+		"outputDirectory": str(tmp_path / "job"),
+		"formats": ["npz"],
+		"seed": 4,
+		"numberOfWorkers": 1,
+		"parameters": {
+			"eProbe": 170e9,
+			"poissonRatioProbe": 0.22,
+			"hamakerProbe": 66e-21,
+			"kc": 0.5,
+			"radius": 25e-9,
+			"eSample": 78e9,
+			"poissonRatioSample": 0.42,
+			"hamakerSample": 90e-21,
+			"startDistance": -10e-9,
+			"stepSize": 0.2e-9,
+			"maximumPiezo": 30e-9,
+			"numberOfCurves": 3,
+			"noise": 1e-10,
+			"virtualDeflection": 3e-9,
+			"topographyOffset": 10e-9
+		},
+		"volumes": [
+			{"name": "spring", "parameters": {"kc": [0.5, 1]}},
+			{"name": "unreachable", "parameters": {"startDistance": 5e-9}}
+		]
+	}
+
+def test_create_batch_items(job_spec: Dict):
+	"""Test that every volume is expanded into its parameter grid."""
+	batchItems = batch_job.create_batch_items(job_spec)
+
+	assert [batchItem.name for batchItem in batchItems] == ["spring_0", "spring_1", "unreachable"]
+	assert [batchItem.setup["kc"] for batchItem in batchItems] == [0.5, 1, 0.5]
+	assert len({batchItem.seed for batchItem in batchItems}) == 3
+
+def test_run_batch_job_resumes_from_manifest(job_spec: Dict):
+	"""Test that a second run only repeats failed items and items whose files are missing."""
+	firstResults = batch_job.run_batch_job(job_spec)
+
+	assert [batchItemResult.status for batchItemResult in firstResults] == ["done", "done", "failed"]
+
+	removedFile = firstResults[1].outputFiles[0]
+	with np.load(removedFile) as forceVolume:
+		expectedDeflection = forceVolume["syntheticDeflection"]
+	os.remove(removedFile)
+
+	finishedItems = []
+	secondResults = batch_job.run_batch_job(job_spec, update_progress=finishedItems.append)
+
+	assert secondResults[0] == firstResults[0]
+	assert secondResults[1] != firstResults[1]
+	assert secondResults[2].status == "failed"
+	assert secondResults[2] != firstResults[2]
+	with np.load(removedFile) as forceVolume:
+		np.testing.assert_array_equal(forceVolume["syntheticDeflection"], expectedDeflection)
+
+	pathManifestFile = os.path.join(job_spec["outputDirectory"], batch_job.manifestFileName)
+	with open(pathManifestFile) as manifestFile:
+		assert len(manifestFile.readlines()) == 5
+
+	pathSummaryFile = os.path.join(job_spec["outputDirectory"], batch_job.timingSummaryFileName)
+	with open(pathSummaryFile) as summaryFile:
+		summaryRows = list(csv.DictReader(summaryFile))
+	assert [summaryRow["name"] for summaryRow in summaryRows] == ["spring_0", "spring_1", "unreachable", "total"]
+
+def test_run_batch_job_resumes_without_seed(job_spec: Dict):
+	"""Test that a job without a seed reuses the seed of its first run."""
+	del job_spec["seed"]
+
+	firstResults = batch_job.run_batch_job(job_spec)
+	os.remove(firstResults[1].outputFiles[0])
+	secondResults = batch_job.run_batch_job(job_spec)
+
+	assert secondResults[0] == firstResults[0]
+	assert secondResults[1].seed == firstResults[1].seed
+	assert secondResults[1].generationTime != firstResults[1].generationTime
+
+def test_run_batch_job_repeats_failed_item(job_spec: Dict, monkeypatch: pytest.MonkeyPatch):
+	"""Test that an item whose export failed is created again by the next run."""
+	job_spec["volumes"] = job_spec["volumes"][:1]
+	export_to_formats = batch_job.exp_data.export_to_formats
+	exportedItems = []
+
+	def export_to_formats_failing_once(forceVolume, pathOutputFile, *args):
+		itemName = os.path.basename(pathOutputFile)
+		if itemName == "spring_1" and itemName not in exportedItems:
+			exportedItems.append(itemName)
+			raise OSError("Disk is full.")
+		exportedItems.append(itemName)
+		return export_to_formats(forceVolume, pathOutputFile, *args)
+
+	monkeypatch.setattr(batch_job.exp_data, "export_to_formats", export_to_formats_failing_once)
+
+	firstResults = batch_job.run_batch_job(job_spec)
+	secondResults = batch_job.run_batch_job(job_spec)
+
+	assert [batchItemResult.status for batchItemResult in firstResults] == ["done", "failed"]
+	assert firstResults[1].outputFiles == []
+	assert [batchItemResult.status for batchItemResult in secondResults] == ["done", "done"]
+	assert secondResults[0] == firstResults[0]
+	assert os.path.exists(secondResults[1].outputFiles[0])
+	assert exportedItems == ["spring_0", "spring_1", "spring_1"]
+
+def test_read_manifest_ignores_incomplete_line(job_spec: Dict):
+	"""Test that a line written during an interruption does not break the resume."""
+	batch_job.run_batch_job(job_spec)
+
+	pathManifestFile = os.path.join(job_spec["outputDirectory"], batch_job.manifestFileName)
+	with open(pathManifestFile, "a") as manifestFile:
+		manifestFile.write("{\"name\": \"spring_0\", \"sta")
+
+	assert set(batch_job.read_manifest(pathManifestFile)) == {"spring_0", "spring_1", "unreachable"}
+
+def test_run_batch_job_independent_of_number_of_workers(job_spec: Dict, tmp_path):
+	"""Test that the exported force volumes do not depend on the number of workers."""
+	singleResults = batch_job.run_batch_job(job_spec)
+	job_spec["outputDirectory"] = str(tmp_path / "two")
+	twoResults = batch_job.run_batch_job(job_spec, numberOfWorkers=2)
+
+	for singleResult, twoResult in zip(singleResults[:2], twoResults[:2]):
+		with np.load(singleResult.outputFiles[0]) as single, np.load(twoResult.outputFiles[0]) as two:
+			np.testing.assert_array_equal(
+				single["syntheticDeflection"],
+				two["syntheticDeflection"]
+			)
+
+def test_run_batch_item_reports_export_error_and_restores_cache(job_spec: Dict, tmp_path):
+	"""Test that an error during the export fails the item and that
+	   the disk cache of the current process is restored."""
+	batchItem = batch_job.create_batch_items(job_spec)[0]
+
+	batchItemResult = batch_job.run_batch_item(
+		batchItem,
+		str(tmp_path / "missing"),
+		["npz"],
+		str(tmp_path / "cache")
+	)
+
+	assert batchItemResult.status == "failed"
+	assert batchItemResult.outputFiles == []
+	assert gen_data.idealCurveCache.diskCache is None
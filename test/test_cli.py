@@ -0,0 +1,134 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from syfos import cli
+
+setup = {
+	"eProbe": 170e9,
+	"poissonRatioProbe": 0.22,
+	"hamakerProbe": 66e-21,
+	"kc": 0.5,
+	"radius": 10e-9,
+	"eSample": 72e9,
+	"poissonRatioSample": 0.3,
+	"hamakerSample": 66e-21,
+	"startDistance": -10e-9,
+	"stepSize": 0.2e-9,
+	"maximumPiezo": 30e-9,
+	"numberOfCurves": 2,
+	"noise": 1e-10,
+	"virtualDeflection": 0,
+	"topographyOffset": 0
+}
+
+def test_generate_from_spec_file(tmp_path):
+	"""Test that the parameters of the spec file can be overwritten with --set."""
+	pathSpecFile = tmp_path / "spec.json"
+	pathSpecFile.write_text(json.dumps({"parameters": setup, "seed": 1}))
+	pathOutputFile = str(tmp_path / "output" / "volume")
+
+	exitCode = cli.main(
+		[
+			"generate", 
+			"--spec", str(pathSpecFile), 
+			"--set", "numberOfCurves=5", 
+			"--output", pathOutputFile
+		]
+	)
+
+	assert exitCode == 0
+	assert np.load(pathOutputFile + ".npz")["syntheticDeflection"].shape[0] == 5
+
+def test_generate_missing_parameters(tmp_path, capsys):
+	"""Test that missing parameters are reported without a traceback."""
+	exitCode = cli.main(
+		["generate", "--set", "kc=0.5", "--output", str(tmp_path / "volume")]
+	)
+
+	assert exitCode == 2
+	assert "Missing parameters" in capsys.readouterr().err
+
+def test_generate_does_not_import_gui_modules(tmp_path):
+	"""Test that the command line interface runs without tkinter and matplotlib."""
+	pathOutputFile = str(tmp_path / "volume")
+	assignments = [
+		"--set=" + name + "=" + str(value)
+		for name, value in setup.items()
+	]
+	code = (
+		"import sys\n"
+		"from syfos import cli\n"
+		"exitCode = cli.main(sys.argv[1:])\n"
+		"loadedModules = {'tkinter', 'matplotlib', 'ttkbootstrap'} & set(sys.modules)\n"
+		"assert exitCode == 0 and not loadedModules, loadedModules\n"
+	)
+
+	completedProcess = subprocess.run(
+		[sys.executable, "-c", code, "generate", "--output", pathOutputFile] + assignments,
+		cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+		capture_output=True,
+		text=True
+	)
+
+	assert completedProcess.returncode == 0, completedProcess.stderr
+	assert os.path.exists(pathOutputFile + ".npz")
+
+def test_import_does_not_load_heavy_modules():
+	"""Test that pandas and numba are only imported when they are used."""
+	code = (
+		"import sys\n"
+		"import syfos.cli\n"
+		"loadedModules = {'pandas', 'numba'} & set(sys.modules)\n"
+		"assert not loadedModules, loadedModules\n"
+	)
+
+	completedProcess = subprocess.run(
+		[sys.executable, "-c", code],
+		cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+		capture_output=True,
+		text=True
+	)
+
+	assert completedProcess.returncode == 0, completedProcess.stderr
+
+def test_batch_job(tmp_path, capsys):
+	"""Test that the batch command runs every volume of a job spec file."""
+	pathSpecFile = tmp_path / "job.json"
+	pathSpecFile.write_text(
+		json.dumps(
+			{
+				"outputDirectory": str(tmp_path / "job"),
+				"parameters": setup,
+				"volumes": [{"name": "soft"}, {"name": "stiff", "parameters": {"kc": 1}}]
+			}
+		)
+	)
+
+	exitCode = cli.main(["batch", str(pathSpecFile), "--workers", "1"])
+
+	assert exitCode == 0
+	assert "2 of 2 volumes done" in capsys.readouterr().err
+	assert os.path.exists(str(tmp_path / "job" / "stiff.npz"))
+
+def test_load_spec_toml_without_tomllib(tmp_path, monkeypatch):
+	"""Test that TOML spec files fall back to tomli and report 
+	   a missing TOML reader as a ValueError."""
+	tomllib = pytest.importorskip("tomllib")
+
+	pathSpecFile = tmp_path / "spec.toml"
+	pathSpecFile.write_text("seed = 1\n\n[parameters]\nkc = 0.5\n")
+
+	monkeypatch.setitem(sys.modules, "tomllib", None)
+	monkeypatch.setitem(sys.modules, "tomli", tomllib)
+
+	assert cli.load_spec(str(pathSpecFile)) == {"seed": 1, "parameters": {"kc": 0.5}}
+
+	monkeypatch.setitem(sys.modules, "tomli", None)
+
+	with pytest.raises(ValueError, match="tomli"):
+		cli.load_spec(str(pathSpecFile))
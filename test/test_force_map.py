@@ -0,0 +1,100 @@
+from typing import NamedTuple
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.force_map as force_map
+import syfos.data_handling.generate_data as gen_data
+
+def test_create_topography_shapes():
+	"""Test the shape and values of the procedural topographies."""
+	shape = (8, 5)
+
+	plane = force_map.create_topography_plane(shape, 1e-9)
+	tilt = force_map.create_topography_tilt(shape, 1e-9, 2e-9)
+	steps = force_map.create_topography_steps(shape, 3e-9, 3)
+	roughness = force_map.create_topography_roughness(shape, 2e-9, seed=1)
+
+	assert all(
+		topography.shape == shape
+		for topography in (plane, tilt, steps, roughness)
+	)
+	assert np.all(plane == 1e-9)
+	assert np.isclose(tilt[7, 4], 7e-9 + 8e-9)
+	np.testing.assert_allclose(np.unique(steps), [0, 3e-9, 6e-9, 9e-9])
+	assert np.isclose(np.sqrt(np.mean(roughness**2)), 2e-9)
+	np.testing.assert_array_equal(
+		roughness, 
+		force_map.create_topography_roughness(shape, 2e-9, seed=1)
+	)
+
+def test_create_synthetic_force_map_phases_and_topography(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that every pixel is the ideal curve of its phase shifted by its height."""
+	stepSize = parameterMeasurement.stepSize
+	topography = force_map.create_topography_tilt((3, 4), stepSize, -2 * stepSize)
+	phaseMask = np.zeros((3, 4), dtype=int)
+	phaseMask[:, 2:] = 1
+	parameterMaterials = [
+		parameterMaterial,
+		parameterMaterial._replace(Etot=0.5 * parameterMaterial.Etot)
+	]
+
+	forceMap = force_map.create_synthetic_force_map(
+		parameterMaterials,
+		parameterMeasurement,
+		parameterForceVolume._replace(noise=0),
+		topography,
+		phaseMask
+	)
+
+	assert forceMap.shape == (3, 4)
+	assert forceMap.numberOfCurves == 12
+	assert forceMap.get_deflection_map().base is not None
+
+	tipSampleDistance = gen_data.calculate_ground_truth_tip_sample_distance(forceMap)
+
+	for x in range(3):
+		for y in range(4):
+			_, idealDeflection = gen_data.create_ideal_curve(
+				parameterMaterials[phaseMask[x, y]],
+				parameterMeasurement._replace(maximumPiezo=parameterMeasurement.maximumPiezo + 10e-9)
+			)
+			shiftIndex = int(np.rint(topography[x, y] / stepSize))
+			expectedDeflection = idealDeflection[
+				np.maximum(np.arange(len(forceMap.shiftedPiezo)) - shiftIndex, 0)
+			] + parameterForceVolume.virtualDeflection
+
+			np.testing.assert_allclose(
+				forceMap.get_pixel(x, y)[1], expectedDeflection, rtol=1e-12, atol=1e-24
+			)
+			assert forceMap.groundTruth.indexPointOfContact.reshape(3, 4)[x, y] == (
+				np.argmax(forceMap.idealPiezo >= 0) + shiftIndex
+			)
+			np.testing.assert_allclose(
+				tipSampleDistance.reshape(3, 4, -1)[x, y],
+				gen_data.calculate_piezo_value(
+					parameterMeasurement.startDistance,
+					stepSize,
+					np.arange(len(forceMap.shiftedPiezo)) - shiftIndex
+				) - (expectedDeflection - parameterForceVolume.virtualDeflection),
+				rtol=0, atol=1e-20
+			)
+
+def test_create_synthetic_force_map_unknown_phase(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that a phase mask with an unknown phase raises an error."""
+	with pytest.raises(ValueError):
+		force_map.create_synthetic_force_map(
+			[parameterMaterial],
+			parameterMeasurement,
+			parameterForceVolume,
+			np.zeros((2, 2)),
+			np.ones((2, 2), dtype=int)
+		)
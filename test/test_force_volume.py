@@ -0,0 +1,259 @@
+from typing import NamedTuple
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.generate_data as gen_data
+import syfos.data_handling.export_data as export_data
+
+def test_force_volume_list_layout(
+	syntheticForcevolume
+):
+	"""Test that the force volume can be used like the former list layout."""
+	forceVolume = syntheticForcevolume
+	forceVolumeAsList = forceVolume.as_list()
+
+	assert len(forceVolume) == forceVolume.numberOfCurves + 2
+	assert len(forceVolumeAsList) == len(forceVolume)
+	np.testing.assert_array_equal(forceVolume[0][1], forceVolume.idealDeflection)
+	np.testing.assert_array_equal(forceVolume[1][0], forceVolume.shiftedPiezo)
+	np.testing.assert_array_equal(forceVolume[-1][1], forceVolume.syntheticDeflection[-1])
+
+	for curve, curveFromList in zip(forceVolume, forceVolumeAsList):
+		np.testing.assert_array_equal(curve[0], curveFromList[0])
+		np.testing.assert_array_equal(curve[1], curveFromList[1])
+
+def test_force_volume_shares_piezo_values(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that all synthetic curves share the shifted piezo values."""
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume._replace(numberOfCurves=5),
+		seed=3
+	)
+
+	assert forceVolume.syntheticDeflection.shape == (5, len(forceVolume.shiftedPiezo))
+	assert all(
+		curve[0] is forceVolume.shiftedPiezo
+		for curve in forceVolume[1:]
+	)
+
+def test_force_volume_stack_columns(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that stack_columns matches stacking the curves of the list layout."""
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume._replace(numberOfCurves=4),
+		seed=3
+	)
+	expectedColumns = np.column_stack(
+		[
+			np.column_stack((curve[0], curve[1]))
+			for curve in forceVolume.as_list()
+		]
+	)
+
+	np.testing.assert_array_equal(forceVolume.stack_columns(), expectedColumns)
+
+	dataFrameForceVolume = export_data.create_data_frame_force_volume(forceVolume)
+
+	assert dataFrameForceVolume.shape == expectedColumns.shape
+	assert dataFrameForceVolume.columns[-1] == "curve_4_y_values"
+
+def test_lazy_force_volume_independent_of_access_order(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that a lazy force volume returns the same curves 
+	   regardless of the order in which they are accessed."""
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume._replace(numberOfCurves=1000),
+		seed=11,
+		lazy=True
+	)
+	sameForceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume._replace(numberOfCurves=1000),
+		seed=11,
+		lazy=True
+	)
+
+	lastCurveFirst = sameForceVolume.get_synthetic_deflection(999)
+	selectedCurves = forceVolume.get_synthetic_deflection([999, 5, -1])
+
+	assert forceVolume.numberOfCurves == 1000
+	np.testing.assert_array_equal(selectedCurves[0], lastCurveFirst)
+	np.testing.assert_array_equal(selectedCurves[2], lastCurveFirst)
+	np.testing.assert_array_equal(
+		forceVolume.get_synthetic_deflection(slice(3, 6))[2],
+		forceVolume[7][1]
+	)
+
+@pytest.mark.parametrize("storagePrecision", ["float64", "float32"])
+def test_lazy_force_volume_matches_force_volume(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple,
+	storagePrecision: str
+):
+	"""Test that a lazy force volume draws the same curves as 
+	   a force volume with the same seed."""
+	lazyForceVolume, forceVolume = (
+		gen_data.create_synthetic_force_volume(
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume._replace(numberOfCurves=600),
+			seed=11,
+			lazy=lazy,
+			storagePrecision=storagePrecision
+		)
+		for lazy in (True, False)
+	)
+
+	np.testing.assert_array_equal(lazyForceVolume.syntheticDeflection, forceVolume.syntheticDeflection)
+	np.testing.assert_array_equal(
+		lazyForceVolume.get_synthetic_deflection([599, 3, 300]),
+		forceVolume.syntheticDeflection[[599, 3, 300]]
+	)
+
+def test_lazy_force_volume_iteration_draws_every_curve_once(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple,
+	monkeypatch: pytest.MonkeyPatch
+):
+	"""Test that iterating a lazy force volume draws the noise of every curve
+	   only once, so the cost of the iteration grows linearly."""
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume._replace(numberOfCurves=2 * gen_data.noiseBlockSize + 10),
+		seed=11,
+		lazy=True
+	)
+	drawnCurves = []
+	create_noise_generator = gen_data.create_noise_generator
+
+	def create_counted_noise_generator(seed, curveIndex):
+		drawnCurves.append(curveIndex)
+		return create_noise_generator(seed, curveIndex)
+
+	monkeypatch.setattr(gen_data, "create_noise_generator", create_counted_noise_generator)
+
+	curves = list(forceVolume)
+
+	assert len(curves) == forceVolume.numberOfCurves + 2
+	assert drawnCurves == list(range(forceVolume.numberOfCurves))
+
+def test_lazy_force_volume_noise_level(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that the lazy synthetic curves scatter around the shifted ideal curve."""
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume._replace(numberOfCurves=50),
+		lazy=True
+	)
+
+	residuals = forceVolume.syntheticDeflection - forceVolume.shiftedDeflection
+
+	assert forceVolume.seed is not None
+	assert np.isclose(np.std(residuals), parameterForceVolume.noise, rtol=0.05)
+	assert forceVolume.stack_columns().shape == (len(forceVolume.shiftedPiezo), 2 * 52)
+
+def test_export_to_formats_ground_truth(
+	syntheticForcevolume,
+	tmp_path
+):
+	"""Test that the ground truth is exported to the npz file and next to the csv file."""
+	pathOutputFile = str(tmp_path / "volume")
+
+	outputFiles = export_data.export_to_formats(
+		syntheticForcevolume,
+		pathOutputFile,
+		["npz", "csv"],
+		lambda **kwargs: None
+	)
+
+	assert outputFiles == [
+		pathOutputFile + ".npz", 
+		pathOutputFile + ".csv", 
+		pathOutputFile + export_data.groundTruthFileSuffix + ".csv"
+	]
+	with np.load(pathOutputFile + ".npz") as forceVolume:
+		np.testing.assert_array_equal(
+			forceVolume["groundTruthIndexPointOfContact"],
+			syntheticForcevolume.groundTruth.indexPointOfContact
+		)
+		np.testing.assert_array_equal(
+			forceVolume["groundTruthShiftIndex"],
+			syntheticForcevolume.groundTruth.shiftIndex
+		)
+
+	groundTruthRows = np.loadtxt(
+		pathOutputFile + export_data.groundTruthFileSuffix + ".csv",
+		delimiter=",",
+		skiprows=1,
+		ndmin=2
+	)
+	np.testing.assert_array_equal(
+		groundTruthRows[:, 2],
+		syntheticForcevolume.groundTruth.indexPointOfContact
+	)
+
+def test_export_to_npz_ground_truth_tip_sample_distance(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple,
+	tmp_path
+):
+	"""Test that the true tip-sample distance of every point can be read back 
+	   from the npz file and agrees with the piezo values before the shift."""
+	parameterForceVolume = parameterForceVolume._replace(
+		numberOfCurves=5,
+		noise=0,
+		topographyOffsetSpread=5 * parameterMeasurement.stepSize
+	)
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed=3
+	)
+	pathOutputFile = str(tmp_path / "volume.npz")
+
+	export_data.export_to_npz(forceVolume, pathOutputFile)
+
+	with np.load(pathOutputFile) as exportedForceVolume:
+		tipSampleDistance = exportedForceVolume["groundTruthTipSampleDistance"]
+		piezo = gen_data.calculate_piezo_value(
+			exportedForceVolume["startDistance"],
+			exportedForceVolume["stepSize"],
+			np.arange(tipSampleDistance.shape[1]) 
+			- exportedForceVolume["groundTruthShiftIndex"][:, np.newaxis]
+		)
+		deflection = (
+			exportedForceVolume["syntheticDeflection"] 
+			- exportedForceVolume["curveVirtualDeflection"][:, np.newaxis]
+		)
+
+	np.testing.assert_array_equal(
+		tipSampleDistance,
+		gen_data.calculate_ground_truth_tip_sample_distance(forceVolume)
+	)
+	np.testing.assert_allclose(tipSampleDistance, piezo - deflection, rtol=0, atol=1e-20)
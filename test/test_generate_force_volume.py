@@ -0,0 +1,425 @@
+from typing import NamedTuple
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.generate_data as gen_data
+
+def test_multiply_and_apply_noise_to_deflection_shape(
+	parameterForceVolume: NamedTuple
+):
+	"""Test that the noise of all curves is returned as one matrix."""
+	shiftedDeflection = np.linspace(0, 1e-9, 25)
+	parameterForceVolume = parameterForceVolume._replace(numberOfCurves=7)
+
+	syntheticDeflectionValues = gen_data.multiply_and_apply_noise_to_deflection(
+		shiftedDeflection,
+		parameterForceVolume,
+		seed=1
+	)
+
+	assert syntheticDeflectionValues.shape == (7, 25)
+	assert syntheticDeflectionValues.flags["C_CONTIGUOUS"]
+
+def test_multiply_and_apply_noise_to_deflection_reproducible(
+	parameterForceVolume: NamedTuple
+):
+	"""Test that the same seed creates the same synthetic deflection values."""
+	shiftedDeflection = np.linspace(0, 1e-9, 25)
+	parameterForceVolume = parameterForceVolume._replace(numberOfCurves=3)
+
+	firstResult = gen_data.multiply_and_apply_noise_to_deflection(
+		shiftedDeflection, parameterForceVolume, seed=42
+	)
+	secondResult = gen_data.multiply_and_apply_noise_to_deflection(
+		shiftedDeflection, parameterForceVolume, seed=42
+	)
+	noiseSeedSequence, _ = np.random.SeedSequence(42).spawn(2)
+	expectedResult = shiftedDeflection + np.array([
+		np.random.default_rng(curveSeedSequence).normal(0, parameterForceVolume.noise, size=25)
+		for curveSeedSequence in noiseSeedSequence.spawn(3)
+	])
+
+	np.testing.assert_array_equal(firstResult, secondResult)
+	np.testing.assert_allclose(firstResult, expectedResult, rtol=0, atol=1e-24)
+
+def test_multiply_and_apply_noise_to_deflection_negative_noise(
+	parameterForceVolume: NamedTuple
+):
+	"""Test that a negative noise value raises an error."""
+	parameterForceVolume = parameterForceVolume._replace(noise=-1e-10)
+
+	with pytest.raises(ValueError):
+		gen_data.multiply_and_apply_noise_to_deflection(
+			np.zeros(5), 
+			parameterForceVolume
+		)
+
+@pytest.mark.parametrize("numberOfWorkers", [4, 32])
+def test_create_synthetic_force_volume_independent_of_number_of_workers(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple,
+	numberOfWorkers: int
+):
+	"""Test that the noise blocks drawn by several threads are byte identical."""
+	parameterForceVolume = parameterForceVolume._replace(
+		numberOfCurves=3 * gen_data.noiseBlockSize + 5
+	)
+
+	singleWorkerForceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, parameterForceVolume, seed=7
+	)
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, parameterForceVolume, seed=7,
+		numberOfWorkers=numberOfWorkers
+	)
+
+	assert forceVolume.syntheticDeflection.tobytes() == singleWorkerForceVolume.syntheticDeflection.tobytes()
+
+def test_create_synthetic_force_volume_records_drawn_seed(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that a force volume without seed can be reproduced from its recorded seed."""
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, parameterForceVolume
+	)
+	reproducedForceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, parameterForceVolume, seed=forceVolume.seed
+	)
+
+	np.testing.assert_array_equal(
+		forceVolume.syntheticDeflection,
+		reproducedForceVolume.syntheticDeflection
+	)
+
+@pytest.mark.parametrize("chunkSize", [1, 3, 7, 20, 300])
+def test_iter_synthetic_force_volume_matches_force_volume(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple,
+	chunkSize: int
+):
+	"""Test that the chunks of iter_synthetic_force_volume 
+	   combine to the synthetic curves of the same force volume."""
+	parameterForceVolume = parameterForceVolume._replace(numberOfCurves=2 * gen_data.noiseBlockSize + 10)
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed=5
+	)
+
+	chunks = list(
+		gen_data.iter_synthetic_force_volume(
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume,
+			chunkSize,
+			seed=5
+		)
+	)
+
+	assert all(len(chunk) <= chunkSize for _, chunk in chunks)
+	np.testing.assert_array_equal(chunks[0][0], forceVolume.shiftedPiezo)
+	np.testing.assert_array_equal(
+		np.concatenate([chunk for _, chunk in chunks]),
+		forceVolume.syntheticDeflection
+	)
+
+def test_create_synthetic_force_volume_topography_offset_spread(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that every curve is the shifted ideal curve moved by 
+	   its topography offset rounded to the step size."""
+	parameterForceVolume = parameterForceVolume._replace(
+		numberOfCurves=20,
+		noise=0,
+		topographyOffsetSpread=5 * parameterMeasurement.stepSize
+	)
+
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed=3
+	)
+	extendedPiezo, extendedDeflection = gen_data.create_ideal_curve(
+		parameterMaterial,
+		parameterMeasurement._replace(maximumPiezo=parameterMeasurement.maximumPiezo + 50e-9)
+	)
+	shiftIndices = np.rint(
+		(forceVolume.curveParameters.topographyOffset - parameterForceVolume.topographyOffset)
+		/ parameterMeasurement.stepSize
+	).astype(int)
+
+	assert np.any(shiftIndices < 0) and np.any(shiftIndices > 0)
+	for syntheticDeflection, shiftIndex in zip(forceVolume.syntheticDeflection, shiftIndices):
+		expectedDeflection = extendedDeflection[
+			np.maximum(np.arange(len(forceVolume.shiftedPiezo)) - shiftIndex, 0)
+		] + parameterForceVolume.virtualDeflection
+		np.testing.assert_array_equal(syntheticDeflection, expectedDeflection)
+
+def test_create_synthetic_force_volume_material_spread(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that every curve follows the ideal curve of its spring constant and tip radius."""
+	parameterForceVolume = parameterForceVolume._replace(
+		numberOfCurves=4,
+		noise=0,
+		virtualDeflectionSpread=1e-10,
+		kcSpread=0.1 * parameterMaterial.kc,
+		radiusSpread=0.1 * parameterMaterial.radius
+	)
+
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed=5
+	)
+	curveParameters = forceVolume.curveParameters
+
+	assert len(np.unique(curveParameters.kc)) == 4
+	for index, syntheticDeflection in enumerate(forceVolume.syntheticDeflection):
+		_, idealDeflection = gen_data.create_ideal_curve(
+			parameterMaterial._replace(
+				kc=curveParameters.kc[index],
+				radius=curveParameters.radius[index],
+				jtc=gen_data.calculate_jtc(
+					parameterMaterial.Hamaker,
+					curveParameters.radius[index],
+					curveParameters.kc[index]
+				)
+			),
+			parameterMeasurement
+		)
+		np.testing.assert_allclose(
+			syntheticDeflection,
+			idealDeflection[:len(syntheticDeflection)] + curveParameters.virtualDeflection[index],
+			rtol=1e-12, atol=1e-24
+		)
+
+def test_create_synthetic_force_volume_ground_truth(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that the curves without jitter are not shifted and that the 
+	   ground truth matches the parts of the ideal curve."""
+	parameterForceVolume = parameterForceVolume._replace(numberOfCurves=3)
+
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed=1
+	)
+	lazyForceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed=1,
+		lazy=True
+	)
+	piezoApproach, _ = gen_data.create_ideal_curve_approach_part(
+		parameterMaterial,
+		parameterMeasurement
+	)
+	groundTruth = forceVolume.groundTruth
+
+	np.testing.assert_array_equal(groundTruth.indexJumpToContact, [len(piezoApproach) - 1] * 3)
+	np.testing.assert_array_equal(
+		groundTruth.indexPointOfContact, 
+		[np.argmax(forceVolume.idealPiezo >= 0)] * 3
+	)
+	np.testing.assert_array_equal(groundTruth.shiftIndex, [0] * 3)
+	tipSampleDistance = gen_data.calculate_ground_truth_tip_sample_distance(forceVolume)
+	assert tipSampleDistance.shape == forceVolume.syntheticDeflection.shape
+	np.testing.assert_allclose(
+		tipSampleDistance,
+		np.broadcast_to(
+			(forceVolume.shiftedPiezo - parameterForceVolume.topographyOffset)
+			- (forceVolume.shiftedDeflection - parameterForceVolume.virtualDeflection),
+			tipSampleDistance.shape
+		),
+		rtol=0, atol=1e-20
+	)
+	for values, lazyValues in zip(groundTruth, lazyForceVolume.groundTruth):
+		np.testing.assert_array_equal(values, lazyValues)
+
+@pytest.mark.parametrize(
+	"startDistance, stepSize",
+	[(-1e-9, 0.9e-9), (None, 0.2e-9)]
+)
+def test_locate_ideal_curve_events_jump_at_positive_piezo(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	startDistance: float,
+	stepSize: float
+):
+	"""Test that the jump to contact and the point of contact are located
+	   from the approach part if the jump occurs at or after the piezo value zero."""
+	if startDistance is None:
+		startDistance = 0.5 * np.abs(parameterMaterial.jtc)
+	parameterMeasurement = parameterMeasurement._replace(
+		startDistance=startDistance,
+		stepSize=stepSize
+	)
+
+	piezo, deflection = gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement)
+	piezoApproach, _ = gen_data.create_ideal_curve_approach_part(
+		parameterMaterial,
+		parameterMeasurement
+	)
+
+	indexJumpToContact, indexPointOfContact = gen_data.locate_ideal_curve_events(
+		deflection,
+		parameterMeasurement
+	)
+
+	assert piezo[len(piezoApproach) - 1] >= 0 or piezo[len(piezoApproach)] >= 0
+	assert indexJumpToContact == len(piezoApproach) - 1
+	assert indexPointOfContact == len(piezoApproach)
+	assert deflection[indexPointOfContact] == piezo[indexPointOfContact] >= 0
+
+def test_create_synthetic_force_volume_ground_truth_spread(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that the ground truth of every curve follows its ideal curve 
+	   and its topography offset rounded to the step size."""
+	parameterForceVolume = parameterForceVolume._replace(
+		numberOfCurves=6,
+		noise=0,
+		topographyOffsetSpread=5 * parameterMeasurement.stepSize,
+		virtualDeflectionSpread=1e-10,
+		kcSpread=0.1 * parameterMaterial.kc
+	)
+
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial,
+		parameterMeasurement,
+		parameterForceVolume,
+		seed=3
+	)
+	curveParameters = forceVolume.curveParameters
+	groundTruth = forceVolume.groundTruth
+	shiftIndices = np.rint(
+		(curveParameters.topographyOffset - parameterForceVolume.topographyOffset)
+		/ parameterMeasurement.stepSize
+	).astype(int)
+
+	np.testing.assert_array_equal(groundTruth.shiftIndex, shiftIndices)
+	tipSampleDistance = gen_data.calculate_ground_truth_tip_sample_distance(forceVolume)
+	assert tipSampleDistance.shape == forceVolume.syntheticDeflection.shape
+	np.testing.assert_array_equal(
+		gen_data.calculate_ground_truth_tip_sample_distance(forceVolume, 2),
+		tipSampleDistance[2]
+	)
+	for index in range(parameterForceVolume.numberOfCurves):
+		parameterMaterialCurve = parameterMaterial._replace(
+			kc=curveParameters.kc[index],
+			jtc=gen_data.calculate_jtc(
+				parameterMaterial.Hamaker,
+				parameterMaterial.radius,
+				curveParameters.kc[index]
+			)
+		)
+		piezoApproach, _ = gen_data.create_ideal_curve_approach_part(
+			parameterMaterialCurve,
+			parameterMeasurement
+		)
+		piezo = gen_data.calculate_piezo_value(
+			parameterMeasurement.startDistance,
+			parameterMeasurement.stepSize,
+			np.arange(len(forceVolume.shiftedPiezo)) - shiftIndices[index]
+		)
+
+		assert groundTruth.indexJumpToContact[index] == len(piezoApproach) - 1 + shiftIndices[index]
+		assert piezo[groundTruth.indexPointOfContact[index] - 1] < 0 <= piezo[groundTruth.indexPointOfContact[index]]
+		np.testing.assert_allclose(
+			tipSampleDistance[index],
+			piezo - (forceVolume.syntheticDeflection[index] - curveParameters.virtualDeflection[index]),
+			rtol=0, atol=1e-20
+		)
+
+def test_create_synthetic_force_volume_spread_not_supported_by_lazy_force_volume(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that per curve jitter raises an error for a lazy force volume."""
+	with pytest.raises(ValueError):
+		gen_data.create_synthetic_force_volume(
+			parameterMaterial,
+			parameterMeasurement,
+			parameterForceVolume._replace(kcSpread=0.01),
+			lazy=True
+		)
+
+def test_create_synthetic_force_volume_float32_storage(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that float32 storage halves the memory, only rounds the values of 
+	   the same seed and reports the error of the stored synthetic curves."""
+	parameterForceVolume = parameterForceVolume._replace(numberOfCurves=5)
+
+	referenceForceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, parameterForceVolume, seed=0
+	)
+	forceVolume = gen_data.create_synthetic_force_volume(
+		parameterMaterial, parameterMeasurement, parameterForceVolume, seed=0,
+		storagePrecision="float32"
+	)
+
+	assert forceVolume.syntheticDeflection.dtype == np.float32
+	assert forceVolume.shiftedDeflection.dtype == np.float32
+	assert forceVolume.syntheticDeflection.nbytes * 2 == referenceForceVolume.syntheticDeflection.nbytes
+	assert referenceForceVolume.storageError == (0, 0)
+	assert 0 < forceVolume.storageError.maximumRelativeError <= 2**-24
+	np.testing.assert_array_equal(
+		forceVolume.syntheticDeflection,
+		referenceForceVolume.syntheticDeflection.astype(np.float32)
+	)
+	assert forceVolume.storageError == gen_data.measure_storage_error(
+		referenceForceVolume.syntheticDeflection,
+		np.float32
+	)
+
+def test_create_ideal_curve_extended_precision(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that the extended precision agrees with the float64 precision."""
+	piezo, deflection = gen_data.create_ideal_curve(
+		parameterMaterial, parameterMeasurement
+	)
+	piezoExtended, deflectionExtended = gen_data.create_ideal_curve(
+		parameterMaterial, parameterMeasurement, computePrecision="extended"
+	)
+
+	assert deflectionExtended.dtype == np.longdouble
+	np.testing.assert_array_equal(piezoExtended, piezo)
+	np.testing.assert_allclose(deflectionExtended.astype(np.float64), deflection, rtol=1e-12)
+
+def test_create_synthetic_force_volume_unknown_precision(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple,
+	parameterForceVolume: NamedTuple
+):
+	"""Test that an unknown precision raises an error."""
+	with pytest.raises(ValueError):
+		gen_data.create_synthetic_force_volume(
+			parameterMaterial, parameterMeasurement, parameterForceVolume,
+			storagePrecision="float16"
+		)
@@ -2,6 +2,7 @@ import pytest
 import numpy as np
 
 import syfos.data_handling.generate_data as gen_data
+import syfos.data_handling.recurrence_backends as recurrence_backends
 
 def test_calculate_piezo_simple_values():
 	"""Test calculate_piezo_value with simple values."""
@@ -240,4 +241,417 @@ def test_create_ideal_curve_contact_part_critical_values(
 		currentPiezoValue
 	)
 	
-	assert np.isclose(result, expectedResult)
\ No newline at end of file
+	assert np.isclose(result, expectedResult)
+
+@pytest.mark.parametrize(
+    "parameterSubstitut, currentPiezoValue, expectedResult",
+    [
+    	(7.6731e-05, 1e-11, 3.88352e-13), 
+    	(7.6731e-05, 3e-11, 1.93741e-12),
+    	(7.6731e-05, 6e-11, 5.2759e-12),
+    	(5.31028994150e-8, 1.99e-9, 1.9901664e-09)
+    ],
+)
+def test_calculate_deflection_contact_part_vectorized_critical_values(
+	parameterSubstitut: float,
+	currentPiezoValue: float,
+	expectedResult: float
+):
+	"""Test calculate_deflection_contact_part_vectorized with ciritcal values."""
+	result = gen_data.calculate_deflection_contact_part_vectorized(
+		parameterSubstitut,
+		np.array([currentPiezoValue])
+	)
+	
+	assert np.isclose(result[0], expectedResult)
+
+def test_calculate_deflection_contact_part_vectorized_soft_contact():
+	"""Test that calculate_deflection_contact_part_vectorized fulfills
+	   the Hertz equation for a very soft contact."""
+	parameterSubstitut = 3.16227766
+	piezoValues = np.linspace(1e-11, 30e-9, 50)
+
+	deflection = gen_data.calculate_deflection_contact_part_vectorized(
+		parameterSubstitut,
+		piezoValues
+	)
+
+	np.testing.assert_allclose(
+		(piezoValues - deflection)**(3/2),
+		parameterSubstitut * deflection,
+		rtol=1e-10
+	)
+
+def test_create_ideal_curve_contact_part_matches_scalar_path():
+	"""Compare create_ideal_curve_contact_part with the point by point implementation."""
+	ParameterMaterial, ParameterMeasurement, _ = gen_data.get_parameter_tuples()
+	parameterMaterial = ParameterMaterial(
+		kc=1,
+		radius=25e-9,
+		Etot=82525504488.49124,
+		Hamaker=7.70714e-20,
+		jtc=-8.6e-10
+	)
+	parameterMeasurement = ParameterMeasurement(
+		startDistance=-10e-9,
+		stepSize=0.01e-9,
+		maximumPiezo=30e-9
+	)
+
+	piezo, deflection = gen_data.create_ideal_curve_contact_part(
+		parameterMaterial,
+		parameterMeasurement,
+		1001
+	)
+	piezoScalar, deflectionScalar = gen_data.create_ideal_curve_contact_part_scalar(
+		parameterMaterial,
+		parameterMeasurement,
+		1001
+	)
+
+	np.testing.assert_array_equal(piezo, piezoScalar)
+	np.testing.assert_allclose(deflection, deflectionScalar, rtol=1e-6, atol=1e-18)
+
+@pytest.mark.parametrize(
+    "startDistance, stepSize, piezoValue, minimumIndex",
+    [
+    	(-10e-9, 0.01e-9, 30e-9, 0), 
+    	(-10e-9, 0.01e-9, 0, 0),
+    	(-10e-9, 0.2e-9, 0, 80),
+    	(-10e-9, 0.3e-9, 1e-9, 0),
+    ],
+)
+def test_calculate_index_piezo_value(
+	startDistance: float,
+	stepSize: float,
+	piezoValue: float,
+	minimumIndex: int
+):
+	"""Test calculate_index_piezo_value against a point by point search."""
+	expectedIndex = minimumIndex
+	while gen_data.calculate_piezo_value(startDistance, stepSize, expectedIndex) < piezoValue:
+		expectedIndex += 1
+
+	index = gen_data.calculate_index_piezo_value(
+		startDistance,
+		stepSize,
+		piezoValue,
+		minimumIndex
+	)
+
+	assert index == expectedIndex
+
+@pytest.mark.parametrize(
+    "startDistance, stepSize, maximumPiezo, lengthApproach",
+    [
+    	(-10e-9, 0.01e-9, 30e-9, 850), 
+    	(-10e-9, 0.2e-9, 30e-9, 45),
+    	(-10e-9, 0.3e-9, 30e-9, 40),
+    	(-10e-9, 0.2e-9, 30e-9, 60),
+    ],
+)
+def test_create_ideal_curve_attraction_part(
+	startDistance: float,
+	stepSize: float,
+	maximumPiezo: float,
+	lengthApproach: int
+):
+	"""Test create_ideal_curve_attraction_part against a point by point calculation."""
+	_, ParameterMeasurement, _ = gen_data.get_parameter_tuples()
+	parameterMeasurement = ParameterMeasurement(
+		startDistance=startDistance,
+		stepSize=stepSize,
+		maximumPiezo=maximumPiezo
+	)
+
+	expectedPiezo = [gen_data.calculate_piezo_value(startDistance, stepSize, lengthApproach)]
+	while expectedPiezo[-1] < 0:
+		expectedPiezo.append(
+			gen_data.calculate_piezo_value(startDistance, stepSize, lengthApproach + len(expectedPiezo))
+		)
+
+	piezo, deflection = gen_data.create_ideal_curve_attraction_part(
+		parameterMeasurement,
+		lengthApproach
+	)
+
+	np.testing.assert_array_equal(piezo, expectedPiezo)
+	np.testing.assert_array_equal(deflection, expectedPiezo)
+
+def test_create_ideal_curve_attraction_part_maximum_piezo_reached():
+	"""Test that create_ideal_curve_attraction_part raises an error 
+	   if the maximum piezo is reached before the point of contact."""
+	_, ParameterMeasurement, _ = gen_data.get_parameter_tuples()
+	parameterMeasurement = ParameterMeasurement(
+		startDistance=-10e-9,
+		stepSize=0.2e-9,
+		maximumPiezo=-5e-9
+	)
+
+	with pytest.raises(ValueError):
+		gen_data.create_ideal_curve_attraction_part(
+			parameterMeasurement,
+			40
+		)
+
+@pytest.mark.parametrize("backendName", ["python", "numba"])
+@pytest.mark.parametrize(
+    "kc, radius, hamaker, stepSize",
+    [
+    	(1, 25e-9, 7.70714e-20, 0.01e-9), 
+    	(1, 25e-9, 7.70714e-20, 0.2e-9),
+    	(40, 25e-9, 1e-19, 0.05e-9),
+    	(0.01, 1e-8, 4e-19, 0.1e-9),
+    	(1, 25e-9, 7.70714e-20, 2e-9),
+    ],
+)
+def test_create_ideal_curve_approach_part_matches_scalar_path(
+	backendName: str,
+	kc: float,
+	radius: float,
+	hamaker: float,
+	stepSize: float
+):
+	"""Test that every recurrence backend reproduces the point by point implementation."""
+	if backendName == "numba" and not recurrence_backends.numbaAvailable:
+		pytest.skip("Backend " + backendName + " is not available.")
+
+	ParameterMaterial, ParameterMeasurement, _ = gen_data.get_parameter_tuples()
+	parameterMaterial = ParameterMaterial(
+		kc=kc,
+		radius=radius,
+		Etot=82525504488.49124,
+		Hamaker=hamaker,
+		jtc=gen_data.calculate_jtc(hamaker, radius, kc)
+	)
+	parameterMeasurement = ParameterMeasurement(
+		startDistance=-10e-9,
+		stepSize=stepSize,
+		maximumPiezo=30e-9
+	)
+
+	piezo, deflection = gen_data.create_ideal_curve_approach_part(
+		parameterMaterial,
+		parameterMeasurement,
+		backendName
+	)
+	piezoScalar, deflectionScalar = gen_data.create_ideal_curve_approach_part_scalar(
+		parameterMaterial,
+		parameterMeasurement
+	)
+
+	np.testing.assert_array_equal(piezo, piezoScalar)
+	np.testing.assert_array_equal(deflection, deflectionScalar)
+
+def test_create_ideal_curve_approach_part_maximum_piezo_reached():
+	"""Test that create_ideal_curve_approach_part raises an error 
+	   if the maximum piezo is reached before the jump to contact."""
+	ParameterMaterial, ParameterMeasurement, _ = gen_data.get_parameter_tuples()
+	parameterMaterial = ParameterMaterial(
+		kc=1,
+		radius=25e-9,
+		Etot=82525504488.49124,
+		Hamaker=7.70714e-20,
+		jtc=gen_data.calculate_jtc(7.70714e-20, 25e-9, 1)
+	)
+	parameterMeasurement = ParameterMeasurement(
+		startDistance=5e-9,
+		stepSize=0.2e-9,
+		maximumPiezo=30e-9
+	)
+
+	with pytest.raises(ValueError):
+		gen_data.create_ideal_curve_approach_part(
+			parameterMaterial,
+			parameterMeasurement
+		)
+
+def test_run_ideal_curve_approach_part_grows_capacity(parameterMaterial, parameterMeasurement):
+	"""Test that run_ideal_curve_approach_part extends too small arrays 
+	   without changing the approach part."""
+	piezo = np.empty(2)
+	deflection = np.empty(2)
+	piezo[0] = parameterMeasurement.startDistance
+	deflection[0] = 0
+
+	piezo, deflection, length = gen_data.run_ideal_curve_approach_part(
+		piezo,
+		deflection,
+		parameterMaterial,
+		parameterMeasurement
+	)
+	piezoScalar, deflectionScalar = gen_data.create_ideal_curve_approach_part_scalar(
+		parameterMaterial,
+		parameterMeasurement
+	)
+
+	assert len(piezo) <= gen_data.calculate_maximum_length_approach_part(parameterMeasurement)
+	np.testing.assert_array_equal(piezo[:length], piezoScalar)
+	np.testing.assert_array_equal(deflection[:length], deflectionScalar)
+
+@pytest.mark.parametrize("stepSize", [0.01e-9, 0.2e-9, 0.4e-9])
+def test_plan_ideal_curve_matches_ideal_curve(
+	parameterMaterial,
+	parameterMeasurement,
+	stepSize: float
+):
+	"""Test that the plan bounds the approach part and predicts the exact length."""
+	parameterMeasurement = parameterMeasurement._replace(stepSize=stepSize)
+
+	curvePlan = gen_data.plan_ideal_curve(parameterMaterial, parameterMeasurement)
+	piezo, deflection = gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement)
+	piezoApproach, _ = gen_data.create_ideal_curve_approach_part(
+		parameterMaterial, 
+		parameterMeasurement
+	)
+
+	assert curvePlan.exact
+	assert len(piezoApproach) <= curvePlan.lengthApproach
+	assert len(piezo) == len(deflection) == curvePlan.length
+	assert piezo[curvePlan.indexPointOfContact - 1] < 0 <= piezo[curvePlan.indexPointOfContact]
+
+@pytest.mark.parametrize(
+    "startDistance, maximumPiezo",
+    [
+    	(5e-9, 30e-9),
+    	(-10e-9, -8e-9),
+    	(-10e-9, -1e-9)
+    ]
+)
+def test_plan_ideal_curve_rejects_unreachable_setup(
+	parameterMaterial,
+	parameterMeasurement,
+	startDistance: float,
+	maximumPiezo: float
+):
+	"""Test that the plan rejects setups that never reach the jump to contact 
+	   or the point of contact, which the ideal curve rejects as well."""
+	parameterMeasurement = parameterMeasurement._replace(
+		startDistance=startDistance,
+		maximumPiezo=maximumPiezo
+	)
+
+	with pytest.raises(ValueError):
+		gen_data.plan_ideal_curve(parameterMaterial, parameterMeasurement)
+	with pytest.raises(ValueError):
+		gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement)
+
+def test_create_ideal_curve_batch_matches_single_curves(
+	parameterMaterial,
+	parameterMeasurement
+):
+	"""Test that every row of the batched ideal curves matches
+	   the ideal curve created for its parameters alone."""
+	kc = parameterMaterial.kc * np.array([0.5, 1, 2])
+	radius = parameterMaterial.radius * np.array([1.5, 1, 0.5])
+	jtc = gen_data.calculate_jtc(parameterMaterial.Hamaker, radius, kc)
+	parameterMaterialBatch = parameterMaterial._replace(kc=kc, radius=radius, jtc=jtc)
+
+	idealCurveBatch = gen_data.create_ideal_curve_batch(
+		parameterMaterialBatch,
+		parameterMeasurement
+	)
+
+	for index in range(len(kc)):
+		piezo, deflection = gen_data.create_ideal_curve(
+			parameterMaterial._replace(kc=kc[index], radius=radius[index], jtc=jtc[index]),
+			parameterMeasurement
+		)
+		length = idealCurveBatch.lengths[index]
+
+		assert length == len(piezo)
+		np.testing.assert_array_equal(idealCurveBatch.piezo[:length], piezo)
+		np.testing.assert_allclose(idealCurveBatch.deflection[index, :length], deflection, rtol=1e-12)
+		assert np.all(np.isnan(idealCurveBatch.deflection[index, length:]))
+		assert piezo[idealCurveBatch.indexPointOfContact[index] - 1] < 0 <= piezo[idealCurveBatch.indexPointOfContact[index]]
+		assert deflection[idealCurveBatch.indexJumpToContact[index] + 1] == piezo[idealCurveBatch.indexJumpToContact[index] + 1]
+
+def test_create_ideal_curve_batch_maximum_piezo_reached(
+	parameterMaterial,
+	parameterMeasurement
+):
+	"""Test that create_ideal_curve_batch raises an error if 
+	   one curve can not reach the point of contact."""
+	with pytest.raises(ValueError):
+		gen_data.create_ideal_curve_batch(
+			parameterMaterial._replace(kc=np.array([parameterMaterial.kc] * 2)),
+			parameterMeasurement._replace(maximumPiezo=-5e-9)
+		)
+
+def test_create_ideal_curve_batch_unreachable_jump_to_contact(
+	parameterMaterial,
+	parameterMeasurement
+):
+	"""Test that create_ideal_curve_batch rejects a batch, in which one curve 
+	   starts within its jtc, before running the recurrence."""
+	kc = parameterMaterial.kc * np.array([1, 4])
+	jtc = gen_data.calculate_jtc(parameterMaterial.Hamaker, parameterMaterial.radius, kc)
+
+	with pytest.raises(ValueError):
+		gen_data.create_ideal_curve_batch(
+			parameterMaterial._replace(kc=kc, jtc=jtc),
+			parameterMeasurement._replace(startDistance=np.abs(jtc).min())
+		)
+
+@pytest.mark.parametrize("samplingTolerance", [1e-12, 1e-11])
+def test_create_ideal_curve_adaptive_within_tolerance(
+	parameterMaterial,
+	parameterMeasurement,
+	samplingTolerance: float
+):
+	"""Test that the adaptive ideal curve keeps the jump to contact and the point
+	   of contact and matches the uniform ideal curve within the tolerance."""
+	parameterMeasurement = parameterMeasurement._replace(stepSize=0.01e-9)
+
+	piezo, deflection = gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement)
+	adaptivePiezo, adaptiveDeflection = gen_data.create_ideal_curve(
+		parameterMaterial, 
+		parameterMeasurement,
+		samplingTolerance=samplingTolerance
+	)
+	curvePlan = gen_data.plan_ideal_curve(parameterMaterial, parameterMeasurement)
+	uniformPiezo, uniformDeflection = gen_data.resample_to_uniform_grid(
+		adaptivePiezo,
+		np.stack((adaptiveDeflection, adaptiveDeflection)),
+		parameterMeasurement
+	)
+
+	assert len(adaptivePiezo) < len(piezo) / 20
+	assert np.all(np.isin(piezo[[0, curvePlan.indexPointOfContact, -1]], adaptivePiezo))
+	assert np.all(np.isin(adaptiveDeflection, deflection))
+	np.testing.assert_array_equal(uniformPiezo, piezo)
+	assert np.max(np.abs(uniformDeflection - deflection)) <= samplingTolerance
+
+@pytest.mark.parametrize("stepSize", [0.2e-9, 0.01e-9])
+def test_create_ideal_curve_adaptive_independent_of_dense_sampling(
+	parameterMaterial,
+	parameterMeasurement,
+	monkeypatch,
+	stepSize: float
+):
+	"""Test that calculating every point of short curves 
+	   keeps the same points with the same values."""
+	parameterMeasurement = parameterMeasurement._replace(stepSize=stepSize)
+
+	densePiezo, denseDeflection = gen_data.create_ideal_curve(
+		parameterMaterial, 
+		parameterMeasurement,
+		samplingTolerance=1e-12
+	)
+	monkeypatch.setattr(gen_data, "maximumLengthDenseSampling", 0)
+	piezo, deflection = gen_data.create_ideal_curve(
+		parameterMaterial, 
+		parameterMeasurement,
+		samplingTolerance=1e-12
+	)
+
+	np.testing.assert_array_equal(piezo, densePiezo)
+	np.testing.assert_array_equal(deflection, denseDeflection)
+
+def test_create_ideal_curve_adaptive_invalid_tolerance(
+	parameterMaterial,
+	parameterMeasurement
+):
+	"""Test that the adaptive ideal curve needs a positive tolerance."""
+	with pytest.raises(ValueError):
+		gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement, samplingTolerance=0)
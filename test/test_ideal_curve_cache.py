@@ -0,0 +1,172 @@
+import os
+from typing import NamedTuple
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.generate_data as gen_data
+from syfos.data_handling.ideal_curve_cache import IdealCurveCache, IdealCurveDiskCache
+
+def test_ideal_curve_cache_hits_and_misses(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that an ideal curve is only created once for the same parameters."""
+	idealCurveCache = IdealCurveCache()
+
+	firstCurve = idealCurveCache.get_ideal_curve(
+		parameterMaterial, parameterMeasurement, gen_data.create_ideal_curve
+	)
+	secondCurve = idealCurveCache.get_ideal_curve(
+		parameterMaterial, parameterMeasurement, gen_data.create_ideal_curve
+	)
+	expectedCurve = gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement)
+
+	assert (idealCurveCache.hits, idealCurveCache.misses) == (1, 1)
+	assert secondCurve[1] is firstCurve[1]
+	assert not firstCurve[1].flags.writeable
+	np.testing.assert_array_equal(firstCurve[1], expectedCurve[1])
+
+	idealCurveCache.clear()
+
+	assert len(idealCurveCache) == 0
+	assert (idealCurveCache.hits, idealCurveCache.misses) == (0, 0)
+
+def test_ideal_curve_cache_removes_least_recently_used_curve(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that the least recently used curve is removed if the cache is full."""
+	idealCurveCache = IdealCurveCache(maximumNumberOfCurves=2)
+	measurements = [
+		parameterMeasurement._replace(maximumPiezo=maximumPiezo)
+		for maximumPiezo in (20e-9, 30e-9, 40e-9)
+	]
+
+	for measurement in measurements[:2]:
+		idealCurveCache.get_ideal_curve(parameterMaterial, measurement, gen_data.create_ideal_curve)
+	idealCurveCache.get_ideal_curve(parameterMaterial, measurements[0], gen_data.create_ideal_curve)
+	idealCurveCache.get_ideal_curve(parameterMaterial, measurements[2], gen_data.create_ideal_curve)
+
+	assert (parameterMaterial, measurements[0]) in idealCurveCache
+	assert (parameterMaterial, measurements[1]) not in idealCurveCache
+	assert (parameterMaterial, measurements[2]) in idealCurveCache
+
+def test_ideal_curve_cache_memory_limit(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that the cached arrays stay within the memory limit."""
+	piezo, deflection = gen_data.create_ideal_curve(parameterMaterial, parameterMeasurement)
+	idealCurveCache = IdealCurveCache(maximumMemory=int(1.5 * (piezo.nbytes + deflection.nbytes)))
+
+	for maximumPiezo in (30e-9, 30.1e-9, 30.3e-9):
+		idealCurveCache.get_ideal_curve(
+			parameterMaterial,
+			parameterMeasurement._replace(maximumPiezo=maximumPiezo),
+			gen_data.create_ideal_curve
+		)
+
+	assert len(idealCurveCache) == 1
+	assert idealCurveCache.currentMemory <= idealCurveCache.maximumMemory
+
+def test_ideal_curve_disk_cache_shared_between_caches(
+	tmp_path,
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that a curve saved by one cache is memory mapped by another cache."""
+	diskCache = IdealCurveDiskCache(str(tmp_path), gen_data.solverVersion)
+	expectedCurve = IdealCurveCache(diskCache=diskCache).get_ideal_curve(
+		parameterMaterial, parameterMeasurement, gen_data.create_ideal_curve
+	)
+
+	def fail_to_create_ideal_curve(parameterMaterial, parameterMeasurement):
+		raise AssertionError("The curve should be loaded from the disk cache.")
+
+	loadedCurve = IdealCurveCache(diskCache=diskCache).get_ideal_curve(
+		parameterMaterial, parameterMeasurement, fail_to_create_ideal_curve
+	)
+
+	assert isinstance(loadedCurve[1].base, np.memmap)
+	np.testing.assert_array_equal(loadedCurve[0], expectedCurve[0])
+	np.testing.assert_array_equal(loadedCurve[1], expectedCurve[1])
+	assert not any(path.suffix == ".tmp" for path in tmp_path.iterdir())
+
+def test_ideal_curve_disk_cache_solver_version(
+	tmp_path,
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that curves of another solver version are not used."""
+	oldDiskCache = IdealCurveDiskCache(str(tmp_path), "0")
+	oldDiskCache.save(parameterMaterial, parameterMeasurement, *gen_data.create_ideal_curve(
+		parameterMaterial, parameterMeasurement
+	))
+	diskCache = IdealCurveDiskCache(str(tmp_path), gen_data.solverVersion)
+
+	assert oldDiskCache.load(parameterMaterial, parameterMeasurement) is not None
+	assert diskCache.load(parameterMaterial, parameterMeasurement) is None
+
+def test_ideal_curve_disk_cache_size_limit(
+	tmp_path,
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that the least recently used curves are removed if the cache is too large."""
+	measurements = [
+		parameterMeasurement._replace(maximumPiezo=maximumPiezo)
+		for maximumPiezo in (30e-9, 30.1e-9, 30.3e-9)
+	]
+	idealCurve = gen_data.create_ideal_curve(parameterMaterial, measurements[-1])
+	diskCache = IdealCurveDiskCache(
+		str(tmp_path),
+		gen_data.solverVersion,
+		maximumSize=int(2.5 * (idealCurve[0].nbytes + idealCurve[1].nbytes))
+	)
+
+	for index, measurement in enumerate(measurements):
+		diskCache.save(parameterMaterial, measurement, *gen_data.create_ideal_curve(
+			parameterMaterial, measurement
+		))
+		for filePath in diskCache.get_file_paths(diskCache.create_hash(parameterMaterial, measurement)):
+			os.utime(filePath, (index, index))
+
+	diskCache.remove_least_recently_used_curves()
+
+	assert diskCache.get_size() <= diskCache.maximumSize
+	assert diskCache.load(parameterMaterial, measurements[0]) is None
+	assert diskCache.load(parameterMaterial, measurements[2]) is not None
+
+def test_ideal_curve_disk_cache_removes_both_files_of_a_curve(
+	tmp_path,
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that the piezo and deflection file of a curve are removed together,
+	   even if removing a single file would be enough to reach the maximum size."""
+	measurements = [
+		parameterMeasurement._replace(maximumPiezo=maximumPiezo)
+		for maximumPiezo in (30e-9, 30.1e-9, 30.3e-9)
+	]
+	diskCache = IdealCurveDiskCache(str(tmp_path), gen_data.solverVersion)
+
+	for index, measurement in enumerate(measurements):
+		diskCache.save(parameterMaterial, measurement, *gen_data.create_ideal_curve(
+			parameterMaterial, measurement
+		))
+		pathPiezo, pathDeflection = diskCache.get_file_paths(
+			diskCache.create_hash(parameterMaterial, measurement)
+		)
+		os.utime(pathDeflection, (2 * index, 2 * index))
+		os.utime(pathPiezo, (2 * index + 1, 2 * index + 1))
+
+	diskCache.maximumSize = diskCache.get_size() - 1
+	diskCache.remove_least_recently_used_curves()
+
+	for measurement in measurements:
+		filePaths = diskCache.get_file_paths(diskCache.create_hash(parameterMaterial, measurement))
+		assert os.path.exists(filePaths[0]) == os.path.exists(filePaths[1])
+	assert diskCache.load(parameterMaterial, measurements[0]) is None
+	assert diskCache.load(parameterMaterial, measurements[1]) is not None
+	assert diskCache.get_size() <= diskCache.maximumSize
@@ -0,0 +1,123 @@
+import csv
+import os
+from typing import Dict
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.generate_data as gen_data
+import syfos.data_handling.parameter_sweep as parameter_sweep
+
+@pytest.fixture
+def sweep_values() -> Dict:
+	"""Define a small sweep over the spring constant and the start distance.
+
+	Returns:
+		sweepValues(dict): Values of every parameter of the sweep. A positive 
+						   start distance can not reach the point of contact.
+	"""
+	return {
+		"eProbe": 170e9,
+		"poissonRatioProbe": 0.22,
+		"hamakerProbe": 66e-21,
+		"kc": [0.5, 1],
+		"radius": 25e-9,
+		"eSample": 78e9,
+		"poissonRatioSample": 0.42,
+		"hamakerSample": 90e-21,
+		"startDistance": [-10e-9, 5e-9],
+		"stepSize": 0.2e-9,
+		"maximumPiezo": 30e-9,
+		"numberOfCurves": 3,
+		"noise": 1e-10,
+		"virtualDeflection": 3e-9,
+		"topographyOffset": 10e-9
+	}
+
+def test_create_parameter_grid(sweep_values: Dict):
+	"""Test that create_parameter_grid creates every combination of values."""
+	parameterGrid = parameter_sweep.create_parameter_grid(sweep_values)
+
+	assert len(parameterGrid) == 4
+	assert {(setup["kc"], setup["startDistance"]) for setup in parameterGrid} == {
+		(0.5, -10e-9), (0.5, 5e-9), (1, -10e-9), (1, 5e-9)
+	}
+
+@pytest.mark.parametrize("numberOfWorkers", [1, 2])
+def test_run_parameter_sweep_reports_failed_tasks(
+	sweep_values: Dict,
+	numberOfWorkers: int,
+	tmp_path
+):
+	"""Test that a failing setup is reported without aborting the sweep."""
+	sweepResults = parameter_sweep.run_parameter_sweep(
+		sweep_values,
+		str(tmp_path),
+		numberOfWorkers=numberOfWorkers,
+		seed=2
+	)
+
+	statusPerStartDistance = {
+		(sweepResult.setup["startDistance"], sweepResult.status)
+		for sweepResult in sweepResults
+	}
+
+	assert [sweepResult.taskIndex for sweepResult in sweepResults] == [0, 1, 2, 3]
+	assert statusPerStartDistance == {(-10e-9, "done"), (5e-9, "failed")}
+
+	with open(os.path.join(str(tmp_path), "sweep_summary.csv")) as summaryFile:
+		assert len(list(csv.reader(summaryFile))) == 5
+
+	for sweepResult in sweepResults:
+		if sweepResult.status == "done":
+			with np.load(sweepResult.pathOutputFile) as forceVolume:
+				assert forceVolume["syntheticDeflection"].shape[0] == 3
+
+def test_run_sweep_task_reports_export_error_and_restores_cache(
+	sweep_values: Dict,
+	tmp_path
+):
+	"""Test that an error during the export fails the task and that
+	   the disk cache of the current process is restored."""
+	setup = parameter_sweep.create_parameter_grid(sweep_values)[0]
+
+	sweepResult = parameter_sweep.run_sweep_task(
+		0,
+		setup,
+		2,
+		str(tmp_path / "missing"),
+		str(tmp_path / "cache")
+	)
+
+	assert sweepResult.status == "failed"
+	assert gen_data.idealCurveCache.diskCache is None
+
+def test_run_parameter_sweep_independent_of_number_of_workers(
+	sweep_values: Dict,
+	tmp_path
+):
+	"""Test that the noise of every task is independent of the number of workers."""
+	sweepResultsSingleWorker = parameter_sweep.run_parameter_sweep(
+		sweep_values, str(tmp_path / "single"), numberOfWorkers=1, seed=2
+	)
+	sweepResultsTwoWorkers = parameter_sweep.run_parameter_sweep(
+		sweep_values, str(tmp_path / "two"), numberOfWorkers=2, seed=2
+	)
+
+	for singleResult, twoResult in zip(sweepResultsSingleWorker, sweepResultsTwoWorkers):
+		if singleResult.status == "done":
+			with np.load(singleResult.pathOutputFile) as single, np.load(twoResult.pathOutputFile) as two:
+				np.testing.assert_array_equal(
+					single["syntheticDeflection"],
+					two["syntheticDeflection"]
+				)
+
+def test_run_parameter_sweep_missing_parameter(
+	sweep_values: Dict,
+	tmp_path
+):
+	"""Test that a missing parameter is reported before the sweep starts."""
+	del sweep_values["noise"]
+
+	with pytest.raises(ValueError):
+		parameter_sweep.run_parameter_sweep(sweep_values, str(tmp_path))
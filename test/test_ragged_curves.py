@@ -0,0 +1,79 @@
+from typing import NamedTuple
+
+import pytest
+import numpy as np
+
+import syfos.data_handling.export_data as export_data
+import syfos.data_handling.generate_data as gen_data
+from syfos.data_handling.ragged_curves import RaggedCurves
+
+@pytest.fixture
+def raggedCurves() -> RaggedCurves:
+	"""Define three curves of different lengths."""
+	return RaggedCurves.from_curves(
+		[
+			[np.arange(3.0), -np.arange(3.0)],
+			[np.arange(1.0), -np.arange(1.0)],
+			[np.arange(4.0), -np.arange(4.0)]
+		]
+	)
+
+def test_ragged_curves_indexing_returns_views(raggedCurves: RaggedCurves):
+	"""Test that single curves and iteration return views of the flat arrays."""
+	piezo, deflection = raggedCurves[-1]
+
+	np.testing.assert_array_equal(raggedCurves.lengths, [3, 1, 4])
+	np.testing.assert_array_equal(deflection, -np.arange(4.0))
+	assert np.shares_memory(piezo, raggedCurves.piezo)
+	assert all(
+		np.shares_memory(curve[1], raggedCurves.deflection)
+		for curve in raggedCurves
+	)
+
+def test_ragged_curves_select_curves(raggedCurves: RaggedCurves):
+	"""Test that a selection of curves keeps the values of every curve."""
+	selectedCurves = raggedCurves[[2, 0]]
+
+	np.testing.assert_array_equal(selectedCurves.lengths, [4, 3])
+	np.testing.assert_array_equal(selectedCurves[0][0], np.arange(4.0))
+	np.testing.assert_array_equal(selectedCurves[1][1], -np.arange(3.0))
+	np.testing.assert_array_equal(raggedCurves[1:].lengths, [1, 4])
+
+def test_ragged_curves_to_padded(raggedCurves: RaggedCurves):
+	"""Test that shorter curves are padded with NaN."""
+	piezo, deflection = raggedCurves.to_padded()
+
+	assert deflection.shape == (3, 4)
+	np.testing.assert_array_equal(deflection[1], [0, np.nan, np.nan, np.nan])
+	np.testing.assert_array_equal(
+		RaggedCurves.from_padded(piezo, deflection, raggedCurves.lengths).deflection,
+		raggedCurves.deflection
+	)
+
+def test_ragged_curves_from_ideal_curve_batch(
+	parameterMaterial: NamedTuple,
+	parameterMeasurement: NamedTuple
+):
+	"""Test that a batch of ideal curves keeps the length of every curve."""
+	idealCurveBatch = gen_data.create_ideal_curve_batch(
+		parameterMaterial._replace(kc=np.array([0.5, 1.0])),
+		parameterMeasurement
+	)
+
+	raggedCurves = RaggedCurves.from_padded(
+		idealCurveBatch.piezo,
+		idealCurveBatch.deflection,
+		idealCurveBatch.lengths
+	)
+
+	np.testing.assert_array_equal(raggedCurves.lengths, idealCurveBatch.lengths)
+	assert not np.any(np.isnan(raggedCurves.deflection))
+
+def test_create_data_frame_force_volume_unequal_lengths(raggedCurves: RaggedCurves):
+	"""Test that curves of different lengths can be exported."""
+	dataFrameForceVolume = export_data.create_data_frame_force_volume(
+		list(raggedCurves)
+	)
+
+	assert dataFrameForceVolume.shape == (4, 6)
+	assert dataFrameForceVolume["ideal_curve_shifted_y_values"].isna().sum() == 3